@@ -6,9 +6,15 @@ Experiment is carried out in Denis V. Gruzenkin PhD thesis writing.
 import inspect
 import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import chain, repeat
+
+import numpy as np
 
 from data_base_connector import DBConnector
-from data_generator import NResult
+from data_generator import ExperimentResults, IterationResults, NModule, NResult
 from module_importer import ModuleNotLoadedError, FunctionNotFoundInModuleError
 
 __author__ = "Denis V. Gruzenkin"
@@ -21,8 +27,53 @@ __email__ = "gruzenkin.denis@good-look.su"
 __status__ = "Production"
 
 
+def vote_iterations(
+    vote_func, vote_batch_func, nversions_results
+) -> list[dict]:
+    """
+    Vote over every iteration of experiment results
+    :param vote_func: Function, which votes over NResult list of one iteration
+    :param vote_batch_func: Optional function, which votes over answers array of all iterations
+    :param nversions_results: ExperimentResults object or list of iterations NResult lists
+    :return: list of {"data": iteration results, "res": vote result} dicts
+    """
+    if vote_batch_func is not None and isinstance(
+        nversions_results, ExperimentResults
+    ):
+        answers_matrix = nversions_results.answers_matrix()
+        if answers_matrix is not None:
+            # Все итерации голосуются одной операцией над массивом ответов, а объекты NResult итерации
+            # создаются только при обращении к ним
+            return [
+                {
+                    "data": nversions_results.iteration_results(i),
+                    "res": vote_res,
+                }
+                for i, vote_res in enumerate(
+                    np.asarray(vote_batch_func(answers_matrix)).tolist()
+                )
+            ]
+    return [
+        {"data": iteration_result, "res": vote_func(iteration_result)}
+        for iteration_result in nversions_results
+    ]
+
+
+def _vote_in_worker(vote_func, vote_batch_func, nversions_results) -> list:
+    # Обратно передаются только результаты голосования, данные итераций сопоставляются с ними в основном процессе
+    return [
+        vote_res["res"]
+        for vote_res in vote_iterations(
+            vote_func, vote_batch_func, nversions_results
+        )
+    ]
+
+
 class VoteAlgorithm:
     _db_name = "experiment.db"
+    _vote_result_insert_query = """
+        insert into vote_result (algorithm_id, experiment_id, module_iteration_num, vote_answer) values(?,?,?,?);
+    """
 
     def __init__(
         self,
@@ -38,6 +89,7 @@ class VoteAlgorithm:
         self._id = new_id
         self._vote_module = None
         self._vote_algorithm = None
+        self._vote_batch_algorithm = None
         self._vote_result: list[dict] = []
 
         try:
@@ -52,6 +104,10 @@ class VoteAlgorithm:
                     f"There is no function {vote_func_name} in {module_name}"
                 )
             self._vote_algorithm = getattr(self._vote_module, vote_func_name)
+            # Необязательная векторная версия функции голосования получает ответы всех итераций одним массивом
+            self._vote_batch_algorithm = getattr(
+                self._vote_module, f"{vote_func_name}_batch", None
+            )
         except ModuleNotFoundError as e:
             raise e
         except Exception as e:
@@ -65,6 +121,11 @@ class VoteAlgorithm:
     @vote_algorithm.setter
     def vote_algorithm(self, vote_func):
         self._vote_algorithm = vote_func
+        self._vote_batch_algorithm = None
+
+    @property
+    def vote_batch_algorithm(self):
+        return self._vote_batch_algorithm
 
     @property
     def vote_results(self):
@@ -84,15 +145,92 @@ class VoteAlgorithm:
             )
 
     def vote(self, nversions_results: list[list[NResult]]):
-        self._vote_result = list()
-        for iteration_result in nversions_results:
-            self._vote_result.append(
+        self._vote_result = vote_iterations(
+            self._vote_algorithm, self._vote_batch_algorithm, nversions_results
+        )
+
+    @staticmethod
+    def _vote_pool(vote_algorithms: list, workers: int):
+        if workers < 1:
+            raise ValueError(
+                f"Workers amount should be positive. {workers} was got."
+            )
+        # Процессы нужны, только если алгоритмов несколько
+        if workers == 1 or len(vote_algorithms) < 2:
+            return nullcontext()
+        return ProcessPoolExecutor(min(workers, len(vote_algorithms)))
+
+    @staticmethod
+    def _vote_in_pool(
+        vote_algorithms: list,
+        nversions_results: list[list[NResult]],
+        executor: ProcessPoolExecutor | None,
+    ):
+        if executor is None:
+            for vote_algorithm in vote_algorithms:
+                vote_algorithm.vote(nversions_results)
+            return
+        algorithms_votes = executor.map(
+            _vote_in_worker,
+            [alg.vote_algorithm for alg in vote_algorithms],
+            [alg.vote_batch_algorithm for alg in vote_algorithms],
+            repeat(nversions_results),
+        )
+        for vote_algorithm, votes in zip(vote_algorithms, algorithms_votes):
+            vote_algorithm._vote_result = [
                 {
-                    "data": iteration_result,
-                    "res": self._vote_algorithm(iteration_result),
+                    "data": (
+                        nversions_results.iteration_results(i)
+                        if isinstance(nversions_results, ExperimentResults)
+                        else nversions_results[i]
+                    ),
+                    "res": vote_res,
                 }
+                for i, vote_res in enumerate(votes)
+            ]
+
+    @staticmethod
+    def vote_all(
+        vote_algorithms: list,
+        nversions_results: list[list[NResult]],
+        workers: int = 1,
+    ):
+        """
+        Vote with every algorithm over the same experiment results in several processes
+        :param vote_algorithms: list of VoteAlgorithm objects
+        :param nversions_results: ExperimentResults object or list of iterations NResult lists
+        :param workers: Worker processes amount
+        """
+        with VoteAlgorithm._vote_pool(vote_algorithms, workers) as executor:
+            VoteAlgorithm._vote_in_pool(
+                vote_algorithms, nversions_results, executor
             )
 
+    @classmethod
+    def vote_all_pages(
+        cls, vote_algorithms: list, results_pages, workers: int = 1
+    ):
+        """
+        Vote with every algorithm over experiment results page by page and save vote results of every page. Vote
+        results of a page are replaced by vote results of the next one, so only one page is kept in memory
+        :param vote_algorithms: list of VoteAlgorithm objects
+        :param results_pages: iterable of ExperimentResults objects
+        :param workers: Worker processes amount
+        """
+        # Скорость вставки выводится один раз за все страницы
+        rows_amount = 0
+        insert_time = 0.0
+        # Процессы запускаются один раз на все страницы, и каждая страница передаётся уже работающим процессам
+        with cls._vote_pool(vote_algorithms, workers) as executor:
+            for results_page in results_pages:
+                cls._vote_in_pool(vote_algorithms, results_page, executor)
+                start_time = time.perf_counter()
+                rows_amount += cls.save_all_vote_results(
+                    vote_algorithms, False
+                )
+                insert_time += time.perf_counter() - start_time
+        DBConnector.print_insert_rate(rows_amount, insert_time)
+
     def save_vote_algorithm(self):
         cur_conn = DBConnector(self._db_name)
         if not cur_conn.table_exists("algorithm"):
@@ -125,51 +263,175 @@ class VoteAlgorithm:
             """
             cur_conn.execute_query(update_query, [], True, False)
 
-    def save_vote_results(self):
-        cur_conn = DBConnector(self._db_name)
+    @staticmethod
+    def _create_vote_result_table(cur_conn: DBConnector):
+        # Результаты голосования ссылаются на эксперимент, поэтому сначала создаются и переводятся на новую схему
+        # таблицы эксперимента
+        NModule._create_experiment_tables(cur_conn)
         if not cur_conn.table_exists("vote_result"):
-            create_query = """
-                create table vote_result (
-                    id integer primary key autoincrement not null,
-                    algorithm_id integer not null,
-                    experiment_data_id integer not null,
-                    vote_answer real null,
-                    unique(algorithm_id, experiment_data_id, vote_answer) on conflict replace,
-                    foreign key ("algorithm_id") references algorithm(id),
-                    foreign key ("experiment_data_id") references experiment_data(id)
-                );
-            """
-            cur_conn.execute_query(create_query, [], True, False)
+            cur_conn.execute_query(
+                NModule._vote_result_create_query("vote_result"),
+                [],
+                True,
+                False,
+            )
+
+    @staticmethod
+    def _iteration_key(iteration_data) -> tuple[str, int]:
+        # Результат голосования хранится по имени эксперимента и номеру итерации
+        if isinstance(iteration_data, IterationResults):
+            return iteration_data.experiment_name, iteration_data.iteration_num
+        return (
+            iteration_data[0].experiment_name,
+            iteration_data[0].module_iteration_num,
+        )
+
+    def _vote_result_rows(self, experiment_ids: dict):
+        for res in self._vote_result:
+            experiment_name, iteration_num = self._iteration_key(res["data"])
+            experiment_id = experiment_ids.get(experiment_name)
+            yield self._id, experiment_id, iteration_num, res["res"]
+
+    def _analysis_keys(
+        self, cur_conn: DBConnector, experiment_ids: dict
+    ) -> set[tuple]:
+        iteration_bounds = {}
+        for res in self._vote_result:
+            experiment_name, iteration_num = self._iteration_key(res["data"])
+            experiment_id = experiment_ids.get(experiment_name)
+            if experiment_id is not None:
+                first_iteration, last_iteration = iteration_bounds.get(
+                    experiment_id, (iteration_num, iteration_num)
+                )
+                iteration_bounds[experiment_id] = (
+                    min(first_iteration, iteration_num),
+                    max(last_iteration, iteration_num),
+                )
+        # Результаты голосования по новым итерациям только дополняют анализ, а перезапись сохранённых результатов
+        # делает его неверным
+        return {
+            (self._id, experiment_id)
+            for experiment_id, (
+                first_iteration,
+                last_iteration,
+            ) in iteration_bounds.items()
+            if cur_conn.execute_query(f"""
+                    select exists(select 1 from vote_result where algorithm_id = {self._id} 
+                    and experiment_id = {experiment_id} 
+                    and module_iteration_num between {first_iteration} and {last_iteration});
+                """)[0][0]
+        }
+
+    @staticmethod
+    def _delete_algorithms_analysis(
+        cur_conn: DBConnector, analysis_keys: set[tuple]
+    ):
+        # Анализ алгоритма посчитан по прежним результатам голосования, поэтому при их перезаписи он удаляется в той
+        # же транзакции
+        if len(analysis_keys) > 0 and cur_conn.table_exists(
+            "algorithm_analysis"
+        ):
+            cur_conn.execute_query(
+                "delete from algorithm_analysis where algorithm_id = ? and experiment_id = ?;",
+                list(analysis_keys),
+                False,
+                False,
+            )
+
+    @staticmethod
+    def _load_experiment_ids(cur_conn: DBConnector) -> dict:
+        return {
+            experiment_name: experiment_id
+            for experiment_name, experiment_id in cur_conn.execute_query(
+                "select name, id from experiment;"
+            )
+        }
+
+    @classmethod
+    def save_all_vote_results(
+        cls, vote_algorithms: list, report: bool = True
+    ) -> int:
+        """
+        Save vote results of several algorithms in one transaction
+        :param vote_algorithms: list of VoteAlgorithm objects with filled vote results
+        :param report: Print insertion rate
+        :return: Amount of saved vote results
+        """
+        if len(vote_algorithms) == 0:
+            return 0
+        cur_conn = DBConnector(cls._db_name)
+        cls._create_vote_result_table(cur_conn)
+        for vote_algorithm in vote_algorithms:
+            if vote_algorithm._id is None:
+                vote_algorithm.save_vote_algorithm()
+        experiment_ids = cls._load_experiment_ids(cur_conn)
+        cls._delete_algorithms_analysis(
+            cur_conn,
+            set().union(
+                *(
+                    vote_algorithm._analysis_keys(cur_conn, experiment_ids)
+                    for vote_algorithm in vote_algorithms
+                )
+            ),
+        )
+        return cur_conn.bulk_insert(
+            cls._vote_result_insert_query,
+            chain.from_iterable(
+                vote_algorithm._vote_result_rows(experiment_ids)
+                for vote_algorithm in vote_algorithms
+            ),
+            report=report,
+        )
+
+    def save_vote_results(self, load_ids: bool | None = None):
+        """
+        Save algorithm vote results
+        :param load_ids: Load ids of saved vote results. User is asked about it, if None
+        """
+        cur_conn = DBConnector(self._db_name)
+        self._create_vote_result_table(cur_conn)
 
         if self._id is None:
             self.save_vote_algorithm()
 
-        res_insert_lst = list()
-        for res in self._vote_result:
-            for iteration_res in res["data"]:
-                res_insert_lst.append((self._id, iteration_res.id, res["res"]))
+        experiment_ids = self._load_experiment_ids(cur_conn)
+        res_insert_lst = list(self._vote_result_rows(experiment_ids))
         if len(res_insert_lst) > 0:
-            insert_query = "insert into vote_result (algorithm_id, experiment_data_id, vote_answer) values(?,?,?);"
-            cur_conn.execute_query(insert_query, res_insert_lst, True, False)
-
-            if (
-                input(
-                    "Do you want to load rows is from DB? y - Yes; any key - No: "
-                ).upper()
-                == "Y"
-            ):
-                for res in self._vote_result:
-                    tmp_ids: list[int] = list()
-                    for iteration_res in res["data"]:
-                        select_query = f"""
-                            select id from vote_result where algorithm_id = {self._id}
-                            and experiment_data_id = {iteration_res.id} 
-                            and vote_answer = {res['res']};
-                        """
-                        select_res = cur_conn.execute_query(select_query)
-                        if len(select_res) > 0 and len(select_res[0]) > 0:
-                            tmp_ids.append(int(select_res[0][0]))
-                    res["ids"] = tmp_ids
+            self._delete_algorithms_analysis(
+                cur_conn, self._analysis_keys(cur_conn, experiment_ids)
+            )
+            cur_conn.execute_query(
+                self._vote_result_insert_query, res_insert_lst, True, False
+            )
+
+            if load_ids is None:
+                load_ids = (
+                    input(
+                        "Do you want to load rows is from DB? y - Yes; any key - No: "
+                    ).upper()
+                    == "Y"
+                )
+            if load_ids:
+                self._load_vote_result_ids(cur_conn)
+
+    def _load_vote_result_ids(self, cur_conn: DBConnector):
+        # Идентификаторы всех результатов голосования алгоритма загружаются одним запросом, а затем
+        # сопоставляются с итерациями по эксперименту и номеру итерации
+        select_query = f"""
+            select e.name, v.module_iteration_num, v.id from vote_result v 
+            join experiment e on e.id = v.experiment_id where v.algorithm_id = {self._id};
+        """
+        vote_result_ids = {
+            (experiment_name, iteration_num): vote_result_id
+            for experiment_name, iteration_num, vote_result_id in cur_conn.execute_query(
+                select_query
+            )
+        }
+        for res in self._vote_result:
+            vote_result_id = vote_result_ids.get(
+                self._iteration_key(res["data"])
+            )
+            res["ids"] = [] if vote_result_id is None else [vote_result_id]
 
     def load_vote_results(self):
         # TODO: Дописать этот метод!
@@ -1,7 +1,14 @@
 from statistics import median
+
+import numpy as np
+
 from data_generator import NResult
 
 
 def vote(results: list[NResult]) -> float:
     res_lst = [res.version_answer for res in results]
     return median(res_lst)
+
+
+def vote_batch(answers: np.ndarray) -> np.ndarray:
+    return np.median(answers, axis=1)
@@ -0,0 +1,323 @@
+"""Experiment campaign module
+
+Campaign spec is expanded into a grid of module configurations, which experiment data is generated and voted one by
+one. Jobs progress is saved into experiment.db, so interrupted campaign is continued from its first unfinished job.
+
+Program for simulation several N-versions work of one module to test vote algorithms.
+Experiment is carried out in Denis V. Gruzenkin PhD thesis writing.
+"""
+
+import enum
+import json
+from itertools import product
+from random import Random
+
+from data_base_connector import DBConnector
+from random_streams import new_experiment_seed
+
+__author__ = "Denis V. Gruzenkin"
+__copyright__ = "Copyright 2021, Denis V. Gruzenkin"
+__credits__ = ["Denis V. Gruzenkin"]
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Denis V. Gruzenkin"
+__email__ = "gruzenkin.denis@good-look.su"
+__status__ = "Production"
+
+REQUIRED_SPEC_KEYS = (
+    "name",
+    "iterations",
+    "versions_amount",
+    "reliability",
+    "diversity_intervals",
+)
+
+
+class CampaignJobStatus(enum.Enum):
+    PENDING = "pending"
+    GENERATED = "generated"
+    VOTED = "voted"
+
+
+class CampaignJob:
+    """
+    One module configuration of experiment campaign. Its experiment data is generated and voted by campaign runner
+    """
+
+    def __init__(
+        self,
+        job_num: int,
+        experiment_name: str,
+        versions_amount: int,
+        reliability_interval: tuple[float, float],
+        diversities_intervals: list[tuple[float, float]],
+        seed: int,
+        module_id: int = None,
+        status: CampaignJobStatus = CampaignJobStatus.PENDING,
+        job_id: int = None,
+    ):
+        """
+        CampaignJob class constructor
+        :param job_num: Job order number in campaign
+        :param experiment_name: Name of the job experiment
+        :param versions_amount: Amount of module versions
+        :param reliability_interval: (min, max) interval to generate versions reliability
+        :param diversities_intervals: (min, max) intervals to generate versions dynamic diversities
+        :param seed: Experiment seed
+        :param module_id: Id of saved job module
+        :param status: Job progress
+        :param job_id: Job id in data base
+        """
+        self._id = job_id
+        self.job_num = job_num
+        self.experiment_name = experiment_name
+        self.versions_amount = versions_amount
+        self.reliability_interval = tuple(reliability_interval)
+        self.diversities_intervals = [
+            tuple(interval) for interval in diversities_intervals
+        ]
+        self.seed = seed
+        self.module_id = module_id
+        self.status = status
+
+    @property
+    def id(self):
+        return self._id
+
+    def __str__(self):
+        res_str = f"{self.job_num}. {self.experiment_name}: versions: {self.versions_amount}\t"
+        res_str += f"reliability: {self.reliability_interval}\tdiversities: {self.diversities_intervals}\t"
+        res_str += f"status: {self.status.value}"
+        return res_str
+
+
+class Campaign:
+    """
+    Experiment campaign, which is a grid of module configurations. Every configuration is generated and voted
+    with the same iterations amount and vote algorithms
+    """
+
+    _db_name = "experiment.db"
+
+    def __init__(
+        self,
+        name: str,
+        iterations_amount: int,
+        jobs: list[CampaignJob],
+        algorithms_names: list[str] = None,
+        round_to: int = 6,
+        min_out_val: float = 100,
+        max_out_val: float = 1000,
+        spec: str = "",
+        batch: bool = False,
+    ):
+        """
+        Campaign class constructor
+        :param name: Campaign name
+        :param iterations_amount: Iterations amount of every experiment
+        :param jobs: Campaign jobs
+        :param algorithms_names: Names of saved vote algorithms. All saved algorithms are run, if None
+        :param round_to: Modules digits amount fallow after dot delimiter
+        :param min_out_val: Minimal value that can be generated by versions
+        :param max_out_val: Maximal value that can be generated by versions
+        :param spec: Campaign spec JSON string. Campaign can be resumed only with the same spec
+        :param batch: Generate experiments data with NumPy arrays instead of iteration by iteration
+        """
+        self._id = None
+        self.name = name
+        self.iterations_amount = iterations_amount
+        self.jobs = jobs
+        self.algorithms_names = algorithms_names
+        self.round_to = round_to
+        self.min_out_val = min_out_val
+        self.max_out_val = max_out_val
+        self.spec = spec
+        self.batch = batch
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def pending_jobs(self) -> list[CampaignJob]:
+        return [
+            job for job in self.jobs if job.status != CampaignJobStatus.VOTED
+        ]
+
+    @staticmethod
+    def _create_campaign_tables(cur_conn: DBConnector):
+        if not cur_conn.table_exists("campaign"):
+            create_query = """
+                create table campaign (
+                    id integer primary key autoincrement not null,
+                    name varchar(255) not null unique,
+                    spec text not null
+                );
+            """
+            cur_conn.execute_query(create_query, [], True, False)
+        if not cur_conn.table_exists("campaign_job"):
+            create_query = """
+                create table campaign_job (
+                    id integer primary key autoincrement not null,
+                    campaign_id integer not null,
+                    job_num integer not null,
+                    experiment_name varchar(255) not null,
+                    versions_amount integer not null,
+                    reliability_interval varchar(255) not null,
+                    diversities_intervals varchar(1024) not null,
+                    seed integer not null,
+                    module_id integer null,
+                    status varchar(15) not null,
+                    unique(campaign_id, job_num),
+                    foreign key ("campaign_id") references campaign(id),
+                    foreign key ("module_id") references module(id)
+                );
+            """
+            cur_conn.execute_query(create_query, [], True, False)
+
+    def save(self):
+        """
+        Save new campaign with its jobs or load jobs progress of the campaign with the same name, which was saved
+        before
+        """
+        cur_conn = DBConnector(self._db_name)
+        self._create_campaign_tables(cur_conn)
+        campaign_res = cur_conn.execute_query(
+            f"select id, spec from campaign where name = '{self.name}';"
+        )
+        if len(campaign_res) > 0:
+            # Сохранённые задания продолжаются, только если кампания не изменилась, иначе их результаты не совпадут
+            if campaign_res[0][1] != self.spec:
+                raise ValueError(
+                    f"Campaign {self.name} was started with another spec. Give the changed campaign a new name"
+                )
+            self._id = campaign_res[0][0]
+            self.jobs = self._load_jobs(cur_conn)
+            return
+        self._id = cur_conn.execute_query(
+            "insert into campaign (name, spec) values (?, ?);",
+            [(self.name, self.spec)],
+            True,
+        )[0][0]
+        cur_conn.execute_query(
+            """
+                insert into campaign_job (campaign_id, job_num, experiment_name, versions_amount,
+                reliability_interval, diversities_intervals, seed, module_id, status)
+                values (?, ?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            [
+                (
+                    self.id,
+                    job.job_num,
+                    job.experiment_name,
+                    job.versions_amount,
+                    json.dumps(job.reliability_interval),
+                    json.dumps(job.diversities_intervals),
+                    job.seed,
+                    job.module_id,
+                    job.status.value,
+                )
+                for job in self.jobs
+            ],
+            True,
+            False,
+        )
+        self.jobs = self._load_jobs(cur_conn)
+
+    def _load_jobs(self, cur_conn: DBConnector) -> list[CampaignJob]:
+        select_query = f"""
+            select id, job_num, experiment_name, versions_amount, reliability_interval, diversities_intervals,
+            seed, module_id, status from campaign_job where campaign_id = {self.id} order by job_num;
+        """
+        return [
+            CampaignJob(
+                res[1],
+                res[2],
+                res[3],
+                json.loads(res[4]),
+                json.loads(res[5]),
+                res[6],
+                res[7],
+                CampaignJobStatus(res[8]),
+                res[0],
+            )
+            for res in cur_conn.execute_query(select_query)
+        ]
+
+    def save_job(self, job: CampaignJob):
+        cur_conn = DBConnector(self._db_name)
+        update_query = f"""
+            update campaign_job set module_id = {'null' if job.module_id is None else job.module_id},
+            status = '{job.status.value}' where id = {job.id};
+        """
+        cur_conn.execute_query(update_query, [], True, False)
+
+    def __str__(self):
+        return f"{self.name}: jobs: {len(self.jobs)}\tdone: {len(self.jobs) - len(self.pending_jobs)}"
+
+
+def expand_campaign_spec(spec: dict) -> Campaign:
+    """
+    Expand campaign spec into the grid of module configurations. Every combination of versions amount, reliability
+    interval and diversity intervals becomes a campaign job, which is repeated "repeats" times
+    :param spec: dict with "name", "iterations", "versions_amount" (list of ints), "reliability" (list of
+    [min, max]), "diversity_intervals" (list of lists of [min, max]) keys and optional "repeats", "seed",
+    "algorithms", "round_to", "min_out_val", "max_out_val", "batch" keys
+    :return: Campaign object
+    """
+    missing_keys = [key for key in REQUIRED_SPEC_KEYS if key not in spec]
+    if len(missing_keys) > 0:
+        raise ValueError(
+            f"Campaign spec has no {', '.join(missing_keys)} keys"
+        )
+    if int(spec["iterations"]) < 1:
+        raise ValueError(
+            f"Iterations amount should be positive. {spec['iterations']} was got."
+        )
+    for versions_amount in spec["versions_amount"]:
+        if int(versions_amount) < 1:
+            raise ValueError(
+                f"Versions amount should be positive. {versions_amount} was got."
+            )
+    # Сиды экспериментов выводятся из сида кампании в порядке заданий, поэтому кампания воспроизводима целиком
+    seed_random = Random(spec["seed"]) if "seed" in spec else None
+    jobs = []
+    for job_num, (
+        versions_amount,
+        reliability_interval,
+        diversities_intervals,
+        _,
+    ) in enumerate(
+        product(
+            spec["versions_amount"],
+            spec["reliability"],
+            spec["diversity_intervals"],
+            range(spec.get("repeats", 1)),
+        ),
+        1,
+    ):
+        jobs.append(
+            CampaignJob(
+                job_num,
+                f"{spec['name']} {job_num}",
+                int(versions_amount),
+                reliability_interval,
+                diversities_intervals,
+                (
+                    new_experiment_seed()
+                    if seed_random is None
+                    else seed_random.getrandbits(63)
+                ),
+            )
+        )
+    return Campaign(
+        spec["name"],
+        int(spec["iterations"]),
+        jobs,
+        spec.get("algorithms"),
+        spec.get("round_to", 6),
+        spec.get("min_out_val", 100),
+        spec.get("max_out_val", 1000),
+        json.dumps(spec, sort_keys=True),
+        bool(spec.get("batch", False)),
+    )
@@ -4,10 +4,25 @@ Program for simulation several N-versions work of one module to test vote algori
 Experiment is carried out in Denis V. Gruzenkin PhD thesis writing.
 """
 import json
-from math import sqrt
-from random import random, uniform, normalvariate
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+from math import dist, hypot
+from random import Random, uniform
+
+import numpy as np
 
 from data_base_connector import DBConnector
+from distance_engine import versions_distance_matrix
+from random_streams import (
+    ITERATIONS_CHUNK_SIZE,
+    chunk_bounds,
+    chunk_numpy_generator,
+    chunk_python_random,
+    new_experiment_seed,
+)
 
 __author__ = "Denis V. Gruzenkin"
 __copyright__ = "Copyright 2021, Denis V. Gruzenkin"
@@ -80,6 +95,8 @@ class NVersion:
         self._const_diversities = const_diversities
         self._dynamic_diversities = dynamic_diversities
         self._reliability = reliability
+        # Счётчик изменений координат версии. По нему модуль понимает, что закэшированная матрица связности устарела
+        self._coordinates_revision = 0
 
     @property
     def id(self):
@@ -100,6 +117,7 @@ class NVersion:
     @const_diversities.setter
     def const_diversities(self, new_tpl: tuple):
         self._const_diversities = new_tpl
+        self._coordinates_revision += 1
 
     @property
     def dynamic_diversities(self):
@@ -108,6 +126,11 @@ class NVersion:
     @dynamic_diversities.setter
     def dynamic_diversities(self, new_lst: list):
         self._dynamic_diversities = new_lst
+        self._coordinates_revision += 1
+
+    @property
+    def coordinates_revision(self):
+        return self._coordinates_revision
 
     @property
     def common_coordinates_list(self):
@@ -124,8 +147,18 @@ class NVersion:
         else:
             raise ValueError("Reliability interval is [0, 1]")
 
-    def generate_reliability(self, min_val: float, max_val: float, round_to=6):
-        self._reliability = uniform(min_val, max_val).__round__(round_to)
+    def generate_reliability(
+        self,
+        min_val: float,
+        max_val: float,
+        round_to=6,
+        random_stream: Random = None,
+    ):
+        # Без потока случайных чисел версия генерируется невоспроизводимо, как при ручном добавлении
+        uniform_val = (
+            uniform if random_stream is None else random_stream.uniform
+        )
+        self._reliability = uniform_val(min_val, max_val).__round__(round_to)
 
     @staticmethod
     def _calc_euclidean_distance(
@@ -133,20 +166,26 @@ class NVersion:
     ) -> float:
         if len(lst1) != len(lst2):
             raise ValueError("Different coordinates amount")
-        return sqrt(sum((x - y) ** 2 for x, y in zip(lst1, lst2)))
+        return dist(lst1, lst2)
 
     @property
     def distance_from_zero_point(self):
-        return self._calc_euclidean_distance(
-            self.common_coordinates_list,
-            list(map(lambda arg: arg * 0, self.common_coordinates_list)),
-        )
+        return hypot(*self.common_coordinates_list)
 
     def generate_dynamic_diversities(
-        self, intervals_lst: list[tuple], round_to=6
+        self,
+        intervals_lst: list[tuple],
+        round_to=6,
+        random_stream: Random = None,
     ):
+        uniform_val = (
+            uniform if random_stream is None else random_stream.uniform
+        )
         for tpl in intervals_lst:
-            self._dynamic_diversities.append(round(uniform(*tpl), round_to))
+            self._dynamic_diversities.append(
+                round(uniform_val(*tpl), round_to)
+            )
+        self._coordinates_revision += 1
 
     def calculate_distance_to(self, another_version) -> float:
         return self._calc_euclidean_distance(
@@ -229,6 +268,7 @@ class NVersion:
             self.formal_json_db_lst_name
         ]
         self._reliability = float(select_res[0][4])
+        self._coordinates_revision += 1
 
     @classmethod
     def load_versions_2_module(cls, module_id: int):
@@ -259,6 +299,23 @@ class NVersion:
 
 
 class NResult:
+    # Результатов в эксперименте миллионы, поэтому у объектов нет __dict__
+    __slots__ = (
+        "id",
+        "version_id",
+        "version_name",
+        "version_reliability",
+        "version_common_coordinates",
+        "version_answer",
+        "correct_answer",
+        "module_id",
+        "module_name",
+        "module_connectivity_matrix",
+        "module_iteration_num",
+        "version",
+        "experiment_name",
+    )
+
     def __init__(
         self,
         v_id: int,
@@ -296,6 +353,625 @@ class NResult:
         return result_str
 
 
+class IterationResults(Sequence):
+    """
+    Results of one experiment iteration. NResult objects are created only on access
+    """
+
+    __slots__ = ("_experiment_results", "_first", "_last")
+
+    def __init__(self, experiment_results, first: int, last: int):
+        """
+        IterationResults class constructor
+        :param experiment_results: ExperimentResults object, which stores the results
+        :param first: Position of the first answer of the iteration
+        :param last: Position after the last answer of the iteration
+        """
+        self._experiment_results = experiment_results
+        self._first = first
+        self._last = last
+
+    @property
+    def iteration_num(self) -> int:
+        return int(self._experiment_results.iteration_nums[self._first])
+
+    @property
+    def experiment_name(self) -> str:
+        return self._experiment_results.experiment_name
+
+    @property
+    def result_ids(self) -> list:
+        """
+        Data base ids of the iteration results. Id of not saved result is None
+        """
+        return [
+            None if result_id < 0 else result_id
+            for result_id in self._experiment_results.result_ids[
+                self._first : self._last
+            ].tolist()
+        ]
+
+    def __len__(self):
+        return self._last - self._first
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Answer index out of range")
+        return self._experiment_results.result(self._first + index)
+
+
+class ExperimentResults:
+    """
+    Experiment results stored column-wise in typed arrays. Module and versions data are kept once, and NResult
+    objects are created only on access. Results are read as a list of iterations, where every iteration is a list
+    of NResult objects
+    """
+
+    def __init__(
+        self,
+        module_id: int,
+        module_name: str,
+        connectivity_matrix: tuple,
+        experiment_name: str = "NoName",
+    ):
+        """
+        ExperimentResults class constructor
+        :param module_id: Module id
+        :param module_name: Module name
+        :param connectivity_matrix: Normed connectivity matrix of module versions
+        :param experiment_name: Experiment name
+        """
+        self.module_id = module_id
+        self.module_name = module_name
+        self.module_connectivity_matrix = connectivity_matrix
+        self.experiment_name = experiment_name
+        # Данные версий хранятся один раз, а для каждого ответа запоминается только позиция версии в этих списках
+        self._versions: list = []
+        self._version_ids: list = []
+        self._version_names: list = []
+        self._version_reliabilities: list = []
+        self._version_coordinates: list = []
+        # Добавляемые куски результатов объединяются в общие массивы только при первом чтении
+        self._parts: list[tuple] = []
+        self._iteration_nums = np.empty(0, dtype=np.int64)
+        self._correct_answers = np.empty(0, dtype=np.float64)
+        self._answers = np.empty(0, dtype=np.float64)
+        self._version_positions = np.empty(0, dtype=np.int32)
+        # Для ещё не сохранённых в БД результатов id равен -1
+        self._result_ids = np.empty(0, dtype=np.int64)
+        self._iteration_starts = np.zeros(1, dtype=np.int64)
+
+    def add_version(
+        self,
+        v_id: int,
+        v_name: str,
+        v_reliability: float,
+        v_common_coordinates: tuple,
+        version=None,
+    ) -> int:
+        """
+        Add data of the version, which answers are stored
+        :param version: NVersion object, which is returned in NResult objects
+        :return: version position to pass it into append_results
+        """
+        self._versions.append(version)
+        self._version_ids.append(v_id)
+        self._version_names.append(v_name)
+        self._version_reliabilities.append(v_reliability)
+        self._version_coordinates.append(v_common_coordinates)
+        return len(self._versions) - 1
+
+    def add_versions(self, versions) -> np.ndarray:
+        """
+        Add data of several NVersion objects
+        :param versions: sequence of NVersion objects
+        :return: array of versions positions
+        """
+        return np.array(
+            [
+                self.add_version(
+                    ver.id,
+                    ver.name,
+                    ver.reliability,
+                    ver.common_coordinates_list,
+                    ver,
+                )
+                for ver in versions
+            ],
+            dtype=np.int32,
+        )
+
+    def copy_without_results(self) -> "ExperimentResults":
+        """
+        Make ExperimentResults object with the same module and versions data, but without results
+        :return: ExperimentResults object
+        """
+        experiment_results = ExperimentResults(
+            self.module_id,
+            self.module_name,
+            self.module_connectivity_matrix,
+            self.experiment_name,
+        )
+        for version_data, version in zip(self.versions_data, self._versions):
+            experiment_results.add_version(*version_data, version)
+        return experiment_results
+
+    def append_results(
+        self,
+        iteration_nums,
+        correct_answers,
+        version_answers,
+        version_positions,
+        result_ids=None,
+    ):
+        """
+        Append results. All arrays contain one value per answer. Answers of one iteration should go one after
+        another
+        :param iteration_nums: Iterations numbers
+        :param correct_answers: Correct answers
+        :param version_answers: Versions answers
+        :param version_positions: Positions of versions returned by add_version
+        :param result_ids: Results ids in data base
+        """
+        version_answers = np.asarray(version_answers, dtype=np.float64)
+        if result_ids is None:
+            result_ids = np.full(len(version_answers), -1, dtype=np.int64)
+        self._parts.append(
+            (
+                np.asarray(iteration_nums, dtype=np.int64),
+                np.asarray(correct_answers, dtype=np.float64),
+                version_answers,
+                np.asarray(version_positions, dtype=np.int32),
+                np.asarray(result_ids, dtype=np.int64),
+            )
+        )
+
+    def append_iterations(
+        self,
+        first_iteration: int,
+        correct_answers,
+        version_answers,
+        version_positions,
+    ):
+        """
+        Append results of consecutive iterations, where the same versions answer in the same order
+        :param first_iteration: Number of the first iteration
+        :param correct_answers: (iterations,) array of correct answers
+        :param version_answers: (iterations, slots) array of versions answers
+        :param version_positions: (slots,) array of versions positions
+        """
+        correct_answers = np.asarray(correct_answers, dtype=np.float64)
+        version_positions = np.asarray(version_positions, dtype=np.int32)
+        iterations_amount = len(correct_answers)
+        slots_amount = len(version_positions)
+        self.append_results(
+            np.repeat(
+                np.arange(first_iteration, first_iteration + iterations_amount),
+                slots_amount,
+            ),
+            np.repeat(correct_answers, slots_amount),
+            np.asarray(version_answers, dtype=np.float64).reshape(-1),
+            np.tile(version_positions, iterations_amount),
+        )
+
+    def _consolidate(self):
+        if not self._parts:
+            return
+        columns = list(zip(*self._parts))
+        self._parts = []
+        self._iteration_nums = np.concatenate(
+            (self._iteration_nums, *columns[0])
+        )
+        self._correct_answers = np.concatenate(
+            (self._correct_answers, *columns[1])
+        )
+        self._answers = np.concatenate((self._answers, *columns[2]))
+        self._version_positions = np.concatenate(
+            (self._version_positions, *columns[3])
+        )
+        self._result_ids = np.concatenate((self._result_ids, *columns[4]))
+        # Новая итерация начинается там, где меняется её номер
+        if len(self._iteration_nums) == 0:
+            self._iteration_starts = np.zeros(1, dtype=np.int64)
+        else:
+            self._iteration_starts = np.concatenate(
+                (
+                    [0],
+                    np.flatnonzero(np.diff(self._iteration_nums)) + 1,
+                    [len(self._iteration_nums)],
+                )
+            )
+
+    @property
+    def iterations_amount(self) -> int:
+        self._consolidate()
+        return len(self._iteration_starts) - 1
+
+    @property
+    def answers_amount(self) -> int:
+        self._consolidate()
+        return len(self._answers)
+
+    @property
+    def iteration_nums(self) -> np.ndarray:
+        self._consolidate()
+        return self._iteration_nums
+
+    @property
+    def correct_answers(self) -> np.ndarray:
+        self._consolidate()
+        return self._correct_answers
+
+    @property
+    def answers(self) -> np.ndarray:
+        self._consolidate()
+        return self._answers
+
+    @property
+    def version_ids(self) -> np.ndarray:
+        """
+        Versions ids of all answers. Id of not saved version is -1
+        """
+        self._consolidate()
+        ids = np.array(
+            [-1 if v_id is None else v_id for v_id in self._version_ids],
+            dtype=np.int64,
+        )
+        return ids[self._version_positions]
+
+    @property
+    def result_ids(self) -> np.ndarray:
+        self._consolidate()
+        return self._result_ids
+
+    @property
+    def iteration_starts(self) -> np.ndarray:
+        """
+        Positions of the first answer of every iteration and the total answers amount in the end
+        """
+        self._consolidate()
+        return self._iteration_starts
+
+    @property
+    def versions_data(self) -> list[tuple]:
+        """
+        Data of versions, which answers are stored
+        :return: list of (version id, name, reliability, common coordinates) tuples
+        """
+        return list(
+            zip(
+                self._version_ids,
+                self._version_names,
+                self._version_reliabilities,
+                self._version_coordinates,
+            )
+        )
+
+    def iter_answer_rows(self, chunk_size: int = 100000):
+        """
+        Answers as rows to write them into data base. Rows are converted chunk by chunk, so all of them are never
+        kept in memory at the same time
+        :param chunk_size: Amount of answers converted at once
+        :return: generator of (version id, version answer, correct answer, iteration number) tuples
+        """
+        self._consolidate()
+        version_ids = np.array(self._version_ids, dtype=object)
+        for first in range(0, len(self._answers), chunk_size):
+            last = first + chunk_size
+            yield from zip(
+                version_ids[self._version_positions[first:last]].tolist(),
+                self._answers[first:last].tolist(),
+                self._correct_answers[first:last].tolist(),
+                self._iteration_nums[first:last].tolist(),
+            )
+
+    def answer_rows(self) -> list[tuple]:
+        """
+        Answers as rows to write them into data base
+        :return: list of (version id, version answer, correct answer, iteration number) tuples
+        """
+        return list(self.iter_answer_rows())
+
+    def answers_matrix(self) -> np.ndarray | None:
+        """
+        Versions answers as read-only (iterations, answers per iteration) array
+        :return: array or None, if iterations have different answers amount
+        """
+        self._consolidate()
+        iteration_sizes = np.diff(self._iteration_starts)
+        if len(iteration_sizes) == 0:
+            return np.empty((0, 0), dtype=np.float64)
+        if np.any(iteration_sizes != iteration_sizes[0]):
+            return None
+        answers_matrix = self._answers.reshape(
+            len(iteration_sizes), int(iteration_sizes[0])
+        )
+        answers_matrix.flags.writeable = False
+        return answers_matrix
+
+    def iteration_results(self, index: int) -> IterationResults:
+        """
+        Results of one iteration, which NResult objects are made only on access
+        :param index: Iteration index
+        :return: IterationResults object
+        """
+        self._consolidate()
+        return IterationResults(
+            self,
+            int(self._iteration_starts[index]),
+            int(self._iteration_starts[index + 1]),
+        )
+
+    def result(self, answer_index: int) -> NResult:
+        """
+        Make NResult object of one answer
+        :param answer_index: Answer position in the results arrays
+        :return: NResult object
+        """
+        self._consolidate()
+        ver_pos = int(self._version_positions[answer_index])
+        result_id = int(self._result_ids[answer_index])
+        return NResult(
+            self._version_ids[ver_pos],
+            self._version_names[ver_pos],
+            self._version_reliabilities[ver_pos],
+            self._version_coordinates[ver_pos],
+            float(self._answers[answer_index]),
+            float(self._correct_answers[answer_index]),
+            self.module_id,
+            self.module_name,
+            self.module_connectivity_matrix,
+            int(self._iteration_nums[answer_index]),
+            self._versions[ver_pos],
+            None if result_id < 0 else result_id,
+            self.experiment_name,
+        )
+
+    def __len__(self):
+        return self.iterations_amount
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        iterations_amount = len(self)
+        if index < 0:
+            index += iterations_amount
+        if not 0 <= index < iterations_amount:
+            raise IndexError("Iteration index out of range")
+        return [
+            self.result(answer_index)
+            for answer_index in range(
+                self._iteration_starts[index],
+                self._iteration_starts[index + 1],
+            )
+        ]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class VersionGrouping:
+    """
+    Module versions split into clone, similar, partly similar and difference groups by normed connectivity
+    matrix. Groups are stored as arrays of versions indexes in the module versions list. A version gets into a
+    group if it forms a pair of such kind with any other version, so it can belong to several groups
+    """
+
+    # Границы групп в долях нормированного расстояния между версиями
+    clone_max_distance = 0.05
+    similar_max_distance = 0.4
+    partly_similar_max_distance = 0.6
+
+    def __init__(self, versions, connectivity_matrix):
+        """
+        VersionGrouping class constructor
+        :param versions: Module versions list
+        :param connectivity_matrix: Normed connectivity matrix of the versions
+        """
+        self._versions = tuple(versions)
+        self._connectivity_matrix = np.asarray(
+            connectivity_matrix, dtype=float
+        )
+        # Сравниваем каждую пару версий один раз - берём только верхний треугольник матрицы
+        j, k = np.triu_indices(len(self._versions), 1)
+        distances = self._connectivity_matrix[j, k]
+        clone_mask = (0 <= distances) & (distances <= self.clone_max_distance)
+        similar_mask = (self.clone_max_distance < distances) & (
+            distances < self.similar_max_distance
+        )
+        partly_similar_mask = (self.similar_max_distance <= distances) & (
+            distances <= self.partly_similar_max_distance
+        )
+        difference_mask = ~(clone_mask | similar_mask | partly_similar_mask)
+
+        self._clone_indexes = np.union1d(j[clone_mask], k[clone_mask])
+        self._similar_indexes = np.union1d(j[similar_mask], k[similar_mask])
+        self._partly_similar_indexes = np.union1d(
+            j[partly_similar_mask], k[partly_similar_mask]
+        )
+        self._difference_indexes = np.union1d(
+            j[difference_mask], k[difference_mask]
+        )
+
+        # Для каждой частично схожей версии запоминаем наибольшее и наименьшее расстояние до других версий группы,
+        # чтобы зависимость версий на итерации определялась одним сравнением с уровнем диверсифицированности
+        submatrix = self.partly_similar_submatrix
+        other_versions_mask = ~np.eye(len(submatrix), dtype=bool)
+        self._partly_similar_max_distances = np.where(
+            other_versions_mask, np.maximum(submatrix, submatrix.T), -np.inf
+        ).max(axis=1, initial=-np.inf)
+        self._partly_similar_min_distances = np.where(
+            other_versions_mask, np.minimum(submatrix, submatrix.T), np.inf
+        ).min(axis=1, initial=np.inf)
+
+    @property
+    def versions(self) -> tuple:
+        return self._versions
+
+    @property
+    def connectivity_matrix(self) -> np.ndarray:
+        return self._connectivity_matrix
+
+    @property
+    def clone_indexes(self) -> np.ndarray:
+        return self._clone_indexes
+
+    @property
+    def similar_indexes(self) -> np.ndarray:
+        return self._similar_indexes
+
+    @property
+    def partly_similar_indexes(self) -> np.ndarray:
+        return self._partly_similar_indexes
+
+    @property
+    def difference_indexes(self) -> np.ndarray:
+        return self._difference_indexes
+
+    @property
+    def slot_indexes(self) -> np.ndarray:
+        """
+        Versions indexes in the order in which versions answer on every experiment iteration: clone, similar,
+        partly similar and difference groups one after another
+        :return: array of versions indexes
+        """
+        return np.concatenate(
+            (
+                self._clone_indexes,
+                self._similar_indexes,
+                self._partly_similar_indexes,
+                self._difference_indexes,
+            )
+        )
+
+    def get_versions(self, indexes) -> tuple:
+        return tuple(self._versions[i] for i in indexes)
+
+    @property
+    def clone_versions(self) -> tuple:
+        return self.get_versions(self._clone_indexes)
+
+    @property
+    def similar_versions(self) -> tuple:
+        return self.get_versions(self._similar_indexes)
+
+    @property
+    def partly_similar_versions(self) -> tuple:
+        return self.get_versions(self._partly_similar_indexes)
+
+    @property
+    def difference_versions(self) -> tuple:
+        return self.get_versions(self._difference_indexes)
+
+    @property
+    def partly_similar_submatrix(self) -> np.ndarray:
+        """
+        Normed connectivity matrix between partly similar versions only
+        :return: (m, m) array, where m is partly similar versions amount
+        """
+        return self._connectivity_matrix[
+            np.ix_(self._partly_similar_indexes, self._partly_similar_indexes)
+        ]
+
+    def partly_similar_dependency(self, diversities) -> tuple:
+        """
+        Split partly similar versions into depended and independent ones for every diversity level. A version is
+        depended, if its distance to any other version of the group is not less than the diversity level, and
+        independent, if its distance to any other version is less than it, so a version can be both
+        :param diversities: Diversity level or array of iterations diversity levels
+        :return: (depended, independent) tuple of boolean arrays with shape (*diversities.shape, m), where m is
+        partly similar versions amount
+        """
+        diversities = np.asarray(diversities, dtype=float)[..., None]
+        return (
+            self._partly_similar_max_distances >= diversities,
+            self._partly_similar_min_distances < diversities,
+        )
+
+    def __iter__(self):
+        # Позволяет распаковывать группировку так же, как раньше распаковывался кортеж из 4-х множеств версий
+        return iter(
+            (
+                self.clone_versions,
+                self.similar_versions,
+                self.partly_similar_versions,
+                self.difference_versions,
+            )
+        )
+
+    def __str__(self):
+        return (
+            f"clone: {self._clone_indexes.tolist()}; similar: {self._similar_indexes.tolist()}; "
+            f"partly similar: {self._partly_similar_indexes.tolist()}; "
+            f"difference: {self._difference_indexes.tolist()}"
+        )
+
+
+class ExperimentBatch:
+    """
+    Experiment data of a whole run (or of its iterations chunk) as arrays. Every column is a result slot of an
+    iteration. Slots go in the same order as results of the iteration list built by the scalar generator
+    """
+
+    def __init__(
+        self,
+        correct_answers: np.ndarray,
+        version_answers: np.ndarray,
+        reliability_draws: np.ndarray,
+        version_indexes: np.ndarray,
+        first_iteration: int = 0,
+    ):
+        """
+        ExperimentBatch class constructor
+        :param correct_answers: (iterations,) array of correct answers
+        :param version_answers: (iterations, slots) array of versions answers
+        :param reliability_draws: (iterations, slots) array of random numbers compared with versions reliability
+        :param version_indexes: (slots,) array of versions indexes in module versions list
+        :param first_iteration: Number of the first iteration in the batch
+        """
+        self.correct_answers = correct_answers
+        self.version_answers = version_answers
+        self.reliability_draws = reliability_draws
+        self.version_indexes = version_indexes
+        self.first_iteration = first_iteration
+        # Сид эксперимента, по которому сгенерированы данные
+        self.seed: int = None
+
+    @classmethod
+    def concatenate(cls, batches: list):
+        """
+        Join batches of consecutive iterations chunks into one batch
+        :param batches: list of ExperimentBatch objects in iterations order
+        :return: ExperimentBatch object
+        """
+        return cls(
+            np.concatenate([batch.correct_answers for batch in batches]),
+            np.concatenate([batch.version_answers for batch in batches]),
+            np.concatenate([batch.reliability_draws for batch in batches]),
+            batches[0].version_indexes,
+            batches[0].first_iteration,
+        )
+
+    @property
+    def iterations_amount(self) -> int:
+        return self.version_answers.shape[0]
+
+    @property
+    def slots_amount(self) -> int:
+        return self.version_answers.shape[1]
+
+    @property
+    def iteration_nums(self) -> np.ndarray:
+        return np.arange(
+            self.first_iteration, self.first_iteration + self.iterations_amount
+        )
+
+
 class NModule:
     """
     N-version programming module
@@ -314,6 +990,9 @@ class NModule:
         self.max_out_val = max_out_val
         # Versions, which are included into module
         self._versions_list: list[NVersion] = []
+        # Версии по их id и позиции версий в списке для поиска за O(1)
+        self._versions_by_id: dict[int, NVersion] = {}
+        self._version_indexes: dict[int, int] = {}
         # List of tuples, that contain constant diversities values
         self._const_diversities_versions_list = []
         # List of tuples, that contain intervals to generate dynamic diversities
@@ -324,6 +1003,16 @@ class NModule:
         self._global_results_lst_2_write: list[tuple] = []
         self._experiment_name = None
         self._db_name = "experiment.db"
+        # Нормированная матрица связности пересчитывается только при изменении состава версий или их координат
+        self._connectivity_matrix_cache = None
+        self._connectivity_array_cache = None
+        self._connectivity_matrix_cache_key = None
+        self._connectivity_matrix_cache_hits = 0
+        self._connectivity_matrix_cache_misses = 0
+        self._version_grouping: VersionGrouping = None
+        self._experiment_seed: int = None
+        self._experiment_batch = False
+        self._random_stream = Random()
 
     @property
     def id(self):
@@ -336,6 +1025,51 @@ class NModule:
     @versions_list.setter
     def versions_list(self, new_ver_lst: list):
         self._versions_list = new_ver_lst
+        self._reindex_versions()
+
+    def _reindex_versions(self):
+        self._versions_by_id = {
+            ver.id: ver for ver in self._versions_list if ver.id is not None
+        }
+        self._version_indexes = {
+            id(ver): index for index, ver in enumerate(self._versions_list)
+        }
+
+    def add_version(self, version: NVersion):
+        """
+        Add version to module and index it
+        :param version: NVersion object
+        """
+        self._version_indexes[id(version)] = len(self._versions_list)
+        self._versions_list.append(version)
+        if version.id is not None:
+            self._versions_by_id[version.id] = version
+
+    def get_version_by_id(self, id_4_search: int) -> NVersion | None:
+        version = self._versions_by_id.get(id_4_search)
+        if version is None or version.id != id_4_search:
+            # Id присваивается версии при сохранении в БД, т.е. уже после её добавления в модуль
+            self._reindex_versions()
+            version = self._versions_by_id.get(id_4_search)
+        return version
+
+    def version_index(self, version: NVersion) -> int:
+        """
+        Position of the version in module versions list
+        :param version: NVersion object
+        :return: version index
+        """
+        index = self._version_indexes.get(id(version))
+        if (
+            index is None
+            or index >= len(self._versions_list)
+            or self._versions_list[index] is not version
+        ):
+            self._reindex_versions()
+            index = self._version_indexes.get(id(version))
+            if index is None:
+                raise ValueError(f"Version {version.name} is not in module")
+        return index
 
     @property
     def const_diversities_versions_list(self):
@@ -369,68 +1103,75 @@ class NModule:
     def dynamic_diversities_count(self, dyn_div_count: int):
         self._dynamic_diversities_count = dyn_div_count
 
+    def _get_connectivity_matrix_cache_key(self) -> tuple:
+        return tuple(
+            (id(ver), ver.coordinates_revision) for ver in self._versions_list
+        )
+
     @property
-    def normed_connectivity_matrix(self):
+    def connectivity_matrix_cache_info(self) -> dict:
         """
-        Figure out distance length between versions in the metric space in percents (from 0 to 1)
-        :return: matrix (tuple of tuples)
+        Connectivity matrix cache usage statistics
+        :return: dict with "hits" and "misses" counters
         """
+        return {
+            "hits": self._connectivity_matrix_cache_hits,
+            "misses": self._connectivity_matrix_cache_misses,
+        }
 
+    def _update_connectivity_matrix_cache(self):
         if not self._versions_list or len(self._versions_list) == 0:
             raise AttributeError("There are not versions in module")
 
-        matrix = []
-        for cur_ver in self._versions_list:
-            matrix.append(
-                [
-                    cur_ver.calculate_distance_to(another_ver)
-                    for another_ver in self._versions_list
-                ]
-            )
-
-        max_val = max(map(max, matrix))
+        cache_key = self._get_connectivity_matrix_cache_key()
+        if cache_key == self._connectivity_matrix_cache_key:
+            self._connectivity_matrix_cache_hits += 1
+            return
+        self._connectivity_matrix_cache_misses += 1
 
-        try:
-            for i in range(len(matrix)):
-                for j in range(len(matrix[i])):
-                    matrix[i][j] /= max_val
-        except ZeroDivisionError:
+        matrix = versions_distance_matrix(self._versions_list)
+        max_val = matrix.max()
+        if max_val == 0:
             print(
                 "Max distance between all versions is zero, so connectivity matrix cannot by normed"
             )
+        else:
+            matrix /= max_val
+        matrix.setflags(write=False)
+
+        self._connectivity_array_cache = matrix
+        self._connectivity_matrix_cache = tuple(map(tuple, matrix.tolist()))
+        self._connectivity_matrix_cache_key = cache_key
+
+    @property
+    def normed_connectivity_matrix(self):
+        """
+        Figure out distance length between versions in the metric space in percents (from 0 to 1).
+        Matrix is cached until versions list or versions coordinates are changed
+        :return: matrix (tuple of tuples)
+        """
+        self._update_connectivity_matrix_cache()
+        return self._connectivity_matrix_cache
 
-        return tuple(map(tuple, matrix))
+    @property
+    def normed_connectivity_array(self):
+        """
+        The same normed connectivity matrix as read-only NumPy array
+        :return: (n, n) array
+        """
+        self._update_connectivity_matrix_cache()
+        return self._connectivity_array_cache
 
     @property
     def global_results_lst(self):
         return self._global_results_lst
 
     def _get_global_results_lst_2_write(self):
-        for sub_lst in self._global_results_lst:
-            for itm in sub_lst:
-                self._global_results_lst_2_write.append(
-                    (
-                        itm.version_id,
-                        itm.version_name,
-                        itm.version_reliability,
-                        json.dumps(
-                            {
-                                "version_coordinates": itm.version_common_coordinates
-                            }
-                        ),
-                        itm.version_answer,
-                        itm.correct_answer,
-                        itm.module_id,
-                        itm.module_name,
-                        json.dumps(
-                            {
-                                "connectivity_matrix": itm.module_connectivity_matrix
-                            }
-                        ),
-                        itm.module_iteration_num,
-                        itm.experiment_name,
-                    )
-                )
+        # Данные модуля и версий сохраняются отдельно от ответов, поэтому строка ответа содержит только id и числа
+        if len(self._global_results_lst) > 0:
+            self._global_results_lst_2_write.extend(
+                self._global_results_lst.answer_rows()
+            )
 
     @property
     def global_results_lst_2_write(self):
@@ -506,77 +1247,74 @@ class NModule:
                 self._dynamic_diversities_intervals_dict[cur_new_version.name],
                 self.round_to,
             )
-            self._versions_list.append(cur_new_version)
-
-    def get_version_by_id(self, id_4_search: int) -> NVersion:
-        for cur_ver in self._versions_list:
-            if cur_ver.id is not None and cur_ver.id == id_4_search:
-                return cur_ver
-        else:
-            return None
+            self.add_version(cur_new_version)
 
-    def _group_versions(self):
-        clone_versions = set()
-        similar_versions = set()
-        partly_similar_versions = set()
-        difference_versions = set()
-        for j in range(len(self._versions_list)):
-            for k in range(len(self._versions_list)):
-                if (
-                    k > j
-                ):  # Сравниваем версии только если они разыне и ещё не сравнивались
-                    # Если версии отличаются не более чем на 5%, то считаем их клонами
-                    if 0 <= self.normed_connectivity_matrix[j][k] <= 0.05:
-                        self._add_to_set(clone_versions, j, k)
-                    elif (
-                        0.05 < self.normed_connectivity_matrix[j][k] < 0.4
-                    ):  # Если версии похожи, но не клоны
-                        self._add_to_set(similar_versions, j, k)
-                    elif (
-                        0.4 <= self.normed_connectivity_matrix[j][k] <= 0.6
-                    ):  # Если версии частично похожи (~50%)
-                        self._add_to_set(partly_similar_versions, j, k)
-                    else:  # Если версии имеют значительные различия
-                        self._add_to_set(difference_versions, j, k)
-        return (
-            clone_versions,
-            similar_versions,
-            partly_similar_versions,
-            difference_versions,
-        )
-
-    def _add_to_set(self, version_set, j, k):
-        if self._versions_list[j] not in version_set:
-            version_set.add(self._versions_list[j])
-        if self._versions_list[k] not in version_set:
-            version_set.add(self._versions_list[k])
-
-    def _create_result(
-        self, ver, v_answer, cur_correct_val, i, experiment_name
+    def add_generated_versions(
+        self,
+        versions_amount: int,
+        reliability_interval: tuple[float, float],
+        diversities_intervals: list[tuple[float, float]],
+        random_stream: Random = None,
     ):
-        return NResult(
-            v_id=ver.id,
-            v_name=ver.name,
-            v_reliability=ver.reliability,
-            v_common_coordinates=ver.common_coordinates_list,
-            v_answer=v_answer,
-            c_answer=cur_correct_val,
-            m_id=self._id,
-            m_name=self.name,
-            m_connectivity_matrix=self.normed_connectivity_matrix,
-            m_iteration_num=i,
-            version=ver,
-            experiment_name=experiment_name,
+        """
+        Add versions with reliability and dynamic diversities generated from the intervals without user input
+        :param versions_amount: Amount of new versions
+        :param reliability_interval: (min, max) interval to generate versions reliability
+        :param diversities_intervals: (min, max) intervals to generate dynamic diversity coordinates of every version
+        :param random_stream: Random numbers generator of the versions. Versions are not reproducible, if None
+        """
+        if not 0 <= reliability_interval[0] <= reliability_interval[1] <= 1:
+            raise ValueError(
+                f"Reliability interval should be inside [0, 1]. {reliability_interval} was got."
+            )
+        # У всех версий одинаковое число координат, иначе расстояния между ними не определены
+        self._dynamic_diversities_count = len(diversities_intervals)
+        first_version_num = len(self._versions_list) + 1
+        for version_num in range(
+            first_version_num, first_version_num + versions_amount
+        ):
+            cur_new_version = NVersion(name=f"Version {version_num}")
+            self._dynamic_diversities_intervals_dict[
+                cur_new_version.name
+            ] = list(diversities_intervals)
+            cur_new_version.generate_reliability(
+                *reliability_interval, self.round_to, random_stream
+            )
+            cur_new_version.generate_dynamic_diversities(
+                diversities_intervals, self.round_to, random_stream
+            )
+            self.add_version(cur_new_version)
+
+    def group_versions(self) -> VersionGrouping:
+        """
+        Split module versions into clone, similar, partly similar and difference groups
+        :return: VersionGrouping object
+        """
+        return VersionGrouping(
+            self._versions_list, self.normed_connectivity_array
         )
 
+    @property
+    def experiment_seed(self):
+        return self._experiment_seed
+
+    @property
+    def version_grouping(self):
+        """
+        Versions grouping, which was used by the last experiment data generation
+        """
+        return self._version_grouping
+
     def _generate_error_value(self, base_val, diversity_coefficient):
         return round(
-            normalvariate(base_val, diversity_coefficient * base_val),
+            self._random_stream.normalvariate(
+                base_val, diversity_coefficient * base_val
+            ),
             self.round_to,
         )
 
     def _process_clone_versions(
-        self, clone_versions, cur_correct_val, result_lst, i, experiment_name
+        self, clone_versions, cur_correct_val, answers_lst
     ):
         try:
             min_rel = min(ver.reliability for ver in clone_versions)
@@ -585,37 +1323,24 @@ class NModule:
 
         # Генерируем число, которое покажет, отработали ли версии верно. Если оно будет больше минимальной
         # надёжности, то считаем, что все версии выдают одно ошибочное значение, иначе - все выдают верный ответ
-        cur_clone_reliability = random()
+        cur_clone_reliability = self._random_stream.random()
 
         for ver in clone_versions:
             if cur_clone_reliability <= min_rel:
-                result_lst.append(
-                    self._create_result(
-                        ver,
-                        cur_correct_val,
-                        cur_correct_val,
-                        i,
-                        experiment_name,
-                    )
-                )
+                answers_lst.append(cur_correct_val)
             else:
                 clone_error_val = round(
-                    uniform(self.min_out_val, self.max_out_val), self.round_to
-                )
-                result_lst.append(
-                    self._create_result(
-                        ver,
-                        clone_error_val,
-                        cur_correct_val,
-                        i,
-                        experiment_name,
-                    )
+                    self._random_stream.uniform(
+                        self.min_out_val, self.max_out_val
+                    ),
+                    self.round_to,
                 )
+                answers_lst.append(clone_error_val)
 
     def _process_similar_versions(
-        self, similar_versions, cur_correct_val, result_lst, i, experiment_name
+        self, similar_versions, cur_correct_val, answers_lst
     ):
-        cur_similar_reliability = random()
+        cur_similar_reliability = self._random_stream.random()
         # Сначала в отдельном цикле ищем корректно отработавщие версии, чтобы в окрестностях верного ответа
         # генерировать неправильные результаты мультиверсий выдавщих ошибку. Если проводить проверку в одном цикле,
         # то когда первая из этого множества версий отработает некорректно, а некоторые другие - корректно, все
@@ -630,44 +1355,29 @@ class NModule:
             cur_correct_val
             if correct_similar_versions
             else round(
-                uniform(self.min_out_val, self.max_out_val), self.round_to
+                self._random_stream.uniform(
+                    self.min_out_val, self.max_out_val
+                ),
+                self.round_to,
             )
         )
         # Границы такие же, как определялись в матрице смежностей для отнесения версий к похожим.
-        diversity_coefficient = round(uniform(0.06, 0.39), self.round_to)
+        diversity_coefficient = round(
+            self._random_stream.uniform(0.06, 0.39), self.round_to
+        )
 
         for ver in similar_versions:
             if cur_similar_reliability > ver.reliability:
-                similar_error_val = self._generate_error_value(
-                    similar_base_error_val, diversity_coefficient
-                )
-                result_lst.append(
-                    self._create_result(
-                        ver,
-                        similar_error_val,
-                        cur_correct_val,
-                        i,
-                        experiment_name,
+                answers_lst.append(
+                    self._generate_error_value(
+                        similar_base_error_val, diversity_coefficient
                     )
                 )
             else:
-                result_lst.append(
-                    self._create_result(
-                        ver,
-                        cur_correct_val,
-                        cur_correct_val,
-                        i,
-                        experiment_name,
-                    )
-                )
+                answers_lst.append(cur_correct_val)
 
     def _process_partly_similar_versions(
-        self,
-        partly_similar_versions,
-        cur_correct_val,
-        result_lst,
-        i,
-        experiment_name,
+        self, version_grouping, cur_correct_val, answers_lst
     ):
         # Здесь мы уже генерируем случайное число для каждой из версий, чтобы определить, позволила ли ей её
         # надёжность отработать корректно на данной итерации. Если надёжность позволила, то хорошо, если нет, то
@@ -675,128 +1385,69 @@ class NModule:
         # уровень диверсифицированности версии, то считаем, что такие мультиверсии зависимы - для них генерируем
         # единый неверный результат, для частично зависимых версии генерируем ответ по нормальному закону
         # распределения, иначе - генерируем независимый ошибочный результат.
-        cur_partly_similar_diversity = random()
-        partly_similar_depended_versions = set()
-        partly_similar_independent_versions = set()
-
-        for ver1 in partly_similar_versions:
-            for ver2 in partly_similar_versions:
-                if ver1 != ver2:
-                    v1_index = self._versions_list.index(ver1)
-                    v2_index = self._versions_list.index(ver2)
-                    # Если диверсифицировнность версий больше или равна случайному уровню диверсифицированности, то
-                    # считаем их различными, иначе - считаем зависимыми
-                    if (
-                        self.normed_connectivity_matrix[v1_index][v2_index]
-                        >= cur_partly_similar_diversity
-                    ):
-                        partly_similar_depended_versions.add(ver1)
-                        partly_similar_depended_versions.add(ver2)
-                    else:
-                        partly_similar_independent_versions.add(ver1)
-                        partly_similar_independent_versions.add(ver2)
-
-        correct_partly_similar_versions = {
-            ver
-            for ver in partly_similar_versions
-            if random() <= ver.reliability
-        }
-        error_partly_similar_versions = (
-            partly_similar_versions - correct_partly_similar_versions
-        )
-        error_partly_abs_depended_versions = (
-            error_partly_similar_versions & partly_similar_depended_versions
-        )
-        error_partly_abs_independent_versions = (
-            error_partly_similar_versions & partly_similar_independent_versions
-        )
-        error_partly_similar_versions -= (
-            error_partly_abs_depended_versions
-            | error_partly_abs_independent_versions
+        partly_similar_versions = version_grouping.partly_similar_versions
+        cur_partly_similar_diversity = self._random_stream.random()
+        # Если диверсифицировнность версий больше или равна случайному уровню диверсифицированности, то считаем их
+        # зависимыми, иначе - различными. Расстояния между версиями уже посчитаны при группировке
+        depended_mask, independent_mask = (
+            mask.tolist()
+            for mask in version_grouping.partly_similar_dependency(
+                cur_partly_similar_diversity
+            )
         )
 
         # Для всех абсолютно схожих версий ставим в соответствие одно неверное значение
         partly_similar_base_error_val = round(
-            uniform(self.min_out_val, self.max_out_val), self.round_to
+            self._random_stream.uniform(self.min_out_val, self.max_out_val),
+            self.round_to,
         )
 
-        for ver in correct_partly_similar_versions:
-            result_lst.append(
-                self._create_result(
-                    ver, cur_correct_val, cur_correct_val, i, experiment_name
-                )
-            )
-
-        for ver in error_partly_abs_depended_versions:
-            result_lst.append(
-                self._create_result(
-                    ver,
-                    partly_similar_base_error_val,
-                    cur_correct_val,
-                    i,
-                    experiment_name,
-                )
-            )
-
-        # Для частично схожих версий генерирует ответы по нормальному распределению на основе одного значения
-        for ver in error_partly_similar_versions:
-            partly_similar_error_val = self._generate_error_value(
-                partly_similar_base_error_val, cur_partly_similar_diversity
-            )
-            result_lst.append(
-                self._create_result(
-                    ver,
-                    partly_similar_error_val,
-                    cur_correct_val,
-                    i,
-                    experiment_name,
+        # Каждая версия группы выдаёт ровно один ответ и всегда на одной и той же позиции в списке результатов
+        # итерации. Если версия зависима от одной версии группы и независима от другой, то считаем её зависимой
+        for ver_index, ver in enumerate(partly_similar_versions):
+            if self._random_stream.random() <= ver.reliability:
+                partly_similar_answer = cur_correct_val
+            elif depended_mask[ver_index]:
+                partly_similar_answer = partly_similar_base_error_val
+            elif independent_mask[ver_index]:
+                # Для полностью разных версий генерируем абсолюно независимые ответы
+                partly_similar_answer = round(
+                    self._random_stream.uniform(
+                        self.min_out_val, self.max_out_val
+                    ),
+                    self.round_to,
                 )
-            )
-
-        # Для полностью разных версий генерируем абсолюно независимые ответы
-        for ver in error_partly_abs_independent_versions:
-            partly_similar_independent_error_val = round(
-                uniform(self.min_out_val, self.max_out_val), self.round_to
-            )
-            result_lst.append(
-                self._create_result(
-                    ver,
-                    partly_similar_independent_error_val,
-                    cur_correct_val,
-                    i,
-                    experiment_name,
+            else:
+                # Для частично схожих версий генерирует ответы по нормальному распределению на основе одного значения
+                partly_similar_answer = self._generate_error_value(
+                    partly_similar_base_error_val, cur_partly_similar_diversity
                 )
-            )
+            answers_lst.append(partly_similar_answer)
 
     def _process_difference_versions(
-        self,
-        difference_versions,
-        cur_correct_val,
-        result_lst,
-        i,
-        experiment_name,
+        self, difference_versions, cur_correct_val, answers_lst
     ):
         for ver in difference_versions:
-            cur_difference_reliability = random()
+            cur_difference_reliability = self._random_stream.random()
             cur_dif_version_answer = (
                 cur_correct_val
                 if cur_difference_reliability <= ver.reliability
                 else round(
-                    uniform(self.min_out_val, self.max_out_val), self.round_to
-                )
-            )
-            result_lst.append(
-                self._create_result(
-                    ver,
-                    cur_dif_version_answer,
-                    cur_correct_val,
-                    i,
-                    experiment_name,
+                    self._random_stream.uniform(
+                        self.min_out_val, self.max_out_val
+                    ),
+                    self.round_to,
                 )
             )
+            answers_lst.append(cur_dif_version_answer)
 
     def generate_experiment_data(
-        self, iterations_amount: int, experiment_name: str
+        self,
+        iterations_amount: int,
+        experiment_name: str,
+        seed: int = None,
+        workers: int = 1,
+        batch: bool = False,
     ) -> list:
         # Сначала находим версии-клоны - для них генерируем одно число для определения надёжности, если число >
         # минимальной надёжности, то версии выдают единый неверный результат, иначе - все выдают верный результат. Берём
@@ -809,58 +1460,436 @@ class NModule:
         # а какие сгенерированные по нормальному закону. Если версии различны > 50% примерно, то для каждой из них
         # генерируем разные вероятности на надёжностей и генерируем независимые ошибочные резульаты
 
-        # Чтобы не возникало неопределённости при записи результатов в БД, очищаем имеющиеся результаты перед генерацией
+        version_grouping, seed, iterations_chunks = self._prepare_experiment(
+            iterations_amount, experiment_name, seed, workers, batch
+        )
+        # Чтобы не возникало неопределённости при записи результатов в БД, очищаем имеющиеся результаты перед генерацией.
+        # Потоковая генерация результаты модуля не меняет
         self._global_results_lst_2_write = list()
         self._global_results_lst = list()
-        # Запускаем цикл по количеству зананных итераций
-        for i in range(iterations_amount):
-            result_lst = list()
-            # Разбиваем версии на группы для различной генерации результатов их работы
+        experiment_results = ExperimentResults(
+            self._id, self.name, self.normed_connectivity_matrix, experiment_name
+        )
+        # Ответы итерации идут в порядке групп версий, поэтому позиции версий раскладываются по слотам один раз
+        slot_positions = experiment_results.add_versions(
+            version_grouping.versions
+        )[version_grouping.slot_indexes]
+        self._add_chunks_results(
+            self._generate_chunks(
+                version_grouping, seed, iterations_chunks, workers, batch
+            ),
+            iterations_chunks,
+            experiment_results,
+            slot_positions,
+        )
+        self._global_results_lst = experiment_results
+        return self._global_results_lst
+
+    def stream_experiment_data(
+        self,
+        iterations_amount: int,
+        experiment_name: str,
+        seed: int = None,
+        workers: int = 1,
+        batch: bool = False,
+        first_iteration: int = 0,
+    ):
+        """
+        Generate experiment data without keeping the whole run in memory. Results of the module are not changed, and
+        every iterations chunk is returned as soon as it is generated
+        :param batch: Generate every iterations chunk with NumPy arrays as generate_experiment_batch does
+        :param first_iteration: Number of the first returned iteration. Iterations after it are the same as in the
+        whole run with the same seed
+        :return: generator of ExperimentResults objects with results of consecutive iterations chunks
+        """
+        version_grouping, seed, iterations_chunks = self._prepare_experiment(
+            iterations_amount, experiment_name, seed, workers, batch
+        )
+        # Кусок, в котором начинаются новые итерации, генерируется целиком, чтобы его поток случайных чисел совпал
+        # с генерацией всего прогона, а итерации до первой отбрасываются
+        first_chunk_index = first_iteration // ITERATIONS_CHUNK_SIZE
+        iterations_chunks = iterations_chunks[first_chunk_index:]
+        return self._chunks_experiment_results(
+            self._generate_chunks(
+                version_grouping,
+                seed,
+                iterations_chunks,
+                workers,
+                batch,
+                first_chunk_index,
+            ),
+            iterations_chunks,
+            version_grouping,
+            experiment_name,
+            first_iteration,
+        )
+
+    def _prepare_experiment(
+        self,
+        iterations_amount: int,
+        experiment_name: str,
+        seed: int,
+        workers: int,
+        batch: bool = False,
+    ) -> tuple:
+        if workers < 1:
+            raise ValueError(
+                f"Workers amount should be positive. {workers} was got."
+            )
+        # Сид эксперимента сохраняется вместе с ним, чтобы данные можно было сгенерировать повторно
+        if seed is None:
+            seed = new_experiment_seed()
+        # Разбиваем версии на группы для различной генерации результатов их работы. Версии модуля за время
+        # эксперимента не меняются, поэтому группировка выполняется один раз на весь прогон
+        version_grouping = self.group_versions()
+        self._version_grouping = version_grouping
+        self._experiment_name = experiment_name
+        self._experiment_seed = seed
+        self._experiment_batch = batch
+        return version_grouping, seed, chunk_bounds(iterations_amount)
+
+    def _generate_chunks(
+        self,
+        version_grouping,
+        seed: int,
+        iterations_chunks,
+        workers: int,
+        batch: bool = False,
+        first_chunk_index: int = 0,
+    ):
+        generate_chunk = partial(
             (
-                clone_versions,
-                similar_versions,
-                partly_similar_versions,
-                difference_versions,
-            ) = self._group_versions()
+                self._generate_batch_chunk_answers
+                if batch
+                else self._generate_iterations_chunk
+            ),
+            version_grouping,
+            seed,
+        )
+        chunks_args = [
+            (chunk_index, first_iteration, last_iteration)
+            for chunk_index, (first_iteration, last_iteration) in enumerate(
+                iterations_chunks, first_chunk_index
+            )
+        ]
+        if workers == 1 or len(iterations_chunks) < 2:
+            for args in chunks_args:
+                yield generate_chunk(*args)
+        else:
+            workers = min(workers, len(iterations_chunks))
+            # Каждый процесс возвращает только ответы версий своего куска, а собираются они здесь. Куски отдаются
+            # в порядке итераций, поэтому результат совпадает с последовательной генерацией. Одновременно в работе
+            # не больше двух кусков на процесс, чтобы готовые куски не накапливались, пока предыдущие обрабатываются
+            with ProcessPoolExecutor(workers) as executor:
+                pending_chunks = deque()
+                for args in chunks_args:
+                    pending_chunks.append(executor.submit(generate_chunk, *args))
+                    if len(pending_chunks) >= 2 * workers:
+                        yield pending_chunks.popleft().result()
+                while pending_chunks:
+                    yield pending_chunks.popleft().result()
+
+    @staticmethod
+    def _add_chunks_results(
+        chunks,
+        iterations_chunks,
+        experiment_results,
+        slot_positions,
+        first_iteration: int = 0,
+    ):
+        for (correct_answers, version_answers), (
+            chunk_first_iteration,
+            _,
+        ) in zip(chunks, iterations_chunks):
+            # Итерации куска до первой нужной уже есть в эксперименте
+            skipped_amount = max(first_iteration - chunk_first_iteration, 0)
+            experiment_results.append_iterations(
+                chunk_first_iteration + skipped_amount,
+                correct_answers[skipped_amount:],
+                version_answers[skipped_amount:],
+                slot_positions,
+            )
+
+    def _chunks_experiment_results(
+        self,
+        chunks,
+        iterations_chunks,
+        version_grouping,
+        experiment_name: str,
+        first_iteration: int = 0,
+    ):
+        for chunk, iterations_chunk in zip(chunks, iterations_chunks):
+            experiment_results = ExperimentResults(
+                self._id,
+                self.name,
+                self.normed_connectivity_matrix,
+                experiment_name,
+            )
+            slot_positions = experiment_results.add_versions(
+                version_grouping.versions
+            )[version_grouping.slot_indexes]
+            self._add_chunks_results(
+                [chunk],
+                [iterations_chunk],
+                experiment_results,
+                slot_positions,
+                first_iteration,
+            )
+            yield experiment_results
+
+    def _generate_iterations_chunk(
+        self,
+        version_grouping,
+        seed: int,
+        chunk_index: int,
+        first_iteration: int,
+        last_iteration: int,
+    ) -> tuple[list, list]:
+        """
+        Generate versions answers of the experiment iterations chunk
+        :return: tuple of correct answers list and list of versions answers lists. Answers of an iteration go in
+        the version_grouping.slot_indexes order
+        """
+        # У каждого куска итераций свой поток случайных чисел, поэтому куски можно генерировать в любом порядке и
+        # в разных процессах, а результат будет тем же, что и при последовательной генерации
+        self._random_stream = chunk_python_random(seed, chunk_index)
+        clone_versions = version_grouping.clone_versions
+        similar_versions = version_grouping.similar_versions
+        difference_versions = version_grouping.difference_versions
+        correct_answers = list()
+        version_answers = list()
+        # Запускаем цикл по итерациям куска
+        for _ in range(first_iteration, last_iteration):
+            answers_lst = list()
             # Генерируем значение, которое будет считаться правильным ответом на текущей итерации
             cur_correct_val = round(
-                uniform(self.min_out_val, self.max_out_val), self.round_to
+                self._random_stream.uniform(
+                    self.min_out_val, self.max_out_val
+                ),
+                self.round_to,
             )
             # Теперь для каждой группы версий генерируем результаты их работы
             # ---------------------------------------------------------------
             # 1. Генерируем выходные данные для версий-клонов
             self._process_clone_versions(
-                clone_versions, cur_correct_val, result_lst, i, experiment_name
+                clone_versions, cur_correct_val, answers_lst
             )
             # 2. Генерируем выходные данные для явно схожих версий
             self._process_similar_versions(
-                similar_versions,
-                cur_correct_val,
-                result_lst,
-                i,
-                experiment_name,
+                similar_versions, cur_correct_val, answers_lst
             )
             # 3. Генерируем выходные данные для частично схожих версий
             self._process_partly_similar_versions(
-                partly_similar_versions,
-                cur_correct_val,
-                result_lst,
-                i,
-                experiment_name,
+                version_grouping, cur_correct_val, answers_lst
             )
             # 4. Генерируем выходные данные для явно несхожих версий
             self._process_difference_versions(
-                difference_versions,
-                cur_correct_val,
-                result_lst,
-                i,
-                experiment_name,
+                difference_versions, cur_correct_val, answers_lst
             )
             # ---------------------------------------------------------------
-            self._global_results_lst.append(result_lst)
+            correct_answers.append(cur_correct_val)
+            version_answers.append(answers_lst)
+        return correct_answers, version_answers
+
+    def generate_experiment_batch(
+        self, iterations_amount: int, experiment_name: str, seed: int = None
+    ) -> ExperimentBatch:
+        """
+        Generate the whole experiment run at once as NumPy arrays. Clone, similar, partly similar and
+        difference versions are processed by the same rules as in generate_experiment_data, but every random value
+        is drawn for all iterations of a chunk by one call. Results of the module are not changed
+        :param iterations_amount: Iterations amount
+        :param experiment_name: Experiment name
+        :param seed: Experiment seed. New seed is generated if it is None
+        :return: ExperimentBatch object
+        """
+        if seed is None:
+            seed = new_experiment_seed()
+        version_grouping = self.group_versions()
+        self._version_grouping = version_grouping
         self._experiment_name = experiment_name
-        self._get_global_results_lst_2_write()
-        return self._global_results_lst
+        self._experiment_seed = seed
+        self._experiment_batch = True
+        # У прогона без итераций один пустой кусок, чтобы в пакете были слоты версий
+        iterations_chunks = chunk_bounds(iterations_amount) or [(0, 0)]
+        experiment_batch = ExperimentBatch.concatenate(
+            [
+                self._generate_batch_chunk(
+                    version_grouping,
+                    seed,
+                    chunk_index,
+                    first_iteration,
+                    last_iteration,
+                )
+                for chunk_index, (
+                    first_iteration,
+                    last_iteration,
+                ) in enumerate(iterations_chunks)
+            ]
+        )
+        experiment_batch.seed = seed
+        return experiment_batch
+
+    def _generate_batch_chunk_answers(
+        self,
+        version_grouping,
+        seed: int,
+        chunk_index: int,
+        first_iteration: int,
+        last_iteration: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Generate versions answers of the experiment iterations chunk with NumPy arrays
+        :return: tuple of correct answers array and (iterations, slots) array of versions answers. Answers of an
+        iteration go in the version_grouping.slot_indexes order
+        """
+        # Процессы возвращают только ответы, без случайных чисел надёжности, чтобы не пересылать лишние массивы
+        experiment_batch = self._generate_batch_chunk(
+            version_grouping,
+            seed,
+            chunk_index,
+            first_iteration,
+            last_iteration,
+        )
+        return (
+            experiment_batch.correct_answers,
+            experiment_batch.version_answers,
+        )
+
+    def _generate_batch_chunk(
+        self,
+        version_grouping,
+        seed: int,
+        chunk_index: int,
+        first_iteration: int,
+        last_iteration: int,
+    ) -> ExperimentBatch:
+        rng = chunk_numpy_generator(seed, chunk_index)
+        iterations_amount = last_iteration - first_iteration
+        reliabilities = np.array(
+            [ver.reliability for ver in version_grouping.versions], dtype=float
+        )
+
+        def uniform_values(size):
+            return np.round(
+                rng.uniform(self.min_out_val, self.max_out_val, size),
+                self.round_to,
+            )
+
+        def error_values(base_vals, diversity_coefficients, size):
+            # Аналог normalvariate(base_val, diversity_coefficient * base_val) для всех итераций сразу
+            return np.round(
+                rng.normal(
+                    base_vals[:, None],
+                    np.abs(diversity_coefficients * base_vals)[:, None],
+                    size,
+                ),
+                self.round_to,
+            )
+
+        correct_answers = uniform_values(iterations_amount)
+        correct_column = correct_answers[:, None]
+        answers_parts = []
+        draws_parts = []
+
+        # 1. Версии-клоны: одно случайное число на итерацию сравнивается с минимальной надёжностью группы
+        clone_indexes = version_grouping.clone_indexes
+        clone_shape = (iterations_amount, len(clone_indexes))
+        min_rel = (
+            reliabilities[clone_indexes].min() if len(clone_indexes) > 0 else 1
+        )
+        clone_draws = rng.random(iterations_amount)
+        answers_parts.append(
+            np.where(
+                (clone_draws <= min_rel)[:, None],
+                correct_column,
+                uniform_values(clone_shape),
+            )
+        )
+        draws_parts.append(np.broadcast_to(clone_draws[:, None], clone_shape))
+
+        # 2. Явно схожие версии: одно случайное число на итерацию, ошибочные ответы генерируются вблизи верного
+        # ответа, если хотя бы одна версия группы отработала верно, иначе - вблизи общего случайного значения
+        similar_indexes = version_grouping.similar_indexes
+        similar_shape = (iterations_amount, len(similar_indexes))
+        similar_rel = reliabilities[similar_indexes]
+        similar_draws = rng.random(iterations_amount)
+        similar_base_error_vals = np.where(
+            similar_draws <= (similar_rel.max() if len(similar_rel) else -1),
+            correct_answers,
+            uniform_values(iterations_amount),
+        )
+        diversity_coefficients = np.round(
+            rng.uniform(0.06, 0.39, iterations_amount), self.round_to
+        )
+        answers_parts.append(
+            np.where(
+                similar_draws[:, None] > similar_rel,
+                error_values(
+                    similar_base_error_vals,
+                    diversity_coefficients,
+                    similar_shape,
+                ),
+                correct_column,
+            )
+        )
+        draws_parts.append(
+            np.broadcast_to(similar_draws[:, None], similar_shape)
+        )
+
+        # 3. Частично схожие версии: зависимость версий определяется сравнением их расстояния со случайным уровнем
+        # диверсифицированности итерации
+        partly_similar_indexes = version_grouping.partly_similar_indexes
+        partly_similar_shape = (iterations_amount, len(partly_similar_indexes))
+        partly_similar_diversities = rng.random(iterations_amount)
+        depended_mask, independent_mask = (
+            version_grouping.partly_similar_dependency(
+                partly_similar_diversities
+            )
+        )
+        partly_similar_draws = rng.random(partly_similar_shape)
+        partly_similar_base_error_vals = uniform_values(iterations_amount)
+        answers_parts.append(
+            np.where(
+                partly_similar_draws <= reliabilities[partly_similar_indexes],
+                correct_column,
+                np.where(
+                    depended_mask,
+                    partly_similar_base_error_vals[:, None],
+                    np.where(
+                        independent_mask,
+                        uniform_values(partly_similar_shape),
+                        error_values(
+                            partly_similar_base_error_vals,
+                            partly_similar_diversities,
+                            partly_similar_shape,
+                        ),
+                    ),
+                ),
+            )
+        )
+        draws_parts.append(partly_similar_draws)
+
+        # 4. Явно несхожие версии: у каждой версии своё случайное число и свой независимый ошибочный ответ
+        difference_indexes = version_grouping.difference_indexes
+        difference_shape = (iterations_amount, len(difference_indexes))
+        difference_draws = rng.random(difference_shape)
+        answers_parts.append(
+            np.where(
+                difference_draws <= reliabilities[difference_indexes],
+                correct_column,
+                uniform_values(difference_shape),
+            )
+        )
+        draws_parts.append(difference_draws)
+
+        return ExperimentBatch(
+            correct_answers,
+            np.concatenate(answers_parts, axis=1),
+            np.concatenate(draws_parts, axis=1),
+            version_grouping.slot_indexes,
+            first_iteration,
+        )
 
     def save_module(self):
         cur_conn = DBConnector(self._db_name)
@@ -904,65 +1933,464 @@ class NModule:
         for ver in self._versions_list:
             ver.save(self._id)
 
-    def save_experiment_data(self):
-        if (
-            not self._global_results_lst_2_write
-            or len(self._global_results_lst_2_write) == 0
-        ):
+    def save_experiment_data(self, load_ids: bool | None = None):
+        """
+        Save generated experiment data, which is kept in module
+        :param load_ids: Load ids of saved data. User is asked about it, if None
+        """
+        if not self._global_results_lst or len(self._global_results_lst) == 0:
             raise LookupError(
                 "There is no experiment data to save into data base"
             )
 
+        # Обращаемся к первому результату первой итерации для провеки, присвоен ли ему id, чтобы понять, надо ли
+        # сохранять результаты, или они уже сохранены, т.к. можно только перегенерировать их, но не изменить
+        if self._global_results_lst[0][0].id is None:
+            self._write_experiment_data(
+                self._global_results_lst.module_connectivity_matrix,
+                len(self._global_results_lst),
+                self._global_results_lst.versions_data,
+                self._global_results_lst.iter_answer_rows(),
+            )
+
+            if load_ids is None:
+                load_ids = (
+                    input(
+                        "Do you want to load IDs of saved data? Yes - Y; No - any key"
+                    ).upper()
+                    == "Y"
+                )
+            if load_ids:
+                self.load_experiment_data(self._experiment_name)
+
+    def save_experiment_data_stream(
+        self, results_chunks, iterations_amount: int, append: bool = False
+    ):
+        """
+        Save experiment data, which is generated while it is written, so the whole run is never kept in memory
+        :param results_chunks: iterable of ExperimentResults objects returned by stream_experiment_data
+        :param iterations_amount: Iterations amount of the experiment together with already saved iterations
+        :param append: Add iterations to the saved experiment and keep its data, vote results and analysis
+        """
+        if any(ver.id is None for ver in self._versions_list):
+            raise LookupError(
+                "Save module with versions before writing experiment data into data base"
+            )
+        self._write_experiment_data(
+            self.normed_connectivity_matrix,
+            iterations_amount,
+            [
+                (
+                    ver.id,
+                    ver.name,
+                    ver.reliability,
+                    ver.common_coordinates_list,
+                )
+                for ver in self._versions_list
+            ],
+            chain.from_iterable(
+                results_chunk.iter_answer_rows()
+                for results_chunk in results_chunks
+            ),
+            append,
+        )
+
+    def _write_experiment_data(
+        self,
+        connectivity_matrix,
+        iterations_amount: int,
+        versions_data,
+        answer_rows,
+        append: bool = False,
+    ):
         cur_conn = DBConnector(self._db_name)
-        if not cur_conn.table_exists("experiment_data"):
+        self._create_experiment_tables(cur_conn)
+        experiment_id = self._save_experiment_info(
+            cur_conn, connectivity_matrix, iterations_amount
+        )
+        # Перегенерированный эксперимент с тем же именем полностью заменяет ранее сохранённые данные вместе с их
+        # анализом. Добавленные итерации продолжают эксперимент, поэтому его данные и анализ остаются
+        table_names = (
+            ()
+            if append
+            else (
+                "vote_result",
+                "algorithm_analysis",
+                "version_analysis",
+                "experiment_data",
+                "experiment_version",
+            )
+        )
+        for table_name in table_names:
+            if cur_conn.table_exists(table_name):
+                cur_conn.execute_query(
+                    f"delete from {table_name} where experiment_id = {experiment_id};",
+                    [],
+                    False,
+                    False,
+                )
+        insert_query = """
+            insert into experiment_version (experiment_id, version_id, version_name, version_reliability, 
+            version_common_coordinates) values (?,?,?,?,?);
+        """
+        cur_conn.execute_query(
+            insert_query,
+            [
+                (
+                    experiment_id,
+                    v_id,
+                    v_name,
+                    v_reliability,
+                    json.dumps({"version_coordinates": v_coordinates}),
+                )
+                for v_id, v_name, v_reliability, v_coordinates in versions_data
+            ],
+            False,
+            False,
+        )
+        insert_query = """
+            insert into experiment_data (experiment_id, version_id, version_answer, correct_answer, 
+            module_iteration_num) values (?,?,?,?,?);
+        """
+        # Строки ответов формируются по мере вставки, а не собираются заранее в общий список. Данные эксперимента
+        # выбираются по его id и упорядочиваются по номеру итерации, поэтому индекс для них строится после вставки
+        cur_conn.bulk_insert(
+            insert_query,
+            ((experiment_id, *row) for row in answer_rows),
+            (NModule._experiment_data_index_query(),),
+            report=True,
+        )
+
+    @staticmethod
+    def _create_experiment_tables(cur_conn: DBConnector):
+        # Матрица связности модуля хранится один раз на эксперимент, координаты версий - один раз на версию
+        # эксперимента, а в строках ответов только идентификаторы и числа
+        if not cur_conn.table_exists("experiment"):
             create_query = """
-                create table experiment_data (
-                    "id" integer primary key autoincrement not null, 
-                    version_id integer not null, version_name varchar(255), 
-                    version_reliability real not null, 
-                    version_common_coordinates varchar(1024) not null, 
-                    version_answer real not null, 
-                    correct_answer real not null, 
-                    module_id integer not null, module_name varchar(255), 
-                    module_connectivity_matrix varchar(4095), 
-                    module_iteration_num int not null, 
-                    experiment_name varchar(31) not null, 
-                    unique(version_id, version_reliability, version_common_coordinates, 
-                    version_answer, correct_answer, module_id, module_connectivity_matrix, 
-                    module_iteration_num) on conflict replace, 
-                    foreign key ("version_id") references version(id), 
+                create table experiment (
+                    "id" integer primary key autoincrement not null,
+                    "name" varchar(31) not null unique,
+                    "module_id" integer null,
+                    "module_name" varchar(255) null,
+                    "connectivity_matrix" text null,
+                    "seed" integer null,
+                    "chunk_size" integer not null,
+                    "iterations_amount" integer not null,
+                    "batch" integer null,
                     foreign key ("module_id") references module(id)
                 );
             """
             cur_conn.execute_query(create_query, [], True, False)
-        # Обращаемся к первому результату первой итерации для провеки, присвоен ли ему id, чтобы понять, надо ли
-        # сохранять результаты, или они уже сохранены, т.к. можно только перегенерировать их, но не изменить
-        if self._global_results_lst[0][0].id is None:
-            insert_query = """
-                insert into experiment_data (version_id, version_name, version_reliability, 
-                version_common_coordinates, version_answer, correct_answer, module_id, module_name, 
-                module_connectivity_matrix, module_iteration_num, experiment_name) values (
-                    ?,?,?,?,?,?,?,?,?,?,?
+        else:
+            experiment_columns = cur_conn.table_columns("experiment")
+            for column_name, column_type in (
+                ("module_name", "varchar(255)"),
+                ("connectivity_matrix", "text"),
+                ("batch", "integer"),
+            ):
+                if column_name not in experiment_columns:
+                    cur_conn.execute_query(
+                        f'alter table experiment add column "{column_name}" {column_type} null;',
+                        [],
+                        True,
+                        False,
+                    )
+        if not cur_conn.table_exists("experiment_version"):
+            create_query = """
+                create table experiment_version (
+                    "id" integer primary key autoincrement not null,
+                    experiment_id integer not null,
+                    version_id integer not null, version_name varchar(255),
+                    version_reliability real not null,
+                    version_common_coordinates varchar(1024) not null,
+                    unique(experiment_id, version_id) on conflict replace,
+                    foreign key ("experiment_id") references experiment(id),
+                    foreign key ("version_id") references version(id)
                 );
             """
+            cur_conn.execute_query(create_query, [], True, False)
+        if not cur_conn.table_exists("experiment_data"):
             cur_conn.execute_query(
-                insert_query, self._global_results_lst_2_write, True, False
+                NModule._experiment_data_create_query("experiment_data"),
+                [],
+                True,
+                False,
             )
+        elif "module_connectivity_matrix" in cur_conn.table_columns(
+            "experiment_data"
+        ):
+            NModule._migrate_experiment_data(cur_conn)
+        # Результаты голосования ссылаются на итерации эксперимента, поэтому их таблица переводится на новую схему
+        # вместе с таблицами эксперимента
+        if cur_conn.table_exists("vote_result") and (
+            "experiment_data_id" in cur_conn.table_columns("vote_result")
+        ):
+            NModule._migrate_vote_result(cur_conn)
 
-            if (
-                input(
-                    "Do you want to load IDs of saved data? Yes - Y; No - any key"
-                ).upper()
-                == "Y"
-            ):
-                self.load_experiment_data(self._experiment_name)
+    @staticmethod
+    def _experiment_data_create_query(table_name: str) -> str:
+        return f"""
+            create table {table_name} (
+                "id" integer primary key autoincrement not null,
+                experiment_id integer not null,
+                version_id integer not null,
+                version_answer real not null,
+                correct_answer real not null,
+                module_iteration_num int not null,
+                foreign key ("experiment_id") references experiment(id),
+                foreign key ("version_id") references version(id)
+            );
+        """
 
-    def load_experiment_data(self, experiment_name: str = None):
+    @staticmethod
+    def _experiment_data_index_query() -> str:
+        return """
+            create index if not exists experiment_data_iteration_idx 
+            on experiment_data (experiment_id, module_iteration_num, version_id);
+        """
+
+    @staticmethod
+    def _vote_result_create_query(table_name: str) -> str:
+        # Все версии итерации получают один и тот же результат голосования, поэтому он хранится один раз на итерацию
+        return f"""
+            create table {table_name} (
+                id integer primary key autoincrement not null,
+                algorithm_id integer not null,
+                experiment_id integer not null,
+                module_iteration_num integer not null,
+                vote_answer real null,
+                unique(algorithm_id, experiment_id, module_iteration_num) on conflict replace,
+                foreign key ("algorithm_id") references algorithm(id),
+                foreign key ("experiment_id") references experiment(id)
+            );
+        """
+
+    @staticmethod
+    def _migrate_vote_result(cur_conn: DBConnector):
+        # Старые строки результатов голосования хранились для каждого ответа версии. Из строк одной итерации
+        # остаётся последняя добавленная
+        print("Vote results are migrating to the new data base schema...")
+        migration_queries = [
+            NModule._vote_result_create_query("vote_result_new"),
+            """
+                insert into vote_result_new (algorithm_id, experiment_id, module_iteration_num, vote_answer) 
+                select v.algorithm_id, d.experiment_id, d.module_iteration_num, v.vote_answer from vote_result v 
+                join experiment_data d on d.id = v.experiment_data_id where v.id in (
+                    select max(v.id) from vote_result v join experiment_data d on d.id = v.experiment_data_id 
+                    group by v.algorithm_id, d.experiment_id, d.module_iteration_num
+                ) order by v.id;
+            """,
+            "drop table vote_result;",
+            "alter table vote_result_new rename to vote_result;",
+        ]
+        for query_num, query in enumerate(migration_queries, 1):
+            cur_conn.execute_query(
+                query, [], query_num == len(migration_queries), False
+            )
+
+    @staticmethod
+    def _migrate_experiment_data(cur_conn: DBConnector):
+        # В старой схеме каждая строка ответа хранила имя эксперимента, данные модуля с матрицей связности и
+        # координаты версии. Данные переносятся в новые таблицы с сохранением id строк, т.к. на них ссылаются
+        # результаты голосования. Новая таблица создаётся рядом и переименовывается после удаления старой, чтобы
+        # ссылки из vote_result остались на experiment_data
+        print("Experiment data is migrating to the new data base schema...")
+        migration_queries = [
+            NModule._experiment_data_create_query("experiment_data_new"),
+            f"""
+                insert into experiment (name, module_id, module_name, connectivity_matrix, chunk_size, 
+                iterations_amount) select experiment_name, module_id, module_name, module_connectivity_matrix, 
+                {ITERATIONS_CHUNK_SIZE}, count(distinct module_iteration_num) from experiment_data 
+                where experiment_name not in (select name from experiment) group by experiment_name;
+            """,
+            """
+                update experiment set 
+                module_name = (select module_name from experiment_data where experiment_name = experiment.name), 
+                connectivity_matrix = (
+                    select module_connectivity_matrix from experiment_data where experiment_name = experiment.name
+                ) where connectivity_matrix is null;
+            """,
+            """
+                insert into experiment_version (experiment_id, version_id, version_name, version_reliability, 
+                version_common_coordinates) select e.id, d.version_id, d.version_name, d.version_reliability, 
+                d.version_common_coordinates from experiment_data d join experiment e on e.name = d.experiment_name 
+                group by e.id, d.version_id;
+            """,
+            """
+                insert into experiment_data_new (id, experiment_id, version_id, version_answer, correct_answer, 
+                module_iteration_num) select d.id, e.id, d.version_id, d.version_answer, d.correct_answer, 
+                d.module_iteration_num from experiment_data d join experiment e on e.name = d.experiment_name 
+                order by d.id;
+            """,
+            "drop table experiment_data;",
+            "alter table experiment_data_new rename to experiment_data;",
+            NModule._experiment_data_index_query(),
+        ]
+        for query_num, query in enumerate(migration_queries, 1):
+            cur_conn.execute_query(
+                query, [], query_num == len(migration_queries), False
+            )
+
+    def _save_experiment_info(
+        self, cur_conn: DBConnector, connectivity_matrix, iterations_amount: int
+    ) -> int:
+        # Сид, размер куска итераций и способ генерации однозначно определяют сгенерированные данные эксперимента
+        insert_query = """
+            insert into experiment (name, module_id, module_name, connectivity_matrix, seed, chunk_size, 
+            iterations_amount, batch) values (?,?,?,?,?,?,?,?)
+            on conflict(name) do update set module_id = excluded.module_id, module_name = excluded.module_name, 
+            connectivity_matrix = excluded.connectivity_matrix, seed = excluded.seed, 
+            chunk_size = excluded.chunk_size, iterations_amount = excluded.iterations_amount, batch = excluded.batch;
+        """
+        cur_conn.execute_query(
+            insert_query,
+            [
+                (
+                    self._experiment_name,
+                    self.id,
+                    self.name,
+                    json.dumps({"connectivity_matrix": connectivity_matrix}),
+                    self._experiment_seed,
+                    ITERATIONS_CHUNK_SIZE,
+                    iterations_amount,
+                    int(self._experiment_batch),
+                )
+            ],
+            False,
+            False,
+        )
+        return cur_conn.execute_query(
+            f"select id from experiment where name = '{self._experiment_name}';"
+        )[0][0]
+
+    def _load_experiment_results(self, cur_conn: DBConnector, experiment_name: str):
+        """
+        Load experiment module and versions data without versions answers
+        :param cur_conn: DBConnector object
+        :param experiment_name: Experiment name
+        :return: (experiment id, seed, ExperimentResults object, versions positions by their ids) tuple or None, if
+        there is no experiment with such name
+        """
+        select_query = f"""
+            select id, module_id, module_name, connectivity_matrix, seed from experiment 
+            where name = '{experiment_name}';
+        """
+        experiment_res = cur_conn.execute_query(select_query)
+        if len(experiment_res) == 0:
+            return None
+        experiment_id, module_id, module_name, connectivity_matrix, seed = experiment_res[0]
+        # Матрица связности и координаты версий декодируются один раз на эксперимент, а не для каждой строки ответа
+        experiment_results = ExperimentResults(
+            module_id,
+            module_name,
+            json.loads(connectivity_matrix)["connectivity_matrix"],
+            experiment_name,
+        )
+        select_query = f"""
+            select version_id, version_name, version_reliability, version_common_coordinates 
+            from experiment_version where experiment_id = {experiment_id} order by id;
+        """
+        version_positions = {
+            res[0]: experiment_results.add_version(
+                res[0],
+                res[1],
+                res[2],
+                json.loads(res[3])["version_coordinates"],
+                self.get_version_by_id(res[0]),
+            )
+            for res in cur_conn.execute_query(select_query)
+        }
+        return experiment_id, seed, experiment_results, version_positions
+
+    @staticmethod
+    def _experiment_iteration_bounds(
+        cur_conn: DBConnector,
+        experiment_id: int,
+        page_iterations: int = ITERATIONS_CHUNK_SIZE,
+        first_iteration: int = None,
+    ):
+        """
+        Split experiment iterations into pages of consecutive iterations numbers. Pages are bounded by iterations
+        numbers instead of rows amount, because a version gives one answer in every versions group it is in
+        :param cur_conn: DBConnector object
+        :param experiment_id: Experiment id
+        :param page_iterations: Amount of iterations numbers in one page
+        :param first_iteration: Number of the first iteration to read. Iterations are read from the first one, if
+        None
+        :return: generator of (first iteration number, last iteration number) tuples
+        """
+        select_query = f"""
+            select min(module_iteration_num), max(module_iteration_num) from experiment_data
+            where experiment_id = {experiment_id};
+        """
+        bounds_res = cur_conn.execute_query(select_query)
+        min_iteration, max_iteration = bounds_res[0]
+        if min_iteration is None:
+            return
+        if first_iteration is not None:
+            min_iteration = max(min_iteration, first_iteration)
+        for page_first_iteration in range(
+            min_iteration, max_iteration + 1, page_iterations
+        ):
+            yield page_first_iteration, min(
+                page_first_iteration + page_iterations - 1, max_iteration
+            )
+
+    @staticmethod
+    def _experiment_rows_pages(
+        cur_conn: DBConnector,
+        experiment_id: int,
+        page_iterations: int = ITERATIONS_CHUNK_SIZE,
+        first_iteration: int = None,
+    ):
+        """
+        Read experiment answers rows page by page. Every page contains only whole iterations
+        :param cur_conn: DBConnector object
+        :param experiment_id: Experiment id
+        :param page_iterations: Amount of iterations numbers in one page
+        :param first_iteration: Number of the first iteration to read. Iterations are read from the first one, if
+        None
+        :return: generator of (id, version id, version answer, correct answer, iteration number) tuples lists
+        """
+        iteration_bounds = NModule._experiment_iteration_bounds(
+            cur_conn, experiment_id, page_iterations, first_iteration
+        )
+        for first_iteration, last_iteration in iteration_bounds:
+            select_query = f"""
+                select id, version_id, version_answer, correct_answer, module_iteration_num from experiment_data 
+                where experiment_id = {experiment_id} and module_iteration_num between {first_iteration} 
+                and {last_iteration} order by module_iteration_num, id;
+            """
+            rows = cur_conn.execute_query(select_query)
+            if len(rows) > 0:
+                yield rows
+
+    @staticmethod
+    def _append_experiment_rows(
+        experiment_results: ExperimentResults,
+        rows: list[tuple],
+        version_positions: dict,
+    ):
+        # Строки одной итерации идут подряд, поэтому итерации определяются по смене её номера
+        experiment_results.append_results(
+            [res[4] for res in rows],
+            [res[3] for res in rows],
+            [res[2] for res in rows],
+            [version_positions[res[1]] for res in rows],
+            [res[0] for res in rows],
+        )
+
+    def _connect_to_experiment_data(self) -> DBConnector:
         cur_conn = DBConnector(self._db_name)
         if not cur_conn.table_exists("experiment_data"):
             raise LookupError(
                 f'There is no "EXPERIMENT_DATA" table in {self._db_name} data base. Save experiment data before load it'
             )
+        self._create_experiment_tables(cur_conn)
+        return cur_conn
+
+    def load_experiment_data(self, experiment_name: str = None):
+        cur_conn = self._connect_to_experiment_data()
         can_we_go_further = False
         if experiment_name is None and self._experiment_name is not None:
             experiment_name = self._experiment_name
@@ -972,72 +2400,165 @@ class NModule:
             can_we_go_further = True
 
         if can_we_go_further:
-            select_query = f"""
-                select id, version_id, version_name, version_reliability, version_common_coordinates, 
-                version_answer, correct_answer, module_id, module_name, module_connectivity_matrix, 
-                module_iteration_num, experiment_name from experiment_data where experiment_name = '{experiment_name}';
-            """
-            select_res = cur_conn.execute_query(select_query)
+            experiment = self._load_experiment_results(cur_conn, experiment_name)
             # Если удалось загрузить данные из БД,
-            if len(select_res) > 0:
+            if experiment is not None:
                 # то очищает имеющиеся списки с результатами для загрузки новых данных
-                self._global_results_lst = list()
                 self._global_results_lst_2_write = list()
-
-            cur_iter_num = None
-            cur_iter_list = []
-            for res in select_res:
-                # Если это не самая первая итерация и итерация эксперимента сменилась, записываем собранные данные в
-                # глобальный список и очищаем временный список
-                if cur_iter_num is not None and cur_iter_num != res[10]:
-                    self._global_results_lst.append(cur_iter_list)
-                    cur_iter_list = list()
-
-                cur_iter_num = res[10]
-                cur_iter_list.append(
-                    NResult(
-                        res[1],
-                        res[2],
-                        res[3],
-                        json.loads(res[4])["version_coordinates"],
-                        res[5],
-                        res[6],
-                        res[7],
-                        res[8],
-                        json.loads(res[9])["connectivity_matrix"],
-                        res[10],
-                        self.get_version_by_id(res[1]),
-                        res[0],
-                        res[11],
+                experiment_id, seed, experiment_results, version_positions = experiment
+                for rows in self._experiment_rows_pages(cur_conn, experiment_id):
+                    self._append_experiment_rows(
+                        experiment_results, rows, version_positions
                     )
-                )
+                self._global_results_lst = experiment_results
                 if self._experiment_name is None:
-                    self._experiment_name = res[11]
-
-            if len(select_res) > 0:
-                # Дозаписываем данные в глобальный массив результатов с последней итерации эксперимента
-                self._global_results_lst.append(cur_iter_list)
-
-            self._get_global_results_lst_2_write()
+                    self._experiment_name = experiment_name
+                self._experiment_seed = seed
         else:
             raise ValueError(
                 f"Unexpected value {experiment_name} of experiment_name parameter!"
             )
 
+    def iter_experiment_data(
+        self,
+        experiment_name: str = None,
+        page_iterations: int = ITERATIONS_CHUNK_SIZE,
+        first_iteration: int = None,
+    ):
+        """
+        Load experiment data page by page without keeping the whole experiment in memory. Pages share module and
+        versions data, so it is decoded only once
+        :param experiment_name: Experiment name. Module experiment name is used by default
+        :param page_iterations: Amount of iterations numbers in one page
+        :param first_iteration: Number of the first iteration to load. Iterations are loaded from the first one, if
+        None
+        :return: generator of ExperimentResults objects
+        """
+        if experiment_name is None:
+            experiment_name = self._experiment_name
+        if experiment_name is None:
+            raise ValueError(
+                f"Unexpected value {experiment_name} of experiment_name parameter!"
+            )
+        cur_conn = self._connect_to_experiment_data()
+        experiment = self._load_experiment_results(cur_conn, experiment_name)
+        if experiment is None:
+            return
+        experiment_id, _, experiment_results, version_positions = experiment
+        for rows in self._experiment_rows_pages(
+            cur_conn, experiment_id, page_iterations, first_iteration
+        ):
+            page = experiment_results.copy_without_results()
+            self._append_experiment_rows(page, rows, version_positions)
+            yield page
+
     def get_experiments_names(self):
         cur_conn = DBConnector(self._db_name)
         if cur_conn.table_exists("experiment_data"):
+            self._create_experiment_tables(cur_conn)
             experiment_select_res = cur_conn.execute_query(
-                "select distinct experiment_name from experiment_data;"
+                "select name from experiment order by id;"
             )
             return [exp_name[0] for exp_name in experiment_select_res]
 
-    def load_module(self):
+    def get_experiment_module_id(self, experiment_name: str) -> int:
+        cur_conn = DBConnector(self._db_name)
+        if not cur_conn.table_exists("experiment_data"):
+            raise LookupError(
+                f'There is no "EXPERIMENT_DATA" table in {self._db_name} data base. Save experiment data before load it'
+            )
+        self._create_experiment_tables(cur_conn)
+        experiment_res = cur_conn.execute_query(
+            f"select module_id from experiment where name = '{experiment_name}';"
+        )
+        if len(experiment_res) == 0:
+            raise LookupError(
+                f"There is no experiment {experiment_name} in {self._db_name} data base"
+            )
+        return experiment_res[0][0]
+
+    def get_experiment_generation(self, experiment_name: str) -> tuple:
+        """
+        Get settings, which saved experiment data was generated with
+        :param experiment_name: Experiment name
+        :return: (module id, seed, chunk size, iterations amount, batch) tuple
+        """
+        cur_conn = self._connect_to_experiment_data()
+        experiment_res = cur_conn.execute_query(
+            f"""
+                select module_id, seed, chunk_size, iterations_amount, batch from experiment 
+                where name = '{experiment_name}';
+            """
+        )
+        if len(experiment_res) == 0:
+            raise LookupError(
+                f"There is no experiment {experiment_name} in {self._db_name} data base"
+            )
+        module_id, seed, chunk_size, iterations_amount, batch = experiment_res[
+            0
+        ]
+        return module_id, seed, chunk_size, iterations_amount, bool(batch)
+
+    def append_experiment_data(
+        self, experiment_name: str, iterations_amount: int, workers: int = 1
+    ) -> int:
+        """
+        Add iterations to the saved experiment. They are generated with the experiment seed and generation mode, so
+        experiment data is the same as if all its iterations were generated at once. Saved vote results and analysis
+        are kept, so only new iterations are voted and analysed
+        :param experiment_name: Experiment name
+        :param iterations_amount: Amount of new iterations
+        :param workers: Worker processes amount
+        :return: Number of the first new iteration
+        """
+        module_id, seed, chunk_size, saved_iterations_amount, batch = (
+            self.get_experiment_generation(experiment_name)
+        )
+        if module_id != self.id:
+            raise ValueError(
+                f"Experiment {experiment_name} was generated for module with id {module_id}"
+            )
+        # Продолжить можно только данные, которые однозначно определяются сидом и размером куска итераций
+        if seed is None or chunk_size != ITERATIONS_CHUNK_SIZE:
+            raise ValueError(
+                f"Experiment {experiment_name} was generated without seed or with another chunk size. "
+                "Its iterations cannot be continued"
+            )
+        # Массивы NumPy получают значения всего куска итераций сразу, поэтому начало куска зависит от его длины
+        if batch and saved_iterations_amount % ITERATIONS_CHUNK_SIZE != 0:
+            raise ValueError(
+                f"Experiment {experiment_name} was generated with NumPy arrays, so its iterations can be continued "
+                f"only after a whole chunk of {ITERATIONS_CHUNK_SIZE} iterations"
+            )
+        experiment_iterations_amount = (
+            saved_iterations_amount + iterations_amount
+        )
+        self.save_experiment_data_stream(
+            self.stream_experiment_data(
+                experiment_iterations_amount,
+                experiment_name,
+                seed,
+                workers,
+                batch,
+                saved_iterations_amount,
+            ),
+            experiment_iterations_amount,
+            True,
+        )
+        return saved_iterations_amount
+
+    def load_module(self, module_id: int = None):
+        """
+        Load module from data base
+        :param module_id: Id of module to load. Module own id is used by default. User chooses module, if both are None
+        """
         cur_conn = DBConnector(self._db_name)
         if not cur_conn.table_exists("module"):
             raise LookupError(
                 f'There is no "MODULE" table in {self._db_name} data base. Save module data before load it.'
             )
+        if module_id is not None:
+            self._id = module_id
         if self._id is None:
             q_set = cur_conn.execute_query(
                 "select distinct id, name, round_to from module order by id;"
@@ -1056,6 +2577,10 @@ class NModule:
             min_out_val, max_out_val from module where id = {chosen_id};
         """
         select_res = cur_conn.execute_query(select_query)
+        if len(select_res) == 0:
+            raise LookupError(
+                f"There is no module with id {chosen_id} in {self._db_name} data base"
+            )
 
         # Т.к. у нас только 1 модуль может быть найден по id, то обращаемся мы к 0-му индексу, без доп. проверок
         self._id = select_res[0][0]
@@ -1067,10 +2592,10 @@ class NModule:
         self.min_out_val = select_res[0][6]
         self.max_out_val = select_res[0][7]
 
-    def load_module_with_versions(self):
+    def load_module_with_versions(self, module_id: int = None):
         try:
-            self.load_module()
-            self._versions_list = NVersion.load_versions_2_module(self._id)
+            self.load_module(module_id)
+            self.versions_list = NVersion.load_versions_2_module(self._id)
         except (LookupError, AttributeError) as e:
             print(str(e))
 
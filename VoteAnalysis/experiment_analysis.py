@@ -0,0 +1,748 @@
+"""Experiment analysis module
+
+Vote algorithms accuracy and versions reliability are figured out from experiment_data and vote_result tables with
+NumPy arrays, which are read page by page of whole iterations, so NResult objects are never built.
+
+Program for simulation several N-versions work of one module to test vote algorithms.
+Experiment is carried out in Denis V. Gruzenkin PhD thesis writing.
+"""
+from math import sqrt
+
+import numpy as np
+
+from data_base_connector import DBConnector
+from data_generator import NModule
+from random_streams import ITERATIONS_CHUNK_SIZE
+
+__author__ = "Denis V. Gruzenkin"
+__copyright__ = "Copyright 2021, Denis V. Gruzenkin"
+__credits__ = ["Denis V. Gruzenkin"]
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Denis V. Gruzenkin"
+__email__ = "gruzenkin.denis@good-look.su"
+__status__ = "Production"
+
+# Ответ голосования считается верным, если отличается от правильного не больше, чем на погрешность округления
+# ответов модуля с точностью по умолчанию
+CORRECT_ANSWER_TOLERANCE = 1e-6
+
+
+class AlgorithmAnalysis:
+    """
+    Vote algorithm accuracy over one experiment. It is kept as counts and sums only, so it can be added up from
+    several parts of the experiment
+    """
+
+    def __init__(
+        self,
+        algorithm_id: int,
+        algorithm_name: str,
+        experiment_name: str,
+        iterations_amount: int = 0,
+        correct_amount: int = 0,
+        no_answer_amount: int = 0,
+        error_sum: float = 0.0,
+        error_square_sum: float = 0.0,
+        max_error: float = 0.0,
+        tie_amount: int = 0,
+        tie_correct_amount: int = 0,
+        last_vote_result_id: int = 0,
+    ):
+        """
+        AlgorithmAnalysis class constructor
+        :param algorithm_id: Vote algorithm id
+        :param algorithm_name: Vote algorithm name
+        :param experiment_name: Experiment name
+        :param iterations_amount: Amount of voted iterations
+        :param correct_amount: Amount of iterations with correct vote answer
+        :param no_answer_amount: Amount of iterations, where algorithm gave no answer
+        :param error_sum: Sum of absolute vote errors
+        :param error_square_sum: Sum of squared vote errors
+        :param max_error: Max absolute vote error
+        :param tie_amount: Amount of iterations, where several answers got the same largest number of versions
+        :param tie_correct_amount: Amount of tie iterations with correct vote answer
+        :param last_vote_result_id: Id of the last vote result, which is added into analysis
+        """
+        self.algorithm_id = algorithm_id
+        self.algorithm_name = algorithm_name
+        self.experiment_name = experiment_name
+        self.iterations_amount = iterations_amount
+        self.correct_amount = correct_amount
+        self.no_answer_amount = no_answer_amount
+        self.error_sum = error_sum
+        self.error_square_sum = error_square_sum
+        self.max_error = max_error
+        self.tie_amount = tie_amount
+        self.tie_correct_amount = tie_correct_amount
+        self.last_vote_result_id = last_vote_result_id
+
+    @property
+    def answered_amount(self) -> int:
+        return self.iterations_amount - self.no_answer_amount
+
+    @property
+    def correct_rate(self) -> float:
+        if self.iterations_amount == 0:
+            return 0.0
+        return self.correct_amount / self.iterations_amount
+
+    @property
+    def mean_error(self) -> float:
+        if self.answered_amount == 0:
+            return 0.0
+        return self.error_sum / self.answered_amount
+
+    @property
+    def root_mean_square_error(self) -> float:
+        if self.answered_amount == 0:
+            return 0.0
+        return sqrt(self.error_square_sum / self.answered_amount)
+
+    @property
+    def tie_rate(self) -> float:
+        if self.iterations_amount == 0:
+            return 0.0
+        return self.tie_amount / self.iterations_amount
+
+    @property
+    def tie_correct_rate(self) -> float:
+        if self.tie_amount == 0:
+            return 0.0
+        return self.tie_correct_amount / self.tie_amount
+
+    def __str__(self):
+        res_str = f"{self.algorithm_name} ({self.experiment_name}): iterations: {self.iterations_amount}\t"
+        res_str += f"correct: {self.correct_rate:.4%}\tno answer: {self.no_answer_amount}\t"
+        res_str += f"mean error: {self.mean_error:.6f}\tRMSE: {self.root_mean_square_error:.6f}\t"
+        res_str += f"max error: {self.max_error:.6f}\tties: {self.tie_rate:.4%}\tcorrect on ties: "
+        res_str += f"{self.tie_correct_rate:.4%}"
+        return res_str
+
+
+class VersionAnalysis:
+    """
+    Version reliability, which was set for experiment, compared with its observed errors
+    """
+
+    def __init__(
+        self,
+        version_id: int,
+        version_name: str,
+        version_reliability: float,
+        answers_amount: int = 0,
+        errors_amount: int = 0,
+        error_sum: float = 0.0,
+        last_iteration_num: int = -1,
+    ):
+        """
+        VersionAnalysis class constructor
+        :param version_id: Version id
+        :param version_name: Version name
+        :param version_reliability: Version reliability used for experiment data generation
+        :param answers_amount: Amount of version answers
+        :param errors_amount: Amount of incorrect version answers
+        :param error_sum: Sum of absolute errors of version answers
+        :param last_iteration_num: Number of the last iteration, which is added into analysis. Iterations are
+        numbered from 0, so it is -1, if no iteration is added
+        """
+        self.version_id = version_id
+        self.version_name = version_name
+        self.version_reliability = version_reliability
+        self.answers_amount = answers_amount
+        self.errors_amount = errors_amount
+        self.error_sum = error_sum
+        self.last_iteration_num = last_iteration_num
+
+    @property
+    def expected_error_rate(self) -> float:
+        return 1 - self.version_reliability
+
+    @property
+    def observed_error_rate(self) -> float:
+        if self.answers_amount == 0:
+            return 0.0
+        return self.errors_amount / self.answers_amount
+
+    @property
+    def observed_reliability(self) -> float:
+        return 1 - self.observed_error_rate
+
+    @property
+    def mean_error(self) -> float:
+        if self.errors_amount == 0:
+            return 0.0
+        return self.error_sum / self.errors_amount
+
+    def __str__(self):
+        res_str = f"{self.version_name} (id: {self.version_id}): reliability: {self.version_reliability}\t"
+        res_str += f"observed reliability: {self.observed_reliability:.6f}\t"
+        res_str += f"expected error rate: {self.expected_error_rate:.6f}\t"
+        res_str += f"observed error rate: {self.observed_error_rate:.6f}\tmean error: {self.mean_error:.6f}"
+        return res_str
+
+
+def iteration_ties(
+    answers: np.ndarray, iteration_starts: np.ndarray
+) -> np.ndarray:
+    """
+    Find iterations, where several different answers got the same largest number of versions
+    :param answers: Array of versions answers of several iterations one after another
+    :param iteration_starts: Sorted array of positions of iterations first answers in answers array
+    :return: boolean array with one value per iteration
+    """
+    iterations_amount = len(iteration_starts)
+    if answers.size == 0:
+        return np.zeros(iterations_amount, dtype=bool)
+    # В итерациях может быть разное число ответов, поэтому ответы сортируются внутри своих итераций, и одинаковые
+    # ответы итерации стоят подряд. Классы ответов - серии равных соседей
+    answer_iterations = np.repeat(
+        np.arange(iterations_amount),
+        np.diff(iteration_starts, append=answers.size),
+    )
+    sorted_answers = answers[np.lexsort((answers, answer_iterations))]
+    run_starts = np.ones(answers.size, dtype=bool)
+    run_starts[1:] = sorted_answers[1:] != sorted_answers[:-1]
+    # Первый ответ итерации всегда начинает серию, поэтому серии соседних итераций не сливаются
+    run_starts[iteration_starts] = True
+    run_start_positions = np.flatnonzero(run_starts)
+    run_lengths = np.diff(run_start_positions, append=answers.size)
+    run_iterations = answer_iterations[run_start_positions]
+    max_run_lengths = np.maximum.reduceat(
+        run_lengths, np.searchsorted(run_start_positions, iteration_starts)
+    )
+    # Ничья - когда в итерации больше одного класса наибольшего размера
+    return (
+        np.bincount(
+            run_iterations,
+            run_lengths == max_run_lengths[run_iterations],
+            minlength=iterations_amount,
+        )
+        > 1
+    )
+
+
+class ExperimentAnalyzer:
+    """
+    Vote algorithms and versions analysis, which is added up page by page of experiment iterations. Analysis can
+    be continued from the saved one, so only new iterations and new vote results are processed
+    """
+
+    _db_name = "experiment.db"
+
+    def __init__(
+        self,
+        algorithms_analysis: list[AlgorithmAnalysis],
+        versions_analysis: list[VersionAnalysis],
+        tolerance: float = CORRECT_ANSWER_TOLERANCE,
+    ):
+        """
+        ExperimentAnalyzer class constructor
+        :param algorithms_analysis: AlgorithmAnalysis objects to add pages analysis into
+        :param versions_analysis: VersionAnalysis objects to add pages analysis into
+        :param tolerance: Max difference between correct answer and answer, which is considered as correct
+        """
+        self.algorithms_analysis = {
+            algorithm_analysis.algorithm_id: algorithm_analysis
+            for algorithm_analysis in algorithms_analysis
+        }
+        self.versions_analysis = versions_analysis
+        self.tolerance = tolerance
+
+    def add_versions_page(
+        self,
+        correct_answers: np.ndarray,
+        answers: np.ndarray,
+        answer_positions: np.ndarray,
+    ):
+        """
+        Add versions answers of several iterations into versions analysis
+        :param correct_answers: Array of correct answers of every answer iteration
+        :param answers: Array of versions answers
+        :param answer_positions: Array of positions of answers versions in versions_analysis
+        """
+        errors = np.abs(answers - correct_answers)
+        error_mask = errors > self.tolerance
+        # Ответы одной версии из разных групп складываются в её анализ
+        versions_amount = len(self.versions_analysis)
+        answers_amounts = np.bincount(
+            answer_positions, minlength=versions_amount
+        )
+        errors_amounts = np.bincount(
+            answer_positions, error_mask, minlength=versions_amount
+        )
+        error_sums = np.bincount(
+            answer_positions,
+            np.where(error_mask, errors, 0),
+            minlength=versions_amount,
+        )
+        for (
+            version_analysis,
+            answers_amount,
+            errors_amount,
+            error_sum,
+        ) in zip(
+            self.versions_analysis,
+            answers_amounts.tolist(),
+            errors_amounts.astype(np.int64).tolist(),
+            error_sums.tolist(),
+        ):
+            version_analysis.answers_amount += answers_amount
+            version_analysis.errors_amount += errors_amount
+            version_analysis.error_sum += error_sum
+
+    def add_votes_page(
+        self,
+        algorithm_id: int,
+        vote_answers: np.ndarray,
+        correct_answers: np.ndarray,
+        ties: np.ndarray,
+    ):
+        """
+        Add vote answers of several iterations into vote algorithm analysis
+        :param algorithm_id: Vote algorithm id
+        :param vote_answers: Array of vote answers. Iterations without vote answer are NaN
+        :param correct_answers: Array of the same iterations correct answers
+        :param ties: Boolean array of the same iterations ties
+        """
+        algorithm_analysis = self.algorithms_analysis[algorithm_id]
+        answered_mask = ~np.isnan(vote_answers)
+        errors = np.abs(vote_answers - correct_answers)[answered_mask]
+        correct_mask = np.zeros(len(vote_answers), dtype=bool)
+        correct_mask[answered_mask] = errors <= self.tolerance
+        algorithm_analysis.iterations_amount += len(vote_answers)
+        algorithm_analysis.correct_amount += int(correct_mask.sum())
+        algorithm_analysis.no_answer_amount += int((~answered_mask).sum())
+        algorithm_analysis.error_sum += float(errors.sum())
+        algorithm_analysis.error_square_sum += float(np.square(errors).sum())
+        algorithm_analysis.max_error = max(
+            algorithm_analysis.max_error, float(errors.max(initial=0))
+        )
+        algorithm_analysis.tie_amount += int(ties.sum())
+        algorithm_analysis.tie_correct_amount += int(
+            (ties & correct_mask).sum()
+        )
+
+    def add_page(
+        self,
+        iteration_nums: np.ndarray,
+        correct_answers: np.ndarray,
+        answers: np.ndarray,
+        answer_positions: np.ndarray,
+        iteration_starts: np.ndarray,
+        votes: dict,
+    ):
+        """
+        Add page of experiment iterations into versions and vote algorithms analysis
+        :param iteration_nums: Sorted array of iterations numbers
+        :param correct_answers: Array of iterations correct answers
+        :param answers: Array of versions answers of the iterations one after another
+        :param answer_positions: Array of positions of answers versions in versions_analysis
+        :param iteration_starts: Array of positions of iterations first answers in answers array
+        :param votes: dict of algorithm id: (iterations numbers array, vote answers array) of the same iterations,
+        which are not added into analysis yet
+        """
+        # Страница может начинаться с итераций, которые уже учтены в анализе версий, но нужны новым результатам
+        # голосования
+        versions_last_iteration = min(
+            (
+                version_analysis.last_iteration_num
+                for version_analysis in self.versions_analysis
+            ),
+            default=-1,
+        )
+        new_iterations_mask = iteration_nums > versions_last_iteration
+        if new_iterations_mask.any():
+            answers_amounts = np.diff(iteration_starts, append=len(answers))
+            new_answers_mask = np.repeat(new_iterations_mask, answers_amounts)
+            self.add_versions_page(
+                np.repeat(correct_answers, answers_amounts)[new_answers_mask],
+                answers[new_answers_mask],
+                answer_positions[new_answers_mask],
+            )
+            for version_analysis in self.versions_analysis:
+                version_analysis.last_iteration_num = int(iteration_nums[-1])
+        ties = iteration_ties(answers, iteration_starts)
+        for algorithm_id, (vote_iteration_nums, vote_answers) in votes.items():
+            # Алгоритм мог голосовать не на всех итерациях, поэтому его ответы сопоставляются с итерациями по номеру
+            positions = np.searchsorted(iteration_nums, vote_iteration_nums)
+            self.add_votes_page(
+                algorithm_id,
+                vote_answers,
+                correct_answers[positions],
+                ties[positions],
+            )
+
+    def analyse(self, pages):
+        """
+        Add all pages of experiment iterations into analysis
+        :param pages: iterable of add_page arguments tuples
+        :return: (list of AlgorithmAnalysis objects, list of VersionAnalysis objects) tuple
+        """
+        for page in pages:
+            self.add_page(*page)
+        return list(self.algorithms_analysis.values()), self.versions_analysis
+
+    @staticmethod
+    def _get_experiment_id(cur_conn: DBConnector, experiment_name: str) -> int:
+        if not cur_conn.table_exists("experiment_data"):
+            raise LookupError(
+                f'There is no "EXPERIMENT_DATA" table in {cur_conn.db_name} data base. Save experiment data before analyse it'
+            )
+        NModule._create_experiment_tables(cur_conn)
+        ExperimentAnalyzer._create_analysis_tables(cur_conn)
+        experiment_res = cur_conn.execute_query(
+            f"select id from experiment where name = '{experiment_name}';"
+        )
+        if len(experiment_res) == 0:
+            raise LookupError(
+                f"There is no experiment {experiment_name} in {cur_conn.db_name} data base"
+            )
+        return experiment_res[0][0]
+
+    @staticmethod
+    def _create_analysis_tables(cur_conn: DBConnector):
+        # Анализ хранится суммами и количествами, к которым прибавляются только новые итерации и результаты
+        # голосования. Суммы верны лишь для той погрешности, с которой они посчитаны
+        if not cur_conn.table_exists("algorithm_analysis"):
+            create_query = """
+                create table algorithm_analysis (
+                    id integer primary key autoincrement not null,
+                    algorithm_id integer not null,
+                    experiment_id integer not null,
+                    tolerance real not null,
+                    last_vote_result_id integer not null,
+                    iterations_amount integer not null,
+                    correct_amount integer not null,
+                    no_answer_amount integer not null,
+                    error_sum real not null,
+                    error_square_sum real not null,
+                    max_error real not null,
+                    tie_amount integer not null,
+                    tie_correct_amount integer not null,
+                    unique(algorithm_id, experiment_id) on conflict replace,
+                    foreign key ("algorithm_id") references algorithm(id),
+                    foreign key ("experiment_id") references experiment(id)
+                );
+            """
+            cur_conn.execute_query(create_query, [], True, False)
+        if not cur_conn.table_exists("version_analysis"):
+            create_query = """
+                create table version_analysis (
+                    id integer primary key autoincrement not null,
+                    experiment_id integer not null,
+                    version_id integer not null,
+                    tolerance real not null,
+                    last_iteration_num integer not null,
+                    answers_amount integer not null,
+                    errors_amount integer not null,
+                    error_sum real not null,
+                    unique(experiment_id, version_id) on conflict replace,
+                    foreign key ("experiment_id") references experiment(id),
+                    foreign key ("version_id") references version(id)
+                );
+            """
+            cur_conn.execute_query(create_query, [], True, False)
+
+    @staticmethod
+    def _get_last_vote_result_id(cur_conn: DBConnector) -> int:
+        if not cur_conn.table_exists("vote_result"):
+            return 0
+        return cur_conn.execute_query(
+            "select coalesce(max(id), 0) from vote_result;"
+        )[0][0]
+
+    @staticmethod
+    def _is_analysis_actual(
+        cur_conn: DBConnector,
+        algorithm_analysis: AlgorithmAnalysis,
+        experiment_id: int,
+    ) -> bool:
+        # Повторное голосование по итерации заменяет её старый результат новой строкой. Если какой-то из учтённых
+        # результатов заменён, то суммы анализа уже нельзя исправить, и алгоритм анализируется заново
+        select_query = f"""
+            select count(*) from vote_result where algorithm_id = {algorithm_analysis.algorithm_id}
+            and experiment_id = {experiment_id} and id <= {algorithm_analysis.last_vote_result_id};
+        """
+        return (
+            cur_conn.execute_query(select_query)[0][0]
+            == algorithm_analysis.iterations_amount
+        )
+
+    @classmethod
+    def _load_algorithms_analysis(
+        cls,
+        cur_conn: DBConnector,
+        experiment_id: int,
+        experiment_name: str,
+        tolerance: float,
+    ) -> list[AlgorithmAnalysis]:
+        """
+        Load saved analysis of every vote algorithm, which voted over the experiment. Algorithms without actual
+        saved analysis get empty one
+        :param cur_conn: DBConnector object
+        :param experiment_id: Experiment id
+        :param experiment_name: Experiment name
+        :param tolerance: Tolerance, which saved analysis is figured out with
+        :return: list of AlgorithmAnalysis objects
+        """
+        if not cur_conn.table_exists("vote_result"):
+            return []
+        select_query = f"""
+            select a.id, a.name, s.iterations_amount, s.correct_amount, s.no_answer_amount, s.error_sum,
+            s.error_square_sum, s.max_error, s.tie_amount, s.tie_correct_amount, s.last_vote_result_id
+            from algorithm a left join algorithm_analysis s on s.algorithm_id = a.id
+            and s.experiment_id = {experiment_id} and s.tolerance = {tolerance} where exists (
+                select 1 from vote_result v where v.algorithm_id = a.id and v.experiment_id = {experiment_id}
+            ) order by a.id;
+        """
+        algorithms_analysis = []
+        for res in cur_conn.execute_query(select_query):
+            algorithm_analysis = AlgorithmAnalysis(
+                res[0], res[1], experiment_name
+            )
+            if res[2] is not None:
+                saved_analysis = AlgorithmAnalysis(
+                    res[0], res[1], experiment_name, *res[2:]
+                )
+                if cls._is_analysis_actual(
+                    cur_conn, saved_analysis, experiment_id
+                ):
+                    algorithm_analysis = saved_analysis
+            algorithms_analysis.append(algorithm_analysis)
+        return algorithms_analysis
+
+    @staticmethod
+    def _load_versions_analysis(
+        cur_conn: DBConnector, experiment_id: int, tolerance: float
+    ) -> list[VersionAnalysis]:
+        """
+        Load saved analysis of every experiment version in the order of versions ids.
+        If saved analysis of versions does not cover the same iterations, all versions get empty one
+        :param cur_conn: DBConnector object
+        :param experiment_id: Experiment id
+        :param tolerance: Tolerance, which saved analysis is figured out with
+        :return: list of VersionAnalysis objects
+        """
+        select_query = f"""
+            select ev.version_id, ev.version_name, ev.version_reliability, s.answers_amount, s.errors_amount,
+            s.error_sum, s.last_iteration_num from experiment_version ev left join version_analysis s
+            on s.experiment_id = ev.experiment_id and s.version_id = ev.version_id and s.tolerance = {tolerance}
+            where ev.experiment_id = {experiment_id} order by ev.version_id;
+        """
+        versions_res = cur_conn.execute_query(select_query)
+        if len({res[6] for res in versions_res}) == 1 and all(
+            res[6] is not None for res in versions_res
+        ):
+            return [VersionAnalysis(*res) for res in versions_res]
+        return [VersionAnalysis(*res[:3]) for res in versions_res]
+
+    def _save_analysis(self, cur_conn: DBConnector, experiment_id: int):
+        algorithms_rows = [
+            (
+                analysis.algorithm_id,
+                experiment_id,
+                self.tolerance,
+                analysis.last_vote_result_id,
+                analysis.iterations_amount,
+                analysis.correct_amount,
+                analysis.no_answer_amount,
+                analysis.error_sum,
+                analysis.error_square_sum,
+                analysis.max_error,
+                analysis.tie_amount,
+                analysis.tie_correct_amount,
+            )
+            for analysis in self.algorithms_analysis.values()
+        ]
+        versions_rows = [
+            (
+                experiment_id,
+                analysis.version_id,
+                self.tolerance,
+                analysis.last_iteration_num,
+                analysis.answers_amount,
+                analysis.errors_amount,
+                analysis.error_sum,
+            )
+            for analysis in self.versions_analysis
+        ]
+        # Пустой список параметров выполнил бы запрос на вставку без параметров, поэтому пустые анализы не
+        # сохраняются: у эксперимента без результатов голосования нет анализа алгоритмов
+        if len(algorithms_rows) > 0:
+            cur_conn.execute_query(
+                """
+                    insert into algorithm_analysis (algorithm_id, experiment_id, tolerance, last_vote_result_id,
+                    iterations_amount, correct_amount, no_answer_amount, error_sum, error_square_sum, max_error,
+                    tie_amount, tie_correct_amount) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                """,
+                algorithms_rows,
+                True,
+                False,
+            )
+        if len(versions_rows) > 0:
+            cur_conn.execute_query(
+                """
+                    insert into version_analysis (experiment_id, version_id, tolerance, last_iteration_num,
+                    answers_amount, errors_amount, error_sum) values (?, ?, ?, ?, ?, ?, ?);
+                """,
+                versions_rows,
+                True,
+                False,
+            )
+
+    @staticmethod
+    def _get_vote_answers(
+        cur_conn: DBConnector,
+        algorithm_analysis: AlgorithmAnalysis,
+        experiment_id: int,
+        first_iteration: int,
+        last_iteration: int,
+        last_vote_result_id: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        select_query = f"""
+            select module_iteration_num, vote_answer from vote_result
+            where algorithm_id = {algorithm_analysis.algorithm_id} and experiment_id = {experiment_id}
+            and module_iteration_num between {first_iteration} and {last_iteration}
+            and id > {algorithm_analysis.last_vote_result_id} and id <= {last_vote_result_id}
+            order by module_iteration_num;
+        """
+        vote_res = cur_conn.execute_query(select_query)
+        return (
+            np.array([res[0] for res in vote_res], dtype=np.int64),
+            np.array([res[1] for res in vote_res], dtype=float),
+        )
+
+    @staticmethod
+    def _get_first_new_vote_iteration(
+        cur_conn: DBConnector,
+        algorithm_analysis: AlgorithmAnalysis,
+        experiment_id: int,
+        last_vote_result_id: int,
+    ) -> int | None:
+        select_query = f"""
+            select min(module_iteration_num) from vote_result
+            where algorithm_id = {algorithm_analysis.algorithm_id} and experiment_id = {experiment_id}
+            and id > {algorithm_analysis.last_vote_result_id} and id <= {last_vote_result_id};
+        """
+        return cur_conn.execute_query(select_query)[0][0]
+
+    @classmethod
+    def _experiment_pages(
+        cls,
+        cur_conn: DBConnector,
+        experiment_id: int,
+        algorithms_analysis: list[AlgorithmAnalysis],
+        versions_analysis: list[VersionAnalysis],
+        last_vote_result_id: int,
+        page_iterations: int = ITERATIONS_CHUNK_SIZE,
+    ):
+        """
+        Read experiment answers and vote answers, which are not added into analysis yet, page by page. Vote
+        results added after last_vote_result_id are left for the next analysis
+        :param cur_conn: DBConnector object
+        :param experiment_id: Experiment id
+        :param algorithms_analysis: Saved analysis of algorithms, which vote answers are read
+        :param versions_analysis: Saved analysis of experiment versions in the order of versions ids
+        :param last_vote_result_id: Id of the last vote result, which is read
+        :param page_iterations: Amount of iterations in one page
+        :return: generator of add_page arguments tuples
+        """
+        if len(versions_analysis) == 0:
+            return
+        version_ids = np.array(
+            [
+                version_analysis.version_id
+                for version_analysis in versions_analysis
+            ],
+            dtype=np.int64,
+        )
+        # Итерации читаются с первой, которая не учтена в анализе версий или нужна новым результатам голосования
+        first_iterations = [versions_analysis[0].last_iteration_num + 1]
+        new_algorithms_analysis = []
+        for algorithm_analysis in algorithms_analysis:
+            first_new_iteration = cls._get_first_new_vote_iteration(
+                cur_conn,
+                algorithm_analysis,
+                experiment_id,
+                last_vote_result_id,
+            )
+            if first_new_iteration is not None:
+                first_iterations.append(first_new_iteration)
+                new_algorithms_analysis.append(algorithm_analysis)
+        first_iteration = min(first_iterations)
+        # Страница ограничена номерами итераций, поэтому содержит только целые итерации
+        iteration_bounds = NModule._experiment_iteration_bounds(
+            cur_conn, experiment_id, page_iterations, first_iteration
+        )
+        for page_first_iteration, page_last_iteration in iteration_bounds:
+            select_query = f"""
+                select module_iteration_num, correct_answer, version_id, version_answer from experiment_data
+                where experiment_id = {experiment_id}
+                and module_iteration_num between {page_first_iteration} and {page_last_iteration}
+                order by module_iteration_num, version_id;
+            """
+            rows = cur_conn.execute_query(select_query)
+            if len(rows) == 0:
+                continue
+            page = np.array(rows, dtype=float)
+            # Число ответов в итерациях может различаться, поэтому страница делится на итерации по их номерам
+            iteration_nums, iteration_starts = np.unique(
+                page[:, 0].astype(np.int64), return_index=True
+            )
+            yield (
+                iteration_nums,
+                page[iteration_starts, 1],
+                page[:, 3],
+                np.searchsorted(version_ids, page[:, 2].astype(np.int64)),
+                iteration_starts,
+                {
+                    algorithm_analysis.algorithm_id: cls._get_vote_answers(
+                        cur_conn,
+                        algorithm_analysis,
+                        experiment_id,
+                        iteration_nums[0],
+                        iteration_nums[-1],
+                        last_vote_result_id,
+                    )
+                    for algorithm_analysis in new_algorithms_analysis
+                },
+            )
+        for algorithm_analysis in new_algorithms_analysis:
+            algorithm_analysis.last_vote_result_id = last_vote_result_id
+
+    @classmethod
+    def analyse_experiment(
+        cls,
+        experiment_name: str,
+        tolerance: float = CORRECT_ANSWER_TOLERANCE,
+    ) -> tuple[list, list]:
+        """
+        Analyse vote algorithms and versions of the experiment saved in data base. Saved analysis is continued, so
+        only iterations and vote results added after it are read, and the result is saved for the next analysis
+        :param experiment_name: Experiment name
+        :param tolerance: Max difference between correct answer and answer, which is considered as correct
+        :return: (list of AlgorithmAnalysis objects, list of VersionAnalysis objects) tuple
+        """
+        cur_conn = DBConnector(cls._db_name)
+        experiment_id = cls._get_experiment_id(cur_conn, experiment_name)
+        # Результаты голосования, добавленные во время анализа, останутся для следующего
+        last_vote_result_id = cls._get_last_vote_result_id(cur_conn)
+        algorithms_analysis = cls._load_algorithms_analysis(
+            cur_conn, experiment_id, experiment_name, tolerance
+        )
+        versions_analysis = cls._load_versions_analysis(
+            cur_conn, experiment_id, tolerance
+        )
+        analyzer = cls(algorithms_analysis, versions_analysis, tolerance)
+        analysis = analyzer.analyse(
+            cls._experiment_pages(
+                cur_conn,
+                experiment_id,
+                algorithms_analysis,
+                versions_analysis,
+                last_vote_result_id,
+            )
+        )
+        analyzer._save_analysis(cur_conn, experiment_id)
+        return analysis
@@ -0,0 +1,88 @@
+"""Reproducible random streams for experiment data generation
+
+Program for simulation several N-versions work of one module to test vote algorithms.
+Experiment is carried out in Denis V. Gruzenkin PhD thesis writing.
+"""
+from random import Random
+from secrets import randbits
+
+import numpy as np
+
+__author__ = "Denis V. Gruzenkin"
+__copyright__ = "Copyright 2021, Denis V. Gruzenkin"
+__credits__ = ["Denis V. Gruzenkin"]
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Denis V. Gruzenkin"
+__email__ = "gruzenkin.denis@good-look.su"
+__status__ = "Production"
+
+# Итерации эксперимента разбиваются на куски фиксированного размера, и у каждого куска свой независимый поток
+# случайных чисел. Поэтому результат не зависит от того, сколько процессов генерирует куски и в каком порядке
+ITERATIONS_CHUNK_SIZE = 10000
+
+
+def new_experiment_seed() -> int:
+    """
+    Generate new experiment seed. It fits into SQLite integer column
+    :return: 63-bit non-negative integer
+    """
+    return randbits(63)
+
+
+def chunk_bounds(
+    iterations_amount: int, chunk_size: int = ITERATIONS_CHUNK_SIZE
+) -> list[tuple[int, int]]:
+    """
+    Split experiment iterations into chunks
+    :param iterations_amount: Experiment iterations amount
+    :param chunk_size: Iterations amount in one chunk
+    :return: list of (first iteration, last iteration + 1) tuples
+    """
+    return [
+        (start, min(start + chunk_size, iterations_amount))
+        for start in range(0, iterations_amount, chunk_size)
+    ]
+
+
+def chunk_seed_sequence(seed: int, chunk_index: int) -> np.random.SeedSequence:
+    # Совпадает с SeedSequence(seed).spawn(chunk_index + 1)[chunk_index], но не требует порождать все
+    # предыдущие потоки, поэтому любой процесс может получить поток своего куска независимо от остальных
+    return np.random.SeedSequence(seed, spawn_key=(chunk_index,))
+
+
+def chunk_numpy_generator(seed: int, chunk_index: int) -> np.random.Generator:
+    """
+    NumPy random numbers generator of the experiment iterations chunk
+    :param seed: Experiment seed
+    :param chunk_index: Chunk order number
+    :return: numpy.random.Generator object
+    """
+    return np.random.default_rng(chunk_seed_sequence(seed, chunk_index))
+
+
+def chunk_python_random(seed: int, chunk_index: int) -> Random:
+    """
+    Python random numbers generator of the experiment iterations chunk
+    :param seed: Experiment seed
+    :param chunk_index: Chunk order number
+    :return: random.Random object
+    """
+    return _seed_sequence_python_random(chunk_seed_sequence(seed, chunk_index))
+
+
+def versions_python_random(seed: int) -> Random:
+    """
+    Python random numbers generator of the generated module versions
+    :param seed: Experiment seed
+    :return: random.Random object
+    """
+    # Ключ потока версий длиннее ключей кусков итераций, поэтому их потоки не пересекаются
+    return _seed_sequence_python_random(
+        np.random.SeedSequence(seed, spawn_key=(0, 0))
+    )
+
+
+def _seed_sequence_python_random(seed_seq: np.random.SeedSequence) -> Random:
+    state = seed_seq.generate_state(4, np.uint64)
+    return Random(int.from_bytes(state.tobytes(), "little"))
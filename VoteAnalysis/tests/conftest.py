@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# Модули программы импортируются из её каталога, как при запуске main.py. Пакет VoteAlgorithms есть и у
+# VoteAnalysisCleanArchitecture, поэтому алгоритмы голосования импортируются из пакета VoteAnalysis
+PROGRAM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.dirname(PROGRAM_DIR), PROGRAM_DIR]
+
+from data_base_connector import DBConnector, DBConnectorMeta
+
+
+@pytest.fixture
+def data_base(tmp_path, monkeypatch):
+    # Подключение к базе одно на процесс, поэтому каждый тест получает новое подключение к пустой базе во временном
+    # каталоге
+    monkeypatch.chdir(tmp_path)
+    DBConnectorMeta._instances.clear()
+    yield DBConnector("experiment.db")
+    DBConnectorMeta._instances.clear()
@@ -0,0 +1,39 @@
+import random
+
+from campaign import expand_campaign_spec
+from data_generator import NModule
+from random_streams import versions_python_random
+
+
+def campaign_spec(name: str) -> dict:
+    return {
+        "name": name,
+        "iterations": 100,
+        "versions_amount": [4],
+        "reliability": [[0.7, 0.9]],
+        "diversity_intervals": [[[0, 1], [0, 1]]],
+        "seed": 7,
+    }
+
+
+def test_campaign_versions_are_reproducible():
+    modules_versions = []
+    for name in ("First", "Second"):
+        # Глобальный генератор не должен влиять на версии кампании
+        random.seed(name)
+        job = expand_campaign_spec(campaign_spec(name)).jobs[0]
+        module = NModule(job.experiment_name, 6)
+        module.add_generated_versions(
+            job.versions_amount,
+            job.reliability_interval,
+            job.diversities_intervals,
+            versions_python_random(job.seed),
+        )
+        modules_versions.append(
+            [
+                (version.reliability, tuple(version.dynamic_diversities))
+                for version in module.versions_list
+            ]
+        )
+    assert modules_versions[0] == modules_versions[1]
+    assert len(set(modules_versions[0])) == 4
@@ -0,0 +1,87 @@
+from random import Random
+
+import numpy as np
+
+from data_generator import NModule
+from random_streams import ITERATIONS_CHUNK_SIZE
+
+
+def make_module() -> NModule:
+    module = NModule("Module", 6)
+    module.add_generated_versions(6, (0.8, 0.95), [(0, 1), (0, 1)], Random(0))
+    return module
+
+
+def version_error_rates(experiment_results) -> np.ndarray:
+    errors = experiment_results.answers != experiment_results.correct_answers
+    # Версиям даны id с 1, поэтому нулевой элемент пропускается
+    version_ids = experiment_results.version_ids
+    return np.bincount(version_ids, errors)[1:] / np.bincount(version_ids)[1:]
+
+
+def test_batch_generation_keeps_scalar_layout():
+    module = make_module()
+    for ver_num, ver in enumerate(module.versions_list, 1):
+        ver._id = ver_num
+    scalar_results = module.generate_experiment_data(4000, "Scalar", 3)
+    scalar_error_rates = version_error_rates(scalar_results)
+    batch_results = module.generate_experiment_data(
+        4000, "Batch", 3, batch=True
+    )
+    # Пакетный генератор берёт случайные числа из другого потока, поэтому совпадают расположение ответов и частота
+    # ошибок версий, но не сами ответы
+    assert batch_results.experiment_name == "Batch"
+    assert np.array_equal(
+        batch_results.iteration_starts, scalar_results.iteration_starts
+    )
+    assert np.array_equal(
+        batch_results.iteration_nums, scalar_results.iteration_nums
+    )
+    assert np.array_equal(
+        batch_results.version_ids, scalar_results.version_ids
+    )
+    assert np.allclose(
+        version_error_rates(batch_results), scalar_error_rates, atol=0.03
+    )
+
+
+def test_batch_generation_is_saved_in_chunks(data_base):
+    module = make_module()
+    module.save_module_with_versions()
+    iterations_amount = ITERATIONS_CHUNK_SIZE + 500
+    experiment_batch = module.generate_experiment_batch(
+        iterations_amount, "Batch", 5
+    )
+    module.save_experiment_data_stream(
+        module.stream_experiment_data(
+            iterations_amount, "Batch", 5, workers=2, batch=True
+        ),
+        iterations_amount,
+    )
+    saved_answers = data_base.execute_query(
+        "select version_answer from experiment_data order by module_iteration_num, id;"
+    )
+    # Куски, сгенерированные в разных процессах, совпадают с генерацией всего прогона сразу
+    assert [res[0] for res in saved_answers] == (
+        experiment_batch.version_answers.reshape(-1).tolist()
+    )
+
+
+def test_empty_batch_generation():
+    module = make_module()
+    experiment_batch = module.generate_experiment_batch(0, "Empty", 1)
+    assert experiment_batch.iterations_amount == 0
+    assert experiment_batch.slots_amount == len(
+        module.version_grouping.slot_indexes
+    )
+    assert len(module.generate_experiment_data(0, "Empty", 1, batch=True)) == 0
+    assert list(module.stream_experiment_data(0, "Empty", 1, batch=True)) == []
+
+
+def test_stream_keeps_module_results():
+    module = make_module()
+    experiment_results = module.generate_experiment_data(100, "Generated", 1)
+    stream = module.stream_experiment_data(200, "Streamed", 2)
+    assert sum(len(chunk) for chunk in stream) == 200
+    assert module.global_results_lst is experiment_results
+    assert len(module.global_results_lst) == 100
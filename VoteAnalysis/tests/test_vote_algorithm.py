@@ -0,0 +1,43 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import VoteAlgorithm as vote_algorithm_module
+from data_generator import NModule
+from VoteAlgorithm import VoteAlgorithm
+
+
+def test_vote_all_pages_in_one_pool(data_base, monkeypatch):
+    module = NModule("Module", 6)
+    module.add_generated_versions(5, (0.8, 0.9), [(0, 1), (0, 1)])
+    module.save_module_with_versions()
+    module.save_experiment_data_stream(
+        module.stream_experiment_data(300, "Pages", 1), 300
+    )
+    vote_algorithms = [
+        VoteAlgorithm("Median", "vote", "MedianVote"),
+        VoteAlgorithm("tN_1", "vote", "tN_1"),
+    ]
+
+    def saved_votes(workers: int) -> list:
+        VoteAlgorithm.vote_all_pages(
+            vote_algorithms, module.iter_experiment_data("Pages", 100), workers
+        )
+        return data_base.execute_query("""
+                select algorithm_id, module_iteration_num, vote_answer from vote_result 
+                order by algorithm_id, module_iteration_num;
+            """)
+
+    expected_votes = saved_votes(1)
+    assert len(expected_votes) == 600
+    pools = []
+
+    class CountedPool(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(
+        vote_algorithm_module, "ProcessPoolExecutor", CountedPool
+    )
+    assert saved_votes(2) == expected_votes
+    # Процессы запускаются один раз на все страницы
+    assert len(pools) == 1
@@ -0,0 +1,114 @@
+import enum
+
+
+class CampaignJobStatus(enum.Enum):
+    PENDING = "pending"
+    GENERATED = "generated"
+    VOTED = "voted"
+
+
+class CampaignJob:
+    """
+    One module configuration of experiment campaign. Its experiment data is generated and voted by campaign runner
+    """
+
+    def __init__(
+        self,
+        job_num: int,
+        experiment_name: str,
+        versions_amount: int,
+        reliability_interval: tuple[float, float],
+        diversities_intervals: list[tuple[float, float]],
+        seed: int,
+        module_id: int = None,
+        status: CampaignJobStatus = CampaignJobStatus.PENDING,
+        job_id: int = None,
+    ):
+        """
+        CampaignJob class constructor
+        :param job_num: Job order number in campaign
+        :param experiment_name: Name of the job experiment
+        :param versions_amount: Amount of module versions
+        :param reliability_interval: (min, max) interval to generate versions reliability
+        :param diversities_intervals: (min, max) intervals to generate versions dynamic diversities
+        :param seed: Experiment seed
+        :param module_id: Id of saved job module
+        :param status: Job progress
+        :param job_id: Job id in data base
+        """
+        self._id = job_id
+        self.job_num = job_num
+        self.experiment_name = experiment_name
+        self.versions_amount = versions_amount
+        self.reliability_interval = tuple(reliability_interval)
+        self.diversities_intervals = [
+            tuple(interval) for interval in diversities_intervals
+        ]
+        self.seed = seed
+        self.module_id = module_id
+        self.status = status
+
+    @property
+    def id(self):
+        return self._id
+
+    def __str__(self):
+        res_str = f"{self.job_num}. {self.experiment_name}: versions: {self.versions_amount}\t"
+        res_str += f"reliability: {self.reliability_interval}\tdiversities: {self.diversities_intervals}\t"
+        res_str += f"status: {self.status.value}"
+        return res_str
+
+
+class Campaign:
+    """
+    Experiment campaign, which is a grid of module configurations. Every configuration is generated and voted
+    with the same iterations amount and vote algorithms
+    """
+
+    def __init__(
+        self,
+        name: str,
+        iterations_amount: int,
+        jobs: list[CampaignJob],
+        algorithms_names: list[str] = None,
+        round_to: int = 6,
+        min_out_val: float = 100,
+        max_out_val: float = 1000,
+        spec: str = "",
+        batch: bool = False,
+    ):
+        """
+        Campaign class constructor
+        :param name: Campaign name
+        :param iterations_amount: Iterations amount of every experiment
+        :param jobs: Campaign jobs
+        :param algorithms_names: Names of saved vote algorithms. All saved algorithms are run, if None
+        :param round_to: Modules digits amount fallow after dot delimiter
+        :param min_out_val: Minimal value that can be generated by versions
+        :param max_out_val: Maximal value that can be generated by versions
+        :param spec: Campaign spec JSON string. Campaign can be resumed only with the same spec
+        :param batch: Generate experiments data with NumPy arrays instead of iteration by iteration
+        """
+        self._id = None
+        self.name = name
+        self.iterations_amount = iterations_amount
+        self.jobs = jobs
+        self.algorithms_names = algorithms_names
+        self.round_to = round_to
+        self.min_out_val = min_out_val
+        self.max_out_val = max_out_val
+        self.spec = spec
+        self.batch = batch
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def pending_jobs(self) -> list[CampaignJob]:
+        return [
+            job for job in self.jobs if job.status != CampaignJobStatus.VOTED
+        ]
+
+    def __str__(self):
+        return f"{self.name}: jobs: {len(self.jobs)}\tdone: {len(self.jobs) - len(self.pending_jobs)}"
@@ -0,0 +1,67 @@
+import numpy as np
+
+# Сколько строк матрицы расстояний считать за один вызов, чтобы промежуточный массив разностей координат
+# (rows x n x d) не занимал слишком много памяти на модулях с сотнями версий
+_ROWS_BLOCK_SIZE = 256
+
+
+def stack_coordinates(versions) -> np.ndarray:
+    """
+    Stack common coordinates of all versions into one array
+    :param versions: sequence of NVersion objects
+    :return: array of (versions amount, coordinates amount) shape
+    """
+    return coordinates_array([ver.common_coordinates_list for ver in versions])
+
+
+def coordinates_array(coordinates) -> np.ndarray:
+    """
+    Convert coordinates sequences to (n, d) float array
+    :param coordinates: sequence of coordinates tuples (lists)
+    :return: array of (n, d) shape
+    """
+    if len({len(crd) for crd in coordinates}) > 1:
+        raise ValueError("Different coordinates amount")
+    if len(coordinates) == 0:
+        return np.empty((0, 0))
+    return np.array(coordinates, dtype=float).reshape(len(coordinates), -1)
+
+
+def distance_matrix(coordinates) -> np.ndarray:
+    """
+    Figure out Euclidean distances between all pairs of points
+    :param coordinates: sequence of coordinates tuples or (n, d) array
+    :return: (n, n) array of distances
+    """
+    crd = (
+        coordinates
+        if isinstance(coordinates, np.ndarray)
+        else coordinates_array(coordinates)
+    )
+    n = crd.shape[0]
+    result = np.empty((n, n))
+    for start in range(0, n, _ROWS_BLOCK_SIZE):
+        diff = crd[start : start + _ROWS_BLOCK_SIZE, None, :] - crd[None]
+        result[start : start + _ROWS_BLOCK_SIZE] = np.sqrt(
+            np.einsum("ijk,ijk->ij", diff, diff)
+        )
+    return result
+
+
+def versions_distance_matrix(versions) -> np.ndarray:
+    """
+    Figure out distances between all pairs of versions in one batched call
+    :param versions: sequence of NVersion objects
+    :return: (n, n) array of distances
+    """
+    return distance_matrix(stack_coordinates(versions))
+
+
+def distances_from_zero_point(versions) -> np.ndarray:
+    """
+    Figure out distances from zero point for all versions in one batched call
+    :param versions: sequence of NVersion objects
+    :return: array of n distances
+    """
+    crd = stack_coordinates(versions)
+    return np.sqrt(np.einsum("ij,ij->i", crd, crd))
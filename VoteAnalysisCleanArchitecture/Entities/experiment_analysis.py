@@ -0,0 +1,159 @@
+from math import sqrt
+
+# Ответ голосования считается верным, если отличается от правильного не больше, чем на погрешность округления
+# ответов модуля с точностью по умолчанию
+CORRECT_ANSWER_TOLERANCE = 1e-6
+
+
+class AlgorithmAnalysis:
+    """
+    Vote algorithm accuracy over one experiment. It is kept as counts and sums only, so it can be added up from
+    several parts of the experiment
+    """
+
+    def __init__(
+        self,
+        algorithm_id: int,
+        algorithm_name: str,
+        experiment_name: str,
+        iterations_amount: int = 0,
+        correct_amount: int = 0,
+        no_answer_amount: int = 0,
+        error_sum: float = 0.0,
+        error_square_sum: float = 0.0,
+        max_error: float = 0.0,
+        tie_amount: int = 0,
+        tie_correct_amount: int = 0,
+        last_vote_result_id: int = 0,
+    ):
+        """
+        AlgorithmAnalysis class constructor
+        :param algorithm_id: Vote algorithm id
+        :param algorithm_name: Vote algorithm name
+        :param experiment_name: Experiment name
+        :param iterations_amount: Amount of voted iterations
+        :param correct_amount: Amount of iterations with correct vote answer
+        :param no_answer_amount: Amount of iterations, where algorithm gave no answer
+        :param error_sum: Sum of absolute vote errors
+        :param error_square_sum: Sum of squared vote errors
+        :param max_error: Max absolute vote error
+        :param tie_amount: Amount of iterations, where several answers got the same largest number of versions
+        :param tie_correct_amount: Amount of tie iterations with correct vote answer
+        :param last_vote_result_id: Id of the last vote result, which is added into analysis
+        """
+        self.algorithm_id = algorithm_id
+        self.algorithm_name = algorithm_name
+        self.experiment_name = experiment_name
+        self.iterations_amount = iterations_amount
+        self.correct_amount = correct_amount
+        self.no_answer_amount = no_answer_amount
+        self.error_sum = error_sum
+        self.error_square_sum = error_square_sum
+        self.max_error = max_error
+        self.tie_amount = tie_amount
+        self.tie_correct_amount = tie_correct_amount
+        self.last_vote_result_id = last_vote_result_id
+
+    @property
+    def answered_amount(self) -> int:
+        return self.iterations_amount - self.no_answer_amount
+
+    @property
+    def correct_rate(self) -> float:
+        if self.iterations_amount == 0:
+            return 0.0
+        return self.correct_amount / self.iterations_amount
+
+    @property
+    def mean_error(self) -> float:
+        if self.answered_amount == 0:
+            return 0.0
+        return self.error_sum / self.answered_amount
+
+    @property
+    def root_mean_square_error(self) -> float:
+        if self.answered_amount == 0:
+            return 0.0
+        return sqrt(self.error_square_sum / self.answered_amount)
+
+    @property
+    def tie_rate(self) -> float:
+        if self.iterations_amount == 0:
+            return 0.0
+        return self.tie_amount / self.iterations_amount
+
+    @property
+    def tie_correct_rate(self) -> float:
+        if self.tie_amount == 0:
+            return 0.0
+        return self.tie_correct_amount / self.tie_amount
+
+    def __str__(self):
+        res_str = f"{self.algorithm_name} ({self.experiment_name}): iterations: {self.iterations_amount}\t"
+        res_str += f"correct: {self.correct_rate:.4%}\tno answer: {self.no_answer_amount}\t"
+        res_str += f"mean error: {self.mean_error:.6f}\tRMSE: {self.root_mean_square_error:.6f}\t"
+        res_str += f"max error: {self.max_error:.6f}\tties: {self.tie_rate:.4%}\tcorrect on ties: "
+        res_str += f"{self.tie_correct_rate:.4%}"
+        return res_str
+
+
+class VersionAnalysis:
+    """
+    Version reliability, which was set for experiment, compared with its observed errors
+    """
+
+    def __init__(
+        self,
+        version_id: int,
+        version_name: str,
+        version_reliability: float,
+        answers_amount: int = 0,
+        errors_amount: int = 0,
+        error_sum: float = 0.0,
+        last_iteration_num: int = -1,
+    ):
+        """
+        VersionAnalysis class constructor
+        :param version_id: Version id
+        :param version_name: Version name
+        :param version_reliability: Version reliability used for experiment data generation
+        :param answers_amount: Amount of version answers
+        :param errors_amount: Amount of incorrect version answers
+        :param error_sum: Sum of absolute errors of version answers
+        :param last_iteration_num: Number of the last iteration, which is added into analysis. Iterations are
+        numbered from 0, so it is -1, if no iteration is added
+        """
+        self.version_id = version_id
+        self.version_name = version_name
+        self.version_reliability = version_reliability
+        self.answers_amount = answers_amount
+        self.errors_amount = errors_amount
+        self.error_sum = error_sum
+        self.last_iteration_num = last_iteration_num
+
+    @property
+    def expected_error_rate(self) -> float:
+        return 1 - self.version_reliability
+
+    @property
+    def observed_error_rate(self) -> float:
+        if self.answers_amount == 0:
+            return 0.0
+        return self.errors_amount / self.answers_amount
+
+    @property
+    def observed_reliability(self) -> float:
+        return 1 - self.observed_error_rate
+
+    @property
+    def mean_error(self) -> float:
+        if self.errors_amount == 0:
+            return 0.0
+        return self.error_sum / self.errors_amount
+
+    def __str__(self):
+        res_str = f"{self.version_name} (id: {self.version_id}): reliability: {self.version_reliability}\t"
+        res_str += f"observed reliability: {self.observed_reliability:.6f}\t"
+        res_str += f"expected error rate: {self.expected_error_rate:.6f}\t"
+        res_str += f"observed error rate: {self.observed_error_rate:.6f}\tmean error: {self.mean_error:.6f}"
+        return res_str
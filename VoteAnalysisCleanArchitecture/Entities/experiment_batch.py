@@ -0,0 +1,61 @@
+import numpy as np
+
+
+class ExperimentBatch:
+    """
+    Experiment data of a whole run (or of its iterations chunk) as arrays. Every column is a result slot of an
+    iteration. Slots go in the same order as results of the iteration list built by the scalar generator
+    """
+
+    def __init__(
+        self,
+        correct_answers: np.ndarray,
+        version_answers: np.ndarray,
+        reliability_draws: np.ndarray,
+        version_indexes: np.ndarray,
+        first_iteration: int = 0,
+    ):
+        """
+        ExperimentBatch class constructor
+        :param correct_answers: (iterations,) array of correct answers
+        :param version_answers: (iterations, slots) array of versions answers
+        :param reliability_draws: (iterations, slots) array of random numbers compared with versions reliability
+        :param version_indexes: (slots,) array of versions indexes in module versions list
+        :param first_iteration: Number of the first iteration in the batch
+        """
+        self.correct_answers = correct_answers
+        self.version_answers = version_answers
+        self.reliability_draws = reliability_draws
+        self.version_indexes = version_indexes
+        self.first_iteration = first_iteration
+        # Сид эксперимента, по которому сгенерированы данные
+        self.seed: int = None
+
+    @classmethod
+    def concatenate(cls, batches: list):
+        """
+        Join batches of consecutive iterations chunks into one batch
+        :param batches: list of ExperimentBatch objects in iterations order
+        :return: ExperimentBatch object
+        """
+        return cls(
+            np.concatenate([batch.correct_answers for batch in batches]),
+            np.concatenate([batch.version_answers for batch in batches]),
+            np.concatenate([batch.reliability_draws for batch in batches]),
+            batches[0].version_indexes,
+            batches[0].first_iteration,
+        )
+
+    @property
+    def iterations_amount(self) -> int:
+        return self.version_answers.shape[0]
+
+    @property
+    def slots_amount(self) -> int:
+        return self.version_answers.shape[1]
+
+    @property
+    def iteration_nums(self) -> np.ndarray:
+        return np.arange(
+            self.first_iteration, self.first_iteration + self.iterations_amount
+        )
@@ -0,0 +1,407 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from Entities.n_result import NResult
+
+
+class IterationResults(Sequence):
+    """
+    Results of one experiment iteration. NResult objects are created only on access
+    """
+
+    __slots__ = ("_experiment_results", "_first", "_last")
+
+    def __init__(self, experiment_results, first: int, last: int):
+        """
+        IterationResults class constructor
+        :param experiment_results: ExperimentResults object, which stores the results
+        :param first: Position of the first answer of the iteration
+        :param last: Position after the last answer of the iteration
+        """
+        self._experiment_results = experiment_results
+        self._first = first
+        self._last = last
+
+    @property
+    def iteration_num(self) -> int:
+        return int(self._experiment_results.iteration_nums[self._first])
+
+    @property
+    def experiment_name(self) -> str:
+        return self._experiment_results.experiment_name
+
+    @property
+    def result_ids(self) -> list:
+        """
+        Data base ids of the iteration results. Id of not saved result is None
+        """
+        return [
+            None if result_id < 0 else result_id
+            for result_id in self._experiment_results.result_ids[
+                self._first : self._last
+            ].tolist()
+        ]
+
+    def __len__(self):
+        return self._last - self._first
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Answer index out of range")
+        return self._experiment_results.result(self._first + index)
+
+
+class ExperimentResults:
+    """
+    Experiment results stored column-wise in typed arrays. Module and versions data are kept once, and NResult
+    objects are created only on access. Results are read as a list of iterations, where every iteration is a list
+    of NResult objects
+    """
+
+    def __init__(
+        self,
+        module_id: int,
+        module_name: str,
+        connectivity_matrix: tuple,
+        experiment_name: str = "NoName",
+    ):
+        """
+        ExperimentResults class constructor
+        :param module_id: Module id
+        :param module_name: Module name
+        :param connectivity_matrix: Normed connectivity matrix of module versions
+        :param experiment_name: Experiment name
+        """
+        self.module_id = module_id
+        self.module_name = module_name
+        self.module_connectivity_matrix = connectivity_matrix
+        self.experiment_name = experiment_name
+        # Данные версий хранятся один раз, а для каждого ответа запоминается только позиция версии в этих списках
+        self._versions: list = []
+        self._version_ids: list = []
+        self._version_names: list = []
+        self._version_reliabilities: list = []
+        self._version_coordinates: list = []
+        # Добавляемые куски результатов объединяются в общие массивы только при первом чтении
+        self._parts: list[tuple] = []
+        self._iteration_nums = np.empty(0, dtype=np.int64)
+        self._correct_answers = np.empty(0, dtype=np.float64)
+        self._answers = np.empty(0, dtype=np.float64)
+        self._version_positions = np.empty(0, dtype=np.int32)
+        # Для ещё не сохранённых в БД результатов id равен -1
+        self._result_ids = np.empty(0, dtype=np.int64)
+        self._iteration_starts = np.zeros(1, dtype=np.int64)
+
+    def add_version(
+        self,
+        v_id: int,
+        v_name: str,
+        v_reliability: float,
+        v_common_coordinates: tuple,
+        version=None,
+    ) -> int:
+        """
+        Add data of the version, which answers are stored
+        :param version: NVersion object, which is returned in NResult objects
+        :return: version position to pass it into append_results
+        """
+        self._versions.append(version)
+        self._version_ids.append(v_id)
+        self._version_names.append(v_name)
+        self._version_reliabilities.append(v_reliability)
+        self._version_coordinates.append(v_common_coordinates)
+        return len(self._versions) - 1
+
+    def add_versions(self, versions) -> np.ndarray:
+        """
+        Add data of several NVersion objects
+        :param versions: sequence of NVersion objects
+        :return: array of versions positions
+        """
+        return np.array(
+            [
+                self.add_version(
+                    ver.id,
+                    ver.name,
+                    ver.reliability,
+                    ver.common_coordinates_list,
+                    ver,
+                )
+                for ver in versions
+            ],
+            dtype=np.int32,
+        )
+
+    def copy_without_results(self) -> "ExperimentResults":
+        """
+        Make ExperimentResults object with the same module and versions data, but without results
+        :return: ExperimentResults object
+        """
+        experiment_results = ExperimentResults(
+            self.module_id,
+            self.module_name,
+            self.module_connectivity_matrix,
+            self.experiment_name,
+        )
+        for version_data, version in zip(self.versions_data, self._versions):
+            experiment_results.add_version(*version_data, version)
+        return experiment_results
+
+    def append_results(
+        self,
+        iteration_nums,
+        correct_answers,
+        version_answers,
+        version_positions,
+        result_ids=None,
+    ):
+        """
+        Append results. All arrays contain one value per answer. Answers of one iteration should go one after
+        another
+        :param iteration_nums: Iterations numbers
+        :param correct_answers: Correct answers
+        :param version_answers: Versions answers
+        :param version_positions: Positions of versions returned by add_version
+        :param result_ids: Results ids in data base
+        """
+        version_answers = np.asarray(version_answers, dtype=np.float64)
+        if result_ids is None:
+            result_ids = np.full(len(version_answers), -1, dtype=np.int64)
+        self._parts.append(
+            (
+                np.asarray(iteration_nums, dtype=np.int64),
+                np.asarray(correct_answers, dtype=np.float64),
+                version_answers,
+                np.asarray(version_positions, dtype=np.int32),
+                np.asarray(result_ids, dtype=np.int64),
+            )
+        )
+
+    def append_iterations(
+        self,
+        first_iteration: int,
+        correct_answers,
+        version_answers,
+        version_positions,
+    ):
+        """
+        Append results of consecutive iterations, where the same versions answer in the same order
+        :param first_iteration: Number of the first iteration
+        :param correct_answers: (iterations,) array of correct answers
+        :param version_answers: (iterations, slots) array of versions answers
+        :param version_positions: (slots,) array of versions positions
+        """
+        correct_answers = np.asarray(correct_answers, dtype=np.float64)
+        version_positions = np.asarray(version_positions, dtype=np.int32)
+        iterations_amount = len(correct_answers)
+        slots_amount = len(version_positions)
+        self.append_results(
+            np.repeat(
+                np.arange(first_iteration, first_iteration + iterations_amount),
+                slots_amount,
+            ),
+            np.repeat(correct_answers, slots_amount),
+            np.asarray(version_answers, dtype=np.float64).reshape(-1),
+            np.tile(version_positions, iterations_amount),
+        )
+
+    def _consolidate(self):
+        if not self._parts:
+            return
+        columns = list(zip(*self._parts))
+        self._parts = []
+        self._iteration_nums = np.concatenate(
+            (self._iteration_nums, *columns[0])
+        )
+        self._correct_answers = np.concatenate(
+            (self._correct_answers, *columns[1])
+        )
+        self._answers = np.concatenate((self._answers, *columns[2]))
+        self._version_positions = np.concatenate(
+            (self._version_positions, *columns[3])
+        )
+        self._result_ids = np.concatenate((self._result_ids, *columns[4]))
+        # Новая итерация начинается там, где меняется её номер
+        if len(self._iteration_nums) == 0:
+            self._iteration_starts = np.zeros(1, dtype=np.int64)
+        else:
+            self._iteration_starts = np.concatenate(
+                (
+                    [0],
+                    np.flatnonzero(np.diff(self._iteration_nums)) + 1,
+                    [len(self._iteration_nums)],
+                )
+            )
+
+    @property
+    def iterations_amount(self) -> int:
+        self._consolidate()
+        return len(self._iteration_starts) - 1
+
+    @property
+    def answers_amount(self) -> int:
+        self._consolidate()
+        return len(self._answers)
+
+    @property
+    def iteration_nums(self) -> np.ndarray:
+        self._consolidate()
+        return self._iteration_nums
+
+    @property
+    def correct_answers(self) -> np.ndarray:
+        self._consolidate()
+        return self._correct_answers
+
+    @property
+    def answers(self) -> np.ndarray:
+        self._consolidate()
+        return self._answers
+
+    @property
+    def version_ids(self) -> np.ndarray:
+        """
+        Versions ids of all answers. Id of not saved version is -1
+        """
+        self._consolidate()
+        ids = np.array(
+            [-1 if v_id is None else v_id for v_id in self._version_ids],
+            dtype=np.int64,
+        )
+        return ids[self._version_positions]
+
+    @property
+    def result_ids(self) -> np.ndarray:
+        self._consolidate()
+        return self._result_ids
+
+    @property
+    def iteration_starts(self) -> np.ndarray:
+        """
+        Positions of the first answer of every iteration and the total answers amount in the end
+        """
+        self._consolidate()
+        return self._iteration_starts
+
+    @property
+    def versions_data(self) -> list[tuple]:
+        """
+        Data of versions, which answers are stored
+        :return: list of (version id, name, reliability, common coordinates) tuples
+        """
+        return list(
+            zip(
+                self._version_ids,
+                self._version_names,
+                self._version_reliabilities,
+                self._version_coordinates,
+            )
+        )
+
+    def iter_answer_rows(self, chunk_size: int = 100000):
+        """
+        Answers as rows to write them into data base. Rows are converted chunk by chunk, so all of them are never
+        kept in memory at the same time
+        :param chunk_size: Amount of answers converted at once
+        :return: generator of (version id, version answer, correct answer, iteration number) tuples
+        """
+        self._consolidate()
+        version_ids = np.array(self._version_ids, dtype=object)
+        for first in range(0, len(self._answers), chunk_size):
+            last = first + chunk_size
+            yield from zip(
+                version_ids[self._version_positions[first:last]].tolist(),
+                self._answers[first:last].tolist(),
+                self._correct_answers[first:last].tolist(),
+                self._iteration_nums[first:last].tolist(),
+            )
+
+    def answer_rows(self) -> list[tuple]:
+        """
+        Answers as rows to write them into data base
+        :return: list of (version id, version answer, correct answer, iteration number) tuples
+        """
+        return list(self.iter_answer_rows())
+
+    def answers_matrix(self) -> np.ndarray | None:
+        """
+        Versions answers as read-only (iterations, answers per iteration) array
+        :return: array or None, if iterations have different answers amount
+        """
+        self._consolidate()
+        iteration_sizes = np.diff(self._iteration_starts)
+        if len(iteration_sizes) == 0:
+            return np.empty((0, 0), dtype=np.float64)
+        if np.any(iteration_sizes != iteration_sizes[0]):
+            return None
+        answers_matrix = self._answers.reshape(
+            len(iteration_sizes), int(iteration_sizes[0])
+        )
+        answers_matrix.flags.writeable = False
+        return answers_matrix
+
+    def iteration_results(self, index: int) -> IterationResults:
+        """
+        Results of one iteration, which NResult objects are made only on access
+        :param index: Iteration index
+        :return: IterationResults object
+        """
+        self._consolidate()
+        return IterationResults(
+            self,
+            int(self._iteration_starts[index]),
+            int(self._iteration_starts[index + 1]),
+        )
+
+    def result(self, answer_index: int) -> NResult:
+        """
+        Make NResult object of one answer
+        :param answer_index: Answer position in the results arrays
+        :return: NResult object
+        """
+        self._consolidate()
+        ver_pos = int(self._version_positions[answer_index])
+        result_id = int(self._result_ids[answer_index])
+        return NResult(
+            self._version_ids[ver_pos],
+            self._version_names[ver_pos],
+            self._version_reliabilities[ver_pos],
+            self._version_coordinates[ver_pos],
+            float(self._answers[answer_index]),
+            float(self._correct_answers[answer_index]),
+            self.module_id,
+            self.module_name,
+            self.module_connectivity_matrix,
+            int(self._iteration_nums[answer_index]),
+            self._versions[ver_pos],
+            None if result_id < 0 else result_id,
+            self.experiment_name,
+        )
+
+    def __len__(self):
+        return self.iterations_amount
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        iterations_amount = len(self)
+        if index < 0:
+            index += iterations_amount
+        if not 0 <= index < iterations_amount:
+            raise IndexError("Iteration index out of range")
+        return [
+            self.result(answer_index)
+            for answer_index in range(
+                self._iteration_starts[index],
+                self._iteration_starts[index + 1],
+            )
+        ]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
@@ -1,5 +1,4 @@
-import json
-
+from Entities.distance_engine import versions_distance_matrix
 from Entities.n_version import NVersion
 
 
@@ -50,6 +49,9 @@ class NModule:
         self.max_out_val = max_out_val
         # Versions, which are included into module
         self._versions_list: list[NVersion] = []
+        # Версии по их id и позиции версий в списке для поиска за O(1)
+        self._versions_by_id: dict[int, NVersion] = {}
+        self._version_indexes: dict[int, int] = {}
         # List of tuples, that contain constant diversities values
         self._const_diversities_versions_list = []
         # List of tuples, that contain intervals to generate dynamic diversities
@@ -59,11 +61,23 @@ class NModule:
         self._global_results_lst: list = []
         self._global_results_lst_2_write: list[tuple] = []
         self._experiment_name = None
+        self._experiment_seed: int = None
+        self._experiment_batch = False
+        # Нормированная матрица связности пересчитывается только при изменении состава версий или их координат
+        self._connectivity_matrix_cache = None
+        self._connectivity_array_cache = None
+        self._connectivity_matrix_cache_key = None
+        self._connectivity_matrix_cache_hits = 0
+        self._connectivity_matrix_cache_misses = 0
 
     @property
     def id(self):
         return self._id
 
+    @property
+    def experiment_seed(self):
+        return self._experiment_seed
+
     @property
     def versions_list(self):
         return self._versions_list
@@ -71,6 +85,51 @@ class NModule:
     @versions_list.setter
     def versions_list(self, new_ver_lst: list):
         self._versions_list = new_ver_lst
+        self._reindex_versions()
+
+    def _reindex_versions(self):
+        self._versions_by_id = {
+            ver.id: ver for ver in self._versions_list if ver.id is not None
+        }
+        self._version_indexes = {
+            id(ver): index for index, ver in enumerate(self._versions_list)
+        }
+
+    def add_version(self, version: NVersion):
+        """
+        Add version to module and index it
+        :param version: NVersion object
+        """
+        self._version_indexes[id(version)] = len(self._versions_list)
+        self._versions_list.append(version)
+        if version.id is not None:
+            self._versions_by_id[version.id] = version
+
+    def get_version_by_id(self, id_4_search: int) -> NVersion | None:
+        version = self._versions_by_id.get(id_4_search)
+        if version is None or version.id != id_4_search:
+            # Id присваивается версии при сохранении в БД, т.е. уже после её добавления в модуль
+            self._reindex_versions()
+            version = self._versions_by_id.get(id_4_search)
+        return version
+
+    def version_index(self, version: NVersion) -> int:
+        """
+        Position of the version in module versions list
+        :param version: NVersion object
+        :return: version index
+        """
+        index = self._version_indexes.get(id(version))
+        if (
+            index is None
+            or index >= len(self._versions_list)
+            or self._versions_list[index] is not version
+        ):
+            self._reindex_versions()
+            index = self._version_indexes.get(id(version))
+            if index is None:
+                raise ValueError(f"Version {version.name} is not in module")
+        return index
 
     @property
     def const_diversities_versions_list(self):
@@ -104,68 +163,75 @@ class NModule:
     def dynamic_diversities_count(self, dyn_div_count: int):
         self._dynamic_diversities_count = dyn_div_count
 
+    def _get_connectivity_matrix_cache_key(self) -> tuple:
+        return tuple(
+            (id(ver), ver.coordinates_revision) for ver in self._versions_list
+        )
+
     @property
-    def normed_connectivity_matrix(self):
+    def connectivity_matrix_cache_info(self) -> dict:
         """
-        Figure out distance length between versions in the metric space in percents (from 0 to 1)
-        :return: matrix (tuple of tuples)
+        Connectivity matrix cache usage statistics
+        :return: dict with "hits" and "misses" counters
         """
+        return {
+            "hits": self._connectivity_matrix_cache_hits,
+            "misses": self._connectivity_matrix_cache_misses,
+        }
 
+    def _update_connectivity_matrix_cache(self):
         if not self._versions_list or len(self._versions_list) == 0:
             raise AttributeError("There are not versions in module")
 
-        matrix = []
-        for cur_ver in self._versions_list:
-            matrix.append(
-                [
-                    cur_ver.calculate_distance_to(another_ver)
-                    for another_ver in self._versions_list
-                ]
-            )
-
-        max_val = max(map(max, matrix))
+        cache_key = self._get_connectivity_matrix_cache_key()
+        if cache_key == self._connectivity_matrix_cache_key:
+            self._connectivity_matrix_cache_hits += 1
+            return
+        self._connectivity_matrix_cache_misses += 1
 
-        try:
-            for i in range(len(matrix)):
-                for j in range(len(matrix[i])):
-                    matrix[i][j] /= max_val
-        except ZeroDivisionError:
+        matrix = versions_distance_matrix(self._versions_list)
+        max_val = matrix.max()
+        if max_val == 0:
             print(
                 "Max distance between all versions is zero, so connectivity matrix cannot by normed"
             )
+        else:
+            matrix /= max_val
+        matrix.setflags(write=False)
+
+        self._connectivity_array_cache = matrix
+        self._connectivity_matrix_cache = tuple(map(tuple, matrix.tolist()))
+        self._connectivity_matrix_cache_key = cache_key
+
+    @property
+    def normed_connectivity_matrix(self):
+        """
+        Figure out distance length between versions in the metric space in percents (from 0 to 1).
+        Matrix is cached until versions list or versions coordinates are changed
+        :return: matrix (tuple of tuples)
+        """
+        self._update_connectivity_matrix_cache()
+        return self._connectivity_matrix_cache
 
-        return tuple(map(tuple, matrix))
+    @property
+    def normed_connectivity_array(self):
+        """
+        The same normed connectivity matrix as read-only NumPy array
+        :return: (n, n) array
+        """
+        self._update_connectivity_matrix_cache()
+        return self._connectivity_array_cache
 
     @property
     def global_results_lst(self):
         return self._global_results_lst
 
     def _get_global_results_lst_2_write(self):
-        for sub_lst in self._global_results_lst:
-            for itm in sub_lst:
-                self._global_results_lst_2_write.append(
-                    (
-                        itm.version_id,
-                        itm.version_name,
-                        itm.version_reliability,
-                        json.dumps(
-                            {
-                                "version_coordinates": itm.version_common_coordinates
-                            }
-                        ),
-                        itm.version_answer,
-                        itm.correct_answer,
-                        itm.module_id,
-                        itm.module_name,
-                        json.dumps(
-                            {
-                                "connectivity_matrix": itm.module_connectivity_matrix
-                            }
-                        ),
-                        itm.module_iteration_num,
-                        itm.experiment_name,
-                    )
-                )
+        # Данные модуля и версий сохраняются отдельно от ответов, поэтому строка ответа содержит только id и числа
+        if len(self._global_results_lst) > 0:
+            self._global_results_lst_2_write.extend(
+                self._global_results_lst.answer_rows()
+            )
 
     @property
     def global_results_lst_2_write(self):
@@ -2,6 +2,23 @@ from Entities.n_version import NVersion
 
 
 class NResult:
+    # Результатов в эксперименте миллионы, поэтому у объектов нет __dict__
+    __slots__ = (
+        "id",
+        "version_id",
+        "version_name",
+        "version_reliability",
+        "version_common_coordinates",
+        "version_answer",
+        "correct_answer",
+        "module_id",
+        "module_name",
+        "module_connectivity_matrix",
+        "module_iteration_num",
+        "version",
+        "experiment_name",
+    )
+
     def __init__(
         self,
         v_id: int,
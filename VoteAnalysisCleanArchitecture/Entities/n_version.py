@@ -1,5 +1,5 @@
-from math import sqrt
-from random import uniform
+from math import dist, hypot
+from random import Random, uniform
 
 
 class NVersion:
@@ -31,6 +31,8 @@ class NVersion:
         self._const_diversities = const_diversities
         self._dynamic_diversities = dynamic_diversities
         self._reliability = reliability
+        # Счётчик изменений координат версии. По нему модуль понимает, что закэшированная матрица связности устарела
+        self._coordinates_revision = 0
 
     @property
     def id(self):
@@ -51,6 +53,7 @@ class NVersion:
     @const_diversities.setter
     def const_diversities(self, new_tpl: tuple):
         self._const_diversities = new_tpl
+        self._coordinates_revision += 1
 
     @property
     def dynamic_diversities(self):
@@ -59,6 +62,11 @@ class NVersion:
     @dynamic_diversities.setter
     def dynamic_diversities(self, new_lst: list):
         self._dynamic_diversities = new_lst
+        self._coordinates_revision += 1
+
+    @property
+    def coordinates_revision(self):
+        return self._coordinates_revision
 
     @property
     def common_coordinates_list(self):
@@ -75,8 +83,18 @@ class NVersion:
         else:
             raise ValueError("Reliability interval is [0, 1]")
 
-    def generate_reliability(self, min_val: float, max_val: float, round_to=6):
-        self._reliability = round(uniform(min_val, max_val), round_to)
+    def generate_reliability(
+        self,
+        min_val: float,
+        max_val: float,
+        round_to=6,
+        random_stream: Random = None,
+    ):
+        # Без потока случайных чисел версия генерируется невоспроизводимо, как при ручном добавлении
+        uniform_val = (
+            uniform if random_stream is None else random_stream.uniform
+        )
+        self._reliability = round(uniform_val(min_val, max_val), round_to)
 
     @staticmethod
     def _calc_euclidean_distance(
@@ -84,20 +102,26 @@ class NVersion:
     ) -> float:
         if len(lst1) != len(lst2):
             raise ValueError("Different coordinates amount")
-        return sqrt(sum((x - y) ** 2 for x, y in zip(lst1, lst2)))
+        return dist(lst1, lst2)
 
     @property
     def distance_from_zero_point(self):
-        return self._calc_euclidean_distance(
-            self.common_coordinates_list,
-            list(map(lambda arg: arg * 0, self.common_coordinates_list)),
-        )
+        return hypot(*self.common_coordinates_list)
 
     def generate_dynamic_diversities(
-        self, intervals_lst: list[tuple], round_to=6
+        self,
+        intervals_lst: list[tuple],
+        round_to=6,
+        random_stream: Random = None,
     ):
+        uniform_val = (
+            uniform if random_stream is None else random_stream.uniform
+        )
         for tpl in intervals_lst:
-            self._dynamic_diversities.append(round(uniform(*tpl), round_to))
+            self._dynamic_diversities.append(
+                round(uniform_val(*tpl), round_to)
+            )
+        self._coordinates_revision += 1
 
     def calculate_distance_to(self, another_version) -> float:
         return self._calc_euclidean_distance(
@@ -0,0 +1,158 @@
+import numpy as np
+
+
+class VersionGrouping:
+    """
+    Module versions split into clone, similar, partly similar and difference groups by normed connectivity
+    matrix. Groups are stored as arrays of versions indexes in the module versions list. A version gets into a
+    group if it forms a pair of such kind with any other version, so it can belong to several groups
+    """
+
+    # Границы групп в долях нормированного расстояния между версиями
+    clone_max_distance = 0.05
+    similar_max_distance = 0.4
+    partly_similar_max_distance = 0.6
+
+    def __init__(self, versions, connectivity_matrix):
+        """
+        VersionGrouping class constructor
+        :param versions: Module versions list
+        :param connectivity_matrix: Normed connectivity matrix of the versions
+        """
+        self._versions = tuple(versions)
+        self._connectivity_matrix = np.asarray(
+            connectivity_matrix, dtype=float
+        )
+        # Сравниваем каждую пару версий один раз - берём только верхний треугольник матрицы
+        j, k = np.triu_indices(len(self._versions), 1)
+        distances = self._connectivity_matrix[j, k]
+        clone_mask = (0 <= distances) & (distances <= self.clone_max_distance)
+        similar_mask = (self.clone_max_distance < distances) & (
+            distances < self.similar_max_distance
+        )
+        partly_similar_mask = (self.similar_max_distance <= distances) & (
+            distances <= self.partly_similar_max_distance
+        )
+        difference_mask = ~(clone_mask | similar_mask | partly_similar_mask)
+
+        self._clone_indexes = np.union1d(j[clone_mask], k[clone_mask])
+        self._similar_indexes = np.union1d(j[similar_mask], k[similar_mask])
+        self._partly_similar_indexes = np.union1d(
+            j[partly_similar_mask], k[partly_similar_mask]
+        )
+        self._difference_indexes = np.union1d(
+            j[difference_mask], k[difference_mask]
+        )
+
+        # Для каждой частично схожей версии запоминаем наибольшее и наименьшее расстояние до других версий группы,
+        # чтобы зависимость версий на итерации определялась одним сравнением с уровнем диверсифицированности
+        submatrix = self.partly_similar_submatrix
+        other_versions_mask = ~np.eye(len(submatrix), dtype=bool)
+        self._partly_similar_max_distances = np.where(
+            other_versions_mask, np.maximum(submatrix, submatrix.T), -np.inf
+        ).max(axis=1, initial=-np.inf)
+        self._partly_similar_min_distances = np.where(
+            other_versions_mask, np.minimum(submatrix, submatrix.T), np.inf
+        ).min(axis=1, initial=np.inf)
+
+    @property
+    def versions(self) -> tuple:
+        return self._versions
+
+    @property
+    def connectivity_matrix(self) -> np.ndarray:
+        return self._connectivity_matrix
+
+    @property
+    def clone_indexes(self) -> np.ndarray:
+        return self._clone_indexes
+
+    @property
+    def similar_indexes(self) -> np.ndarray:
+        return self._similar_indexes
+
+    @property
+    def partly_similar_indexes(self) -> np.ndarray:
+        return self._partly_similar_indexes
+
+    @property
+    def difference_indexes(self) -> np.ndarray:
+        return self._difference_indexes
+
+    @property
+    def slot_indexes(self) -> np.ndarray:
+        """
+        Versions indexes in the order in which versions answer on every experiment iteration: clone, similar,
+        partly similar and difference groups one after another
+        :return: array of versions indexes
+        """
+        return np.concatenate(
+            (
+                self._clone_indexes,
+                self._similar_indexes,
+                self._partly_similar_indexes,
+                self._difference_indexes,
+            )
+        )
+
+    def get_versions(self, indexes) -> tuple:
+        return tuple(self._versions[i] for i in indexes)
+
+    @property
+    def clone_versions(self) -> tuple:
+        return self.get_versions(self._clone_indexes)
+
+    @property
+    def similar_versions(self) -> tuple:
+        return self.get_versions(self._similar_indexes)
+
+    @property
+    def partly_similar_versions(self) -> tuple:
+        return self.get_versions(self._partly_similar_indexes)
+
+    @property
+    def difference_versions(self) -> tuple:
+        return self.get_versions(self._difference_indexes)
+
+    @property
+    def partly_similar_submatrix(self) -> np.ndarray:
+        """
+        Normed connectivity matrix between partly similar versions only
+        :return: (m, m) array, where m is partly similar versions amount
+        """
+        return self._connectivity_matrix[
+            np.ix_(self._partly_similar_indexes, self._partly_similar_indexes)
+        ]
+
+    def partly_similar_dependency(self, diversities) -> tuple:
+        """
+        Split partly similar versions into depended and independent ones for every diversity level. A version is
+        depended, if its distance to any other version of the group is not less than the diversity level, and
+        independent, if its distance to any other version is less than it, so a version can be both
+        :param diversities: Diversity level or array of iterations diversity levels
+        :return: (depended, independent) tuple of boolean arrays with shape (*diversities.shape, m), where m is
+        partly similar versions amount
+        """
+        diversities = np.asarray(diversities, dtype=float)[..., None]
+        return (
+            self._partly_similar_max_distances >= diversities,
+            self._partly_similar_min_distances < diversities,
+        )
+
+    def __iter__(self):
+        # Позволяет распаковывать группировку так же, как раньше распаковывался кортеж из 4-х множеств версий
+        return iter(
+            (
+                self.clone_versions,
+                self.similar_versions,
+                self.partly_similar_versions,
+                self.difference_versions,
+            )
+        )
+
+    def __str__(self):
+        return (
+            f"clone: {self._clone_indexes.tolist()}; similar: {self._similar_indexes.tolist()}; "
+            f"partly similar: {self._partly_similar_indexes.tolist()}; "
+            f"difference: {self._difference_indexes.tolist()}"
+        )
@@ -24,6 +24,7 @@ class VoteAlgorithm:
         self._id = new_id
         self._vote_module = None
         self._vote_algorithm = None
+        self._vote_batch_algorithm = None
         self._vote_result: list[dict] = []
 
         try:
@@ -38,6 +39,9 @@ class VoteAlgorithm:
                     f"There is no function {vote_func_name} in {module_name}"
                 )
             self._vote_algorithm = getattr(self._vote_module, vote_func_name)
+            self._vote_batch_algorithm = getattr(
+                self._vote_module, f"{vote_func_name}_batch", None
+            )
         except ModuleNotFoundError as e:
             raise e
         except Exception as e:
@@ -51,6 +55,11 @@ class VoteAlgorithm:
     @vote_algorithm.setter
     def vote_algorithm(self, vote_func):
         self._vote_algorithm = vote_func
+        self._vote_batch_algorithm = None
+
+    @property
+    def vote_batch_algorithm(self):
+        return self._vote_batch_algorithm
 
     @property
     def vote_results(self):
@@ -0,0 +1,123 @@
+import json
+
+from InterfaceAdapters.data_base_connector import DBConnector
+from VoteAnalysisCleanArchitecture.Entities.campaign import (
+    Campaign,
+    CampaignJob,
+    CampaignJobStatus,
+)
+
+
+class CampaignRepository:
+    """
+    Campaign jobs progress is kept in data base, so interrupted campaign is resumed from its first unfinished job
+    """
+
+    def __init__(self, campaign: Campaign):
+        self.dbConnector = DBConnector("experiment.db")
+        self.campaign = campaign
+
+    def create_campaign_tables(self):
+        if not self.dbConnector.table_exists("campaign"):
+            create_query = """
+                create table campaign (
+                    id integer primary key autoincrement not null,
+                    name varchar(255) not null unique,
+                    spec text not null
+                );
+            """
+            self.dbConnector.execute_query(create_query, [], True, False)
+        if not self.dbConnector.table_exists("campaign_job"):
+            create_query = """
+                create table campaign_job (
+                    id integer primary key autoincrement not null,
+                    campaign_id integer not null,
+                    job_num integer not null,
+                    experiment_name varchar(255) not null,
+                    versions_amount integer not null,
+                    reliability_interval varchar(255) not null,
+                    diversities_intervals varchar(1024) not null,
+                    seed integer not null,
+                    module_id integer null,
+                    status varchar(15) not null,
+                    unique(campaign_id, job_num),
+                    foreign key ("campaign_id") references campaign(id),
+                    foreign key ("module_id") references module(id)
+                );
+            """
+            self.dbConnector.execute_query(create_query, [], True, False)
+
+    def save_campaign(self):
+        """
+        Save new campaign with its jobs or load jobs progress of the campaign with the same name, which was saved
+        before
+        """
+        self.create_campaign_tables()
+        campaign_res = self.dbConnector.execute_query(
+            f"select id, spec from campaign where name = '{self.campaign.name}';"
+        )
+        if len(campaign_res) > 0:
+            # Сохранённые задания продолжаются, только если кампания не изменилась, иначе их результаты не совпадут
+            if campaign_res[0][1] != self.campaign.spec:
+                raise ValueError(
+                    f"Campaign {self.campaign.name} was started with another spec. Give the changed campaign a new name"
+                )
+            self.campaign._id = campaign_res[0][0]
+            self.campaign.jobs = self.load_jobs()
+            return
+        self.campaign._id = self.dbConnector.execute_query(
+            "insert into campaign (name, spec) values (?, ?);",
+            [(self.campaign.name, self.campaign.spec)],
+            True,
+        )[0][0]
+        self.dbConnector.execute_query(
+            """
+                insert into campaign_job (campaign_id, job_num, experiment_name, versions_amount,
+                reliability_interval, diversities_intervals, seed, module_id, status)
+                values (?, ?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            [
+                (
+                    self.campaign.id,
+                    job.job_num,
+                    job.experiment_name,
+                    job.versions_amount,
+                    json.dumps(job.reliability_interval),
+                    json.dumps(job.diversities_intervals),
+                    job.seed,
+                    job.module_id,
+                    job.status.value,
+                )
+                for job in self.campaign.jobs
+            ],
+            True,
+            False,
+        )
+        self.campaign.jobs = self.load_jobs()
+
+    def load_jobs(self) -> list[CampaignJob]:
+        select_query = f"""
+            select id, job_num, experiment_name, versions_amount, reliability_interval, diversities_intervals,
+            seed, module_id, status from campaign_job where campaign_id = {self.campaign.id} order by job_num;
+        """
+        return [
+            CampaignJob(
+                res[1],
+                res[2],
+                res[3],
+                json.loads(res[4]),
+                json.loads(res[5]),
+                res[6],
+                res[7],
+                CampaignJobStatus(res[8]),
+                res[0],
+            )
+            for res in self.dbConnector.execute_query(select_query)
+        ]
+
+    def save_job(self, job: CampaignJob):
+        update_query = f"""
+            update campaign_job set module_id = {'null' if job.module_id is None else job.module_id},
+            status = '{job.status.value}' where id = {job.id};
+        """
+        self.dbConnector.execute_query(update_query, [], True, False)
@@ -1,4 +1,8 @@
 import sqlite3
+import time
+from itertools import islice
+
+BULK_INSERT_CHUNK_SIZE = 50000
 
 
 class DBConnectorMeta(type):
@@ -15,6 +19,7 @@ class DBConnector(metaclass=DBConnectorMeta):
     def __init__(self, db_name: str):
         self._db_name = db_name
         self._connection = sqlite3.connect(self._db_name)
+        self._tune_connection()
 
     @property
     def db_name(self) -> str:
@@ -26,6 +31,11 @@ class DBConnector(metaclass=DBConnectorMeta):
 
     def connect_2_db(self):
         self._connection = sqlite3.connect(self._db_name)
+        self._tune_connection()
+
+    def _tune_connection(self):
+        self._connection.execute("PRAGMA journal_mode=WAL;")
+        self._connection.execute("PRAGMA synchronous=NORMAL;")
 
     def execute_query(
         self, query_str, parameters=[], commit=False, return_query_set=True
@@ -60,9 +70,67 @@ class DBConnector(metaclass=DBConnectorMeta):
         cursor.close()
         return result
 
+    def bulk_insert(
+        self,
+        query_str,
+        rows,
+        index_queries=(),
+        chunk_size=BULK_INSERT_CHUNK_SIZE,
+        report=False,
+    ) -> int:
+        """
+        It inserts many rows in one transaction. Rows are taken from iterable chunk by chunk, so they can be
+        generated on the fly instead of keeping all of them in memory
+        :param query_str: SQL-query string for insertion
+        :param rows: iterable of query parameters tuples
+        :param index_queries: index creation queries, which are executed after all rows are inserted
+        :param chunk_size: Amount of rows passed into one executemany call
+        :param report: Print insertion rate. Callers, which insert one operation rows in several calls, print it
+        once by print_insert_rate
+        :return: Amount of inserted rows
+        """
+        rows_iter = iter(rows)
+        rows_amount = 0
+        start_time = time.perf_counter()
+        cursor = self._connection.cursor()
+        try:
+            if not self._connection.in_transaction:
+                cursor.execute("BEGIN;")
+            while rows_chunk := list(islice(rows_iter, chunk_size)):
+                cursor.executemany(query_str, rows_chunk)
+                rows_amount += len(rows_chunk)
+            for index_query in index_queries:
+                cursor.execute(index_query)
+            self._connection.commit()
+        except sqlite3.Error:
+            self._connection.rollback()
+            raise
+        finally:
+            cursor.close()
+        if report:
+            self.print_insert_rate(
+                rows_amount, time.perf_counter() - start_time
+            )
+        return rows_amount
+
+    @staticmethod
+    def print_insert_rate(rows_amount: int, elapsed_time: float):
+        print(
+            f"{rows_amount} rows were inserted in {round(elapsed_time, 2)} s "
+            f"({round(rows_amount / max(elapsed_time, 1e-9))} rows per second)"
+        )
+
     def table_exists(self, table_name: str) -> bool:
         check_query = f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}';"
         return bool(self.execute_query(check_query))
 
+    def table_columns(self, table_name: str) -> list[str]:
+        return [
+            column[1]
+            for column in self.execute_query(
+                f"PRAGMA table_info('{table_name}');"
+            )
+        ]
+
     def __str__(self):
         return f"{self._db_name} – {str(self._connection)}"
@@ -0,0 +1,330 @@
+import numpy as np
+
+from InterfaceAdapters.data_base_connector import DBConnector
+from InterfaceAdapters.nmodule_repository import NModuleRepository
+from UseCases.random_streams import ITERATIONS_CHUNK_SIZE
+from VoteAnalysisCleanArchitecture.Entities.experiment_analysis import (
+    AlgorithmAnalysis,
+    CORRECT_ANSWER_TOLERANCE,
+    VersionAnalysis,
+)
+
+
+class ExperimentAnalysisRepository:
+    """
+    Experiment data and vote results read as arrays page by page of whole iterations, so NResult objects are never
+    built and the whole experiment is never kept in memory. Analysis is saved as running aggregates, so the next
+    analysis reads only iterations and vote results, which were added after it
+    """
+
+    def __init__(self, tolerance: float = CORRECT_ANSWER_TOLERANCE):
+        self.dbConnector = DBConnector("experiment.db")
+        self.tolerance = tolerance
+
+    def get_experiment_id(self, experiment_name: str) -> int:
+        if not self.dbConnector.table_exists("experiment_data"):
+            raise LookupError(
+                f'There is no "EXPERIMENT_DATA" table in {self.dbConnector.db_name} data base. Save experiment data before analyse it'
+            )
+        NModuleRepository(None).create_experiment_tables()
+        self.create_analysis_tables()
+        experiment_res = self.dbConnector.execute_query(
+            f"select id from experiment where name = '{experiment_name}';"
+        )
+        if len(experiment_res) == 0:
+            raise LookupError(
+                f"There is no experiment {experiment_name} in {self.dbConnector.db_name} data base"
+            )
+        return experiment_res[0][0]
+
+    def create_analysis_tables(self):
+        # Анализ хранится суммами и количествами, к которым прибавляются только новые итерации и результаты
+        # голосования. Суммы верны лишь для той погрешности, с которой они посчитаны
+        if not self.dbConnector.table_exists("algorithm_analysis"):
+            create_query = """
+                create table algorithm_analysis (
+                    id integer primary key autoincrement not null,
+                    algorithm_id integer not null,
+                    experiment_id integer not null,
+                    tolerance real not null,
+                    last_vote_result_id integer not null,
+                    iterations_amount integer not null,
+                    correct_amount integer not null,
+                    no_answer_amount integer not null,
+                    error_sum real not null,
+                    error_square_sum real not null,
+                    max_error real not null,
+                    tie_amount integer not null,
+                    tie_correct_amount integer not null,
+                    unique(algorithm_id, experiment_id) on conflict replace,
+                    foreign key ("algorithm_id") references algorithm(id),
+                    foreign key ("experiment_id") references experiment(id)
+                );
+            """
+            self.dbConnector.execute_query(create_query, [], True, False)
+        if not self.dbConnector.table_exists("version_analysis"):
+            create_query = """
+                create table version_analysis (
+                    id integer primary key autoincrement not null,
+                    experiment_id integer not null,
+                    version_id integer not null,
+                    tolerance real not null,
+                    last_iteration_num integer not null,
+                    answers_amount integer not null,
+                    errors_amount integer not null,
+                    error_sum real not null,
+                    unique(experiment_id, version_id) on conflict replace,
+                    foreign key ("experiment_id") references experiment(id),
+                    foreign key ("version_id") references version(id)
+                );
+            """
+            self.dbConnector.execute_query(create_query, [], True, False)
+
+    def get_last_vote_result_id(self) -> int:
+        if not self.dbConnector.table_exists("vote_result"):
+            return 0
+        return self.dbConnector.execute_query(
+            "select coalesce(max(id), 0) from vote_result;"
+        )[0][0]
+
+    def is_analysis_actual(
+        self, algorithm_analysis: AlgorithmAnalysis, experiment_id: int
+    ) -> bool:
+        # Повторное голосование по итерации заменяет её старый результат новой строкой. Если какой-то из учтённых
+        # результатов заменён, то суммы анализа уже нельзя исправить, и алгоритм анализируется заново
+        select_query = f"""
+            select count(*) from vote_result where algorithm_id = {algorithm_analysis.algorithm_id}
+            and experiment_id = {experiment_id} and id <= {algorithm_analysis.last_vote_result_id};
+        """
+        return (
+            self.dbConnector.execute_query(select_query)[0][0]
+            == algorithm_analysis.iterations_amount
+        )
+
+    def get_algorithms_analysis(
+        self, experiment_id: int, experiment_name: str
+    ) -> list[AlgorithmAnalysis]:
+        """
+        Load saved analysis of every vote algorithm, which voted over the experiment. Algorithms without actual
+        saved analysis get empty one
+        :param experiment_id: Experiment id
+        :param experiment_name: Experiment name
+        :return: list of AlgorithmAnalysis objects
+        """
+        if not self.dbConnector.table_exists("vote_result"):
+            return []
+        select_query = f"""
+            select a.id, a.name, s.iterations_amount, s.correct_amount, s.no_answer_amount, s.error_sum,
+            s.error_square_sum, s.max_error, s.tie_amount, s.tie_correct_amount, s.last_vote_result_id
+            from algorithm a left join algorithm_analysis s on s.algorithm_id = a.id
+            and s.experiment_id = {experiment_id} and s.tolerance = {self.tolerance} where exists (
+                select 1 from vote_result v where v.algorithm_id = a.id and v.experiment_id = {experiment_id}
+            ) order by a.id;
+        """
+        algorithms_analysis = []
+        for res in self.dbConnector.execute_query(select_query):
+            algorithm_analysis = AlgorithmAnalysis(
+                res[0], res[1], experiment_name
+            )
+            if res[2] is not None:
+                saved_analysis = AlgorithmAnalysis(
+                    res[0], res[1], experiment_name, *res[2:]
+                )
+                if self.is_analysis_actual(saved_analysis, experiment_id):
+                    algorithm_analysis = saved_analysis
+            algorithms_analysis.append(algorithm_analysis)
+        return algorithms_analysis
+
+    def get_versions_analysis(
+        self, experiment_id: int
+    ) -> list[VersionAnalysis]:
+        """
+        Load saved analysis of every experiment version in the order of versions ids.
+        If saved analysis of versions does not cover the same iterations, all versions get empty one
+        :param experiment_id: Experiment id
+        :return: list of VersionAnalysis objects
+        """
+        select_query = f"""
+            select ev.version_id, ev.version_name, ev.version_reliability, s.answers_amount, s.errors_amount,
+            s.error_sum, s.last_iteration_num from experiment_version ev left join version_analysis s
+            on s.experiment_id = ev.experiment_id and s.version_id = ev.version_id and s.tolerance = {self.tolerance}
+            where ev.experiment_id = {experiment_id} order by ev.version_id;
+        """
+        versions_res = self.dbConnector.execute_query(select_query)
+        if len({res[6] for res in versions_res}) == 1 and all(
+            res[6] is not None for res in versions_res
+        ):
+            return [VersionAnalysis(*res) for res in versions_res]
+        return [VersionAnalysis(*res[:3]) for res in versions_res]
+
+    def save_analysis(
+        self,
+        experiment_id: int,
+        algorithms_analysis: list[AlgorithmAnalysis],
+        versions_analysis: list[VersionAnalysis],
+    ):
+        algorithms_rows = [
+            (
+                analysis.algorithm_id,
+                experiment_id,
+                self.tolerance,
+                analysis.last_vote_result_id,
+                analysis.iterations_amount,
+                analysis.correct_amount,
+                analysis.no_answer_amount,
+                analysis.error_sum,
+                analysis.error_square_sum,
+                analysis.max_error,
+                analysis.tie_amount,
+                analysis.tie_correct_amount,
+            )
+            for analysis in algorithms_analysis
+        ]
+        versions_rows = [
+            (
+                experiment_id,
+                analysis.version_id,
+                self.tolerance,
+                analysis.last_iteration_num,
+                analysis.answers_amount,
+                analysis.errors_amount,
+                analysis.error_sum,
+            )
+            for analysis in versions_analysis
+        ]
+        # Пустой список параметров выполнил бы запрос на вставку без параметров, поэтому пустые анализы не
+        # сохраняются: у эксперимента без результатов голосования нет анализа алгоритмов
+        if len(algorithms_rows) > 0:
+            self.dbConnector.execute_query(
+                """
+                    insert into algorithm_analysis (algorithm_id, experiment_id, tolerance, last_vote_result_id,
+                    iterations_amount, correct_amount, no_answer_amount, error_sum, error_square_sum, max_error,
+                    tie_amount, tie_correct_amount) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                """,
+                algorithms_rows,
+                True,
+                False,
+            )
+        if len(versions_rows) > 0:
+            self.dbConnector.execute_query(
+                """
+                    insert into version_analysis (experiment_id, version_id, tolerance, last_iteration_num,
+                    answers_amount, errors_amount, error_sum) values (?, ?, ?, ?, ?, ?, ?);
+                """,
+                versions_rows,
+                True,
+                False,
+            )
+
+    def get_vote_answers(
+        self,
+        algorithm_analysis: AlgorithmAnalysis,
+        experiment_id: int,
+        first_iteration: int,
+        last_iteration: int,
+        last_vote_result_id: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        select_query = f"""
+            select module_iteration_num, vote_answer from vote_result
+            where algorithm_id = {algorithm_analysis.algorithm_id} and experiment_id = {experiment_id}
+            and module_iteration_num between {first_iteration} and {last_iteration}
+            and id > {algorithm_analysis.last_vote_result_id} and id <= {last_vote_result_id}
+            order by module_iteration_num;
+        """
+        vote_res = self.dbConnector.execute_query(select_query)
+        return (
+            np.array([res[0] for res in vote_res], dtype=np.int64),
+            np.array([res[1] for res in vote_res], dtype=float),
+        )
+
+    def get_first_new_vote_iteration(
+        self,
+        algorithm_analysis: AlgorithmAnalysis,
+        experiment_id: int,
+        last_vote_result_id: int,
+    ) -> int | None:
+        select_query = f"""
+            select min(module_iteration_num) from vote_result
+            where algorithm_id = {algorithm_analysis.algorithm_id} and experiment_id = {experiment_id}
+            and id > {algorithm_analysis.last_vote_result_id} and id <= {last_vote_result_id};
+        """
+        return self.dbConnector.execute_query(select_query)[0][0]
+
+    def experiment_pages(
+        self,
+        experiment_id: int,
+        algorithms_analysis: list[AlgorithmAnalysis],
+        versions_analysis: list[VersionAnalysis],
+        last_vote_result_id: int,
+        page_iterations: int = ITERATIONS_CHUNK_SIZE,
+    ):
+        """
+        Read experiment answers and vote answers, which are not added into analysis yet, page by page. Vote
+        results added after last_vote_result_id are left for the next analysis
+        :param experiment_id: Experiment id
+        :param algorithms_analysis: Saved analysis of algorithms, which vote answers are read
+        :param versions_analysis: Saved analysis of experiment versions in the order of versions ids
+        :param last_vote_result_id: Id of the last vote result, which is read
+        :param page_iterations: Amount of iterations in one page
+        :return: generator of (iterations numbers, correct answers, versions answers, answers versions positions in
+        versions_analysis, iterations first answers positions, dict of algorithm id: (iterations numbers, vote
+        answers)) tuples
+        """
+        if len(versions_analysis) == 0:
+            return
+        version_ids = np.array(
+            [
+                version_analysis.version_id
+                for version_analysis in versions_analysis
+            ],
+            dtype=np.int64,
+        )
+        # Итерации читаются с первой, которая не учтена в анализе версий или нужна новым результатам голосования
+        first_iterations = [versions_analysis[0].last_iteration_num + 1]
+        new_algorithms_analysis = []
+        for algorithm_analysis in algorithms_analysis:
+            first_new_iteration = self.get_first_new_vote_iteration(
+                algorithm_analysis, experiment_id, last_vote_result_id
+            )
+            if first_new_iteration is not None:
+                first_iterations.append(first_new_iteration)
+                new_algorithms_analysis.append(algorithm_analysis)
+        first_iteration = min(first_iterations)
+        # Страница ограничена номерами итераций, поэтому содержит только целые итерации
+        iteration_bounds = NModuleRepository(None).experiment_iteration_bounds(
+            experiment_id, page_iterations, first_iteration
+        )
+        for page_first_iteration, page_last_iteration in iteration_bounds:
+            select_query = f"""
+                select module_iteration_num, correct_answer, version_id, version_answer from experiment_data
+                where experiment_id = {experiment_id}
+                and module_iteration_num between {page_first_iteration} and {page_last_iteration}
+                order by module_iteration_num, version_id;
+            """
+            rows = self.dbConnector.execute_query(select_query)
+            if len(rows) == 0:
+                continue
+            page = np.array(rows, dtype=float)
+            # Число ответов в итерациях может различаться, поэтому страница делится на итерации по их номерам
+            iteration_nums, iteration_starts = np.unique(
+                page[:, 0].astype(np.int64), return_index=True
+            )
+            yield (
+                iteration_nums,
+                page[iteration_starts, 1],
+                page[:, 3],
+                np.searchsorted(version_ids, page[:, 2].astype(np.int64)),
+                iteration_starts,
+                {
+                    algorithm_analysis.algorithm_id: self.get_vote_answers(
+                        algorithm_analysis,
+                        experiment_id,
+                        iteration_nums[0],
+                        iteration_nums[-1],
+                        last_vote_result_id,
+                    )
+                    for algorithm_analysis in new_algorithms_analysis
+                },
+            )
+        for algorithm_analysis in new_algorithms_analysis:
+            algorithm_analysis.last_vote_result_id = last_vote_result_id
@@ -1,10 +1,14 @@
 import json
+from itertools import chain
 
-from VoteAnalysisCleanArchitecture.Entities.n_result import NResult
+from VoteAnalysisCleanArchitecture.Entities.experiment_results import (
+    ExperimentResults,
+)
 from VoteAnalysisCleanArchitecture.Entities.n_module import NModule, input_num
 from VoteAnalysisCleanArchitecture.Entities.n_version import NVersion
 from InterfaceAdapters.data_base_connector import DBConnector
 from InterfaceAdapters.nversion_repository import NVersionRepository
+from UseCases.random_streams import ITERATIONS_CHUNK_SIZE
 
 
 class NModuleRepository:
@@ -13,11 +17,7 @@ class NModuleRepository:
         self.module = module
 
     def get_version_by_id(self, id_4_search: int) -> NVersion | None:
-        for cur_ver in self.module.versions_list:
-            if cur_ver.id is not None and cur_ver.id == id_4_search:
-                return cur_ver
-        else:
-            return None
+        return self.module.get_version_by_id(id_4_search)
 
     def save_module(self):
         if not self.dbConnector.table_exists("module"):
@@ -63,71 +63,456 @@ class NModuleRepository:
             version_rep = NVersionRepository(ver)
             version_rep.save(self.module.id)
 
-    def save_experiment_data(self):
+    def save_experiment_data(self, load_ids: bool | None = None):
+        """
+        Save generated experiment data, which is kept in module
+        :param load_ids: Load ids of saved data. User is asked about it, if None
+        """
         if (
-            not self.module.global_results_lst_2_write
-            or len(self.module.global_results_lst_2_write) == 0
+            not self.module.global_results_lst
+            or len(self.module.global_results_lst) == 0
         ):
             raise LookupError(
                 "There is no experiment data to save into data base"
             )
 
-        if not self.dbConnector.table_exists("experiment_data"):
+        # Обращаемся к первому результату первой итерации для провеки, присвоен ли ему id, чтобы понять, надо ли
+        # сохранять результаты, или они уже сохранены, т.к. можно только перегенерировать их, но не изменить
+        if self.module._global_results_lst[0][0].id is None:
+            self.write_experiment_data(
+                self.module._global_results_lst.module_connectivity_matrix,
+                len(self.module._global_results_lst),
+                self.module._global_results_lst.versions_data,
+                self.module._global_results_lst.iter_answer_rows(),
+            )
+
+            if load_ids is None:
+                load_ids = (
+                    input(
+                        "Do you want to load IDs of saved data? Yes - Y; No - any key"
+                    ).upper()
+                    == "Y"
+                )
+            if load_ids:
+                self.load_experiment_data(self.module._experiment_name)
+
+    def save_experiment_data_stream(
+        self, results_chunks, iterations_amount: int, append: bool = False
+    ):
+        """
+        Save experiment data, which is generated while it is written, so the whole run is never kept in memory
+        :param results_chunks: iterable of ExperimentResults objects returned by DataGenerator.stream_experiment_data
+        :param iterations_amount: Iterations amount of the experiment together with already saved iterations
+        :param append: Add iterations to the saved experiment and keep its data, vote results and analysis
+        """
+        if any(ver.id is None for ver in self.module.versions_list):
+            raise LookupError(
+                "Save module with versions before writing experiment data into data base"
+            )
+        self.write_experiment_data(
+            self.module.normed_connectivity_matrix,
+            iterations_amount,
+            [
+                (
+                    ver.id,
+                    ver.name,
+                    ver.reliability,
+                    ver.common_coordinates_list,
+                )
+                for ver in self.module.versions_list
+            ],
+            chain.from_iterable(
+                results_chunk.iter_answer_rows()
+                for results_chunk in results_chunks
+            ),
+            append,
+        )
+
+    def write_experiment_data(
+        self,
+        connectivity_matrix,
+        iterations_amount: int,
+        versions_data,
+        answer_rows,
+        append: bool = False,
+    ):
+        self.create_experiment_tables()
+        experiment_id = self.save_experiment_info(
+            connectivity_matrix, iterations_amount
+        )
+        # Перегенерированный эксперимент с тем же именем полностью заменяет ранее сохранённые данные вместе с их
+        # анализом. Добавленные итерации продолжают эксперимент, поэтому его данные и анализ остаются
+        table_names = (
+            ()
+            if append
+            else (
+                "vote_result",
+                "algorithm_analysis",
+                "version_analysis",
+                "experiment_data",
+                "experiment_version",
+            )
+        )
+        for table_name in table_names:
+            if self.dbConnector.table_exists(table_name):
+                self.dbConnector.execute_query(
+                    f"delete from {table_name} where experiment_id = {experiment_id};",
+                    [],
+                    False,
+                    False,
+                )
+        insert_query = """
+            insert into experiment_version (experiment_id, version_id, version_name, version_reliability, 
+            version_common_coordinates) values (?,?,?,?,?);
+        """
+        self.dbConnector.execute_query(
+            insert_query,
+            [
+                (
+                    experiment_id,
+                    v_id,
+                    v_name,
+                    v_reliability,
+                    json.dumps({"version_coordinates": v_coordinates}),
+                )
+                for v_id, v_name, v_reliability, v_coordinates in versions_data
+            ],
+            False,
+            False,
+        )
+        insert_query = """
+            insert into experiment_data (experiment_id, version_id, version_answer, correct_answer, 
+            module_iteration_num) values (?,?,?,?,?);
+        """
+        # Строки ответов формируются по мере вставки, а не собираются заранее в общий список. Данные эксперимента
+        # выбираются по его id и упорядочиваются по номеру итерации, поэтому индекс для них строится после вставки
+        self.dbConnector.bulk_insert(
+            insert_query,
+            ((experiment_id, *row) for row in answer_rows),
+            (self.experiment_data_index_query(),),
+            report=True,
+        )
+
+    def create_experiment_tables(self):
+        # Матрица связности модуля хранится один раз на эксперимент, координаты версий - один раз на версию
+        # эксперимента, а в строках ответов только идентификаторы и числа
+        if not self.dbConnector.table_exists("experiment"):
             create_query = """
-                create table experiment_data (
-                    "id" integer primary key autoincrement not null, 
-                    version_id integer not null, version_name varchar(255), 
-                    version_reliability real not null, 
-                    version_common_coordinates varchar(1024) not null, 
-                    version_answer real not null, 
-                    correct_answer real not null, 
-                    module_id integer not null, module_name varchar(255), 
-                    module_connectivity_matrix varchar(4095), 
-                    module_iteration_num int not null, 
-                    experiment_name varchar(31) not null, 
-                    unique(version_id, version_reliability, version_common_coordinates, 
-                    version_answer, correct_answer, module_id, module_connectivity_matrix, 
-                    module_iteration_num) on conflict replace, 
-                    foreign key ("version_id") references version(id), 
+                create table experiment (
+                    "id" integer primary key autoincrement not null,
+                    "name" varchar(31) not null unique,
+                    "module_id" integer null,
+                    "module_name" varchar(255) null,
+                    "connectivity_matrix" text null,
+                    "seed" integer null,
+                    "chunk_size" integer not null,
+                    "iterations_amount" integer not null,
+                    "batch" integer null,
                     foreign key ("module_id") references module(id)
                 );
             """
             self.dbConnector.execute_query(create_query, [], True, False)
-        # Обращаемся к первому результату первой итерации для провеки, присвоен ли ему id, чтобы понять, надо ли
-        # сохранять результаты, или они уже сохранены, т.к. можно только перегенерировать их, но не изменить
-        if self.module._global_results_lst[0][0].id is None:
-            insert_query = """
-                insert into experiment_data (version_id, version_name, version_reliability, 
-                version_common_coordinates, version_answer, correct_answer, module_id, module_name, 
-                module_connectivity_matrix, module_iteration_num, experiment_name) values (
-                    ?,?,?,?,?,?,?,?,?,?,?
+        else:
+            experiment_columns = self.dbConnector.table_columns("experiment")
+            for column_name, column_type in (
+                ("module_name", "varchar(255)"),
+                ("connectivity_matrix", "text"),
+                ("batch", "integer"),
+            ):
+                if column_name not in experiment_columns:
+                    self.dbConnector.execute_query(
+                        f'alter table experiment add column "{column_name}" {column_type} null;',
+                        [],
+                        True,
+                        False,
+                    )
+        if not self.dbConnector.table_exists("experiment_version"):
+            create_query = """
+                create table experiment_version (
+                    "id" integer primary key autoincrement not null,
+                    experiment_id integer not null,
+                    version_id integer not null, version_name varchar(255),
+                    version_reliability real not null,
+                    version_common_coordinates varchar(1024) not null,
+                    unique(experiment_id, version_id) on conflict replace,
+                    foreign key ("experiment_id") references experiment(id),
+                    foreign key ("version_id") references version(id)
                 );
             """
+            self.dbConnector.execute_query(create_query, [], True, False)
+        if not self.dbConnector.table_exists("experiment_data"):
             self.dbConnector.execute_query(
-                insert_query,
-                self.module.global_results_lst_2_write,
+                self.experiment_data_create_query("experiment_data"),
+                [],
                 True,
                 False,
             )
+        elif "module_connectivity_matrix" in self.dbConnector.table_columns(
+            "experiment_data"
+        ):
+            self.migrate_experiment_data()
+        # Результаты голосования ссылаются на итерации эксперимента, поэтому их таблица переводится на новую схему
+        # вместе с таблицами эксперимента
+        if self.dbConnector.table_exists("vote_result") and (
+            "experiment_data_id"
+            in self.dbConnector.table_columns("vote_result")
+        ):
+            self.migrate_vote_result()
 
-            if (
-                input(
-                    "Do you want to load IDs of saved data? Yes - Y; No - any key"
-                ).upper()
-                == "Y"
-            ):
-                self.load_experiment_data(self.module._experiment_name)
+    @staticmethod
+    def experiment_data_create_query(table_name: str) -> str:
+        return f"""
+            create table {table_name} (
+                "id" integer primary key autoincrement not null,
+                experiment_id integer not null,
+                version_id integer not null,
+                version_answer real not null,
+                correct_answer real not null,
+                module_iteration_num int not null,
+                foreign key ("experiment_id") references experiment(id),
+                foreign key ("version_id") references version(id)
+            );
+        """
 
-    def load_experiment_data(self, experiment_name: str = None):
+    @staticmethod
+    def experiment_data_index_query() -> str:
+        return """
+            create index if not exists experiment_data_iteration_idx 
+            on experiment_data (experiment_id, module_iteration_num, version_id);
+        """
+
+    @staticmethod
+    def vote_result_create_query(table_name: str) -> str:
+        # Все версии итерации получают один и тот же результат голосования, поэтому он хранится один раз на итерацию
+        return f"""
+            create table {table_name} (
+                id integer primary key autoincrement not null,
+                algorithm_id integer not null,
+                experiment_id integer not null,
+                module_iteration_num integer not null,
+                vote_answer real null,
+                unique(algorithm_id, experiment_id, module_iteration_num) on conflict replace,
+                foreign key ("algorithm_id") references algorithm(id),
+                foreign key ("experiment_id") references experiment(id)
+            );
+        """
+
+    def migrate_vote_result(self):
+        # Старые строки результатов голосования хранились для каждого ответа версии. Из строк одной итерации
+        # остаётся последняя добавленная
+        print("Vote results are migrating to the new data base schema...")
+        migration_queries = [
+            self.vote_result_create_query("vote_result_new"),
+            """
+                insert into vote_result_new (algorithm_id, experiment_id, module_iteration_num, vote_answer) 
+                select v.algorithm_id, d.experiment_id, d.module_iteration_num, v.vote_answer from vote_result v 
+                join experiment_data d on d.id = v.experiment_data_id where v.id in (
+                    select max(v.id) from vote_result v join experiment_data d on d.id = v.experiment_data_id 
+                    group by v.algorithm_id, d.experiment_id, d.module_iteration_num
+                ) order by v.id;
+            """,
+            "drop table vote_result;",
+            "alter table vote_result_new rename to vote_result;",
+        ]
+        for query_num, query in enumerate(migration_queries, 1):
+            self.dbConnector.execute_query(
+                query, [], query_num == len(migration_queries), False
+            )
+
+    def migrate_experiment_data(self):
+        # В старой схеме каждая строка ответа хранила имя эксперимента, данные модуля с матрицей связности и
+        # координаты версии. Данные переносятся в новые таблицы с сохранением id строк, т.к. на них ссылаются
+        # результаты голосования. Новая таблица создаётся рядом и переименовывается после удаления старой, чтобы
+        # ссылки из vote_result остались на experiment_data
+        print("Experiment data is migrating to the new data base schema...")
+        migration_queries = [
+            self.experiment_data_create_query("experiment_data_new"),
+            f"""
+                insert into experiment (name, module_id, module_name, connectivity_matrix, chunk_size, 
+                iterations_amount) select experiment_name, module_id, module_name, module_connectivity_matrix, 
+                {ITERATIONS_CHUNK_SIZE}, count(distinct module_iteration_num) from experiment_data 
+                where experiment_name not in (select name from experiment) group by experiment_name;
+            """,
+            """
+                update experiment set 
+                module_name = (select module_name from experiment_data where experiment_name = experiment.name), 
+                connectivity_matrix = (
+                    select module_connectivity_matrix from experiment_data where experiment_name = experiment.name
+                ) where connectivity_matrix is null;
+            """,
+            """
+                insert into experiment_version (experiment_id, version_id, version_name, version_reliability, 
+                version_common_coordinates) select e.id, d.version_id, d.version_name, d.version_reliability, 
+                d.version_common_coordinates from experiment_data d join experiment e on e.name = d.experiment_name 
+                group by e.id, d.version_id;
+            """,
+            """
+                insert into experiment_data_new (id, experiment_id, version_id, version_answer, correct_answer, 
+                module_iteration_num) select d.id, e.id, d.version_id, d.version_answer, d.correct_answer, 
+                d.module_iteration_num from experiment_data d join experiment e on e.name = d.experiment_name 
+                order by d.id;
+            """,
+            "drop table experiment_data;",
+            "alter table experiment_data_new rename to experiment_data;",
+            self.experiment_data_index_query(),
+        ]
+        for query_num, query in enumerate(migration_queries, 1):
+            self.dbConnector.execute_query(
+                query, [], query_num == len(migration_queries), False
+            )
+
+    def save_experiment_info(
+        self, connectivity_matrix, iterations_amount: int
+    ) -> int:
+        # Сид, размер куска итераций и способ генерации однозначно определяют сгенерированные данные эксперимента
+        insert_query = """
+            insert into experiment (name, module_id, module_name, connectivity_matrix, seed, chunk_size, 
+            iterations_amount, batch) values (?,?,?,?,?,?,?,?)
+            on conflict(name) do update set module_id = excluded.module_id, module_name = excluded.module_name, 
+            connectivity_matrix = excluded.connectivity_matrix, seed = excluded.seed, 
+            chunk_size = excluded.chunk_size, iterations_amount = excluded.iterations_amount, batch = excluded.batch;
+        """
+        self.dbConnector.execute_query(
+            insert_query,
+            [
+                (
+                    self.module._experiment_name,
+                    self.module.id,
+                    self.module.name,
+                    json.dumps({"connectivity_matrix": connectivity_matrix}),
+                    self.module._experiment_seed,
+                    ITERATIONS_CHUNK_SIZE,
+                    iterations_amount,
+                    int(self.module._experiment_batch),
+                )
+            ],
+            False,
+            False,
+        )
+        return self.dbConnector.execute_query(
+            f"select id from experiment where name = '{self.module._experiment_name}';"
+        )[0][0]
+
+    def load_experiment_results(self, experiment_name: str):
+        """
+        Load experiment module and versions data without versions answers
+        :param experiment_name: Experiment name
+        :return: (experiment id, seed, ExperimentResults object, versions positions by their ids) tuple or None, if
+        there is no experiment with such name
+        """
         if not self.dbConnector.table_exists("experiment_data"):
             raise LookupError(
                 f'There is no "EXPERIMENT_DATA" table in {self.dbConnector.db_name} data base. Save experiment data before load it'
             )
-        can_we_go_further = False
-        if (
-            experiment_name is None
-            and self.module._experiment_name is not None
+        self.create_experiment_tables()
+        select_query = f"""
+            select id, module_id, module_name, connectivity_matrix, seed from experiment 
+            where name = '{experiment_name}';
+        """
+        experiment_res = self.dbConnector.execute_query(select_query)
+        if len(experiment_res) == 0:
+            return None
+        experiment_id, module_id, module_name, connectivity_matrix, seed = experiment_res[0]
+        # Матрица связности и координаты версий декодируются один раз на эксперимент, а не для каждой строки ответа
+        experiment_results = ExperimentResults(
+            module_id,
+            module_name,
+            json.loads(connectivity_matrix)["connectivity_matrix"],
+            experiment_name,
+        )
+        select_query = f"""
+            select version_id, version_name, version_reliability, version_common_coordinates 
+            from experiment_version where experiment_id = {experiment_id} order by id;
+        """
+        version_positions = {
+            res[0]: experiment_results.add_version(
+                res[0],
+                res[1],
+                res[2],
+                json.loads(res[3])["version_coordinates"],
+                self.get_version_by_id(res[0]),
+            )
+            for res in self.dbConnector.execute_query(select_query)
+        }
+        return experiment_id, seed, experiment_results, version_positions
+
+    def experiment_iteration_bounds(
+        self,
+        experiment_id: int,
+        page_iterations: int = ITERATIONS_CHUNK_SIZE,
+        first_iteration: int = None,
+    ):
+        """
+        Split experiment iterations into pages of consecutive iterations numbers. Pages are bounded by iterations
+        numbers instead of rows amount, because a version gives one answer in every versions group it is in
+        :param experiment_id: Experiment id
+        :param page_iterations: Amount of iterations numbers in one page
+        :param first_iteration: Number of the first iteration to read. Iterations are read from the first one, if
+        None
+        :return: generator of (first iteration number, last iteration number) tuples
+        """
+        select_query = f"""
+            select min(module_iteration_num), max(module_iteration_num) from experiment_data
+            where experiment_id = {experiment_id};
+        """
+        bounds_res = self.dbConnector.execute_query(select_query)
+        min_iteration, max_iteration = bounds_res[0]
+        if min_iteration is None:
+            return
+        if first_iteration is not None:
+            min_iteration = max(min_iteration, first_iteration)
+        for page_first_iteration in range(
+            min_iteration, max_iteration + 1, page_iterations
         ):
+            yield page_first_iteration, min(
+                page_first_iteration + page_iterations - 1, max_iteration
+            )
+
+    def experiment_rows_pages(
+        self,
+        experiment_id: int,
+        page_iterations: int = ITERATIONS_CHUNK_SIZE,
+        first_iteration: int = None,
+    ):
+        """
+        Read experiment answers rows page by page. Every page contains only whole iterations
+        :param experiment_id: Experiment id
+        :param page_iterations: Amount of iterations numbers in one page
+        :param first_iteration: Number of the first iteration to read. Iterations are read from the first one, if
+        None
+        :return: generator of (id, version id, version answer, correct answer, iteration number) tuples lists
+        """
+        iteration_bounds = self.experiment_iteration_bounds(
+            experiment_id, page_iterations, first_iteration
+        )
+        for first_iteration, last_iteration in iteration_bounds:
+            select_query = f"""
+                select id, version_id, version_answer, correct_answer, module_iteration_num from experiment_data 
+                where experiment_id = {experiment_id} and module_iteration_num between {first_iteration} 
+                and {last_iteration} order by module_iteration_num, id;
+            """
+            rows = self.dbConnector.execute_query(select_query)
+            if len(rows) > 0:
+                yield rows
+
+    @staticmethod
+    def append_experiment_rows(
+        experiment_results: ExperimentResults,
+        rows: list[tuple],
+        version_positions: dict,
+    ):
+        # Строки одной итерации идут подряд, поэтому итерации определяются по смене её номера
+        experiment_results.append_results(
+            [res[4] for res in rows],
+            [res[3] for res in rows],
+            [res[2] for res in rows],
+            [version_positions[res[1]] for res in rows],
+            [res[0] for res in rows],
+        )
+
+    def load_experiment_data(self, experiment_name: str = None):
+        can_we_go_further = False
+        if experiment_name is None and self.module._experiment_name is not None:
             experiment_name = self.module._experiment_name
             can_we_go_further = True
 
@@ -135,70 +520,106 @@ class NModuleRepository:
             can_we_go_further = True
 
         if can_we_go_further:
-            select_query = f"""
-                select id, version_id, version_name, version_reliability, version_common_coordinates, 
-                version_answer, correct_answer, module_id, module_name, module_connectivity_matrix, 
-                module_iteration_num, experiment_name from experiment_data where experiment_name = '{experiment_name}';
-            """
-            select_res = self.dbConnector.execute_query(select_query)
+            experiment = self.load_experiment_results(experiment_name)
             # Если удалось загрузить данные из БД,
-            if len(select_res) > 0:
+            if experiment is not None:
                 # то очищает имеющиеся списки с результатами для загрузки новых данных
-                self.module._global_results_lst = list()
                 self.module._global_results_lst_2_write = list()
-
-            cur_iter_num = None
-            cur_iter_list = []
-            for res in select_res:
-                # Если это не самая первая итерация и итерация эксперимента сменилась, записываем собранные данные в
-                # глобальный список и очищаем временный список
-                if cur_iter_num is not None and cur_iter_num != res[10]:
-                    self.module._global_results_lst.append(cur_iter_list)
-                    cur_iter_list = list()
-
-                cur_iter_num = res[10]
-                cur_iter_list.append(
-                    NResult(
-                        res[1],
-                        res[2],
-                        res[3],
-                        json.loads(res[4])["version_coordinates"],
-                        res[5],
-                        res[6],
-                        res[7],
-                        res[8],
-                        json.loads(res[9])["connectivity_matrix"],
-                        res[10],
-                        self.get_version_by_id(res[1]),
-                        res[0],
-                        res[11],
+                experiment_id, seed, experiment_results, version_positions = experiment
+                for rows in self.experiment_rows_pages(experiment_id):
+                    self.append_experiment_rows(
+                        experiment_results, rows, version_positions
                     )
-                )
+                self.module._global_results_lst = experiment_results
                 if self.module._experiment_name is None:
-                    self.module._experiment_name = res[11]
-
-            if len(select_res) > 0:
-                # Дозаписываем данные в глобальный массив результатов с последней итерации эксперимента
-                self.module._global_results_lst.append(cur_iter_list)
-
-            self.module._get_global_results_lst_2_write()
+                    self.module._experiment_name = experiment_name
+                self.module._experiment_seed = seed
         else:
             raise ValueError(
                 f"Unexpected value {experiment_name} of experiment_name parameter!"
             )
 
+    def iter_experiment_data(
+        self,
+        experiment_name: str = None,
+        page_iterations: int = ITERATIONS_CHUNK_SIZE,
+        first_iteration: int = None,
+    ):
+        """
+        Load experiment data page by page without keeping the whole experiment in memory. Pages share module and
+        versions data, so it is decoded only once
+        :param experiment_name: Experiment name. Module experiment name is used by default
+        :param page_iterations: Amount of iterations numbers in one page
+        :param first_iteration: Number of the first iteration to load. Iterations are loaded from the first one, if
+        None
+        :return: generator of ExperimentResults objects
+        """
+        if experiment_name is None:
+            experiment_name = self.module._experiment_name
+        if experiment_name is None:
+            raise ValueError(
+                f"Unexpected value {experiment_name} of experiment_name parameter!"
+            )
+        experiment = self.load_experiment_results(experiment_name)
+        if experiment is None:
+            return
+        experiment_id, _, experiment_results, version_positions = experiment
+        for rows in self.experiment_rows_pages(
+            experiment_id, page_iterations, first_iteration
+        ):
+            page = experiment_results.copy_without_results()
+            self.append_experiment_rows(page, rows, version_positions)
+            yield page
+
     def get_experiments_names(self):
         if self.dbConnector.table_exists("experiment_data"):
+            self.create_experiment_tables()
             experiment_select_res = self.dbConnector.execute_query(
-                "select distinct experiment_name from experiment_data;"
+                "select name from experiment order by id;"
             )
             return [exp_name[0] for exp_name in experiment_select_res]
 
-    def load_module(self):
+    def get_experiment_module_id(self, experiment_name: str) -> int:
+        if not self.dbConnector.table_exists("experiment_data"):
+            raise LookupError(
+                f'There is no "EXPERIMENT_DATA" table in {self.dbConnector.db_name} data base. Save experiment data before load it'
+            )
+        self.create_experiment_tables()
+        experiment_res = self.dbConnector.execute_query(
+            f"select module_id from experiment where name = '{experiment_name}';"
+        )
+        if len(experiment_res) == 0:
+            raise LookupError(
+                f"There is no experiment {experiment_name} in {self.dbConnector.db_name} data base"
+            )
+        return experiment_res[0][0]
+
+    def get_experiment_generation(self, experiment_name: str) -> tuple:
+        """
+        Get settings, which saved experiment data was generated with
+        :param experiment_name: Experiment name
+        :return: (module id, seed, chunk size, iterations amount, batch) tuple
+        """
+        self.get_experiment_module_id(experiment_name)
+        module_id, seed, chunk_size, iterations_amount, batch = (
+            self.dbConnector.execute_query(f"""
+                    select module_id, seed, chunk_size, iterations_amount, batch from experiment 
+                    where name = '{experiment_name}';
+                """)[0]
+        )
+        return module_id, seed, chunk_size, iterations_amount, bool(batch)
+
+    def load_module(self, module_id: int = None):
+        """
+        Load module from data base
+        :param module_id: Id of module to load. Module own id is used by default. User chooses module, if both are None
+        """
         if not self.dbConnector.table_exists("module"):
             raise LookupError(
                 f'There is no "MODULE" table in {self.dbConnector.db_name} data base. Save module data before load it.'
             )
+        if module_id is not None:
+            self.module._id = module_id
         if self.module.id is None:
             q_set = self.dbConnector.execute_query(
                 "select distinct id, name, round_to from module order by id;"
@@ -217,6 +638,10 @@ class NModuleRepository:
             min_out_val, max_out_val from module where id = {chosen_id};
         """
         select_res = self.dbConnector.execute_query(select_query)
+        if len(select_res) == 0:
+            raise LookupError(
+                f"There is no module with id {chosen_id} in {self.dbConnector.db_name} data base"
+            )
 
         # Т.к. у нас только 1 модуль может быть найден по id, то обращаемся мы к 0-му индексу, без доп. проверок
         self.module._id = select_res[0][0]
@@ -231,11 +656,11 @@ class NModuleRepository:
         self.module.max_out_val = select_res[0][7]
         return self.module
 
-    def load_module_with_versions(self):
+    def load_module_with_versions(self, module_id: int = None):
         try:
-            self.load_module()
+            self.load_module(module_id)
             version_rep = NVersionRepository(None)
-            self.module._versions_list = version_rep.load_versions_2_module(
+            self.module.versions_list = version_rep.load_versions_2_module(
                 self.module.id
             )
             return self.module
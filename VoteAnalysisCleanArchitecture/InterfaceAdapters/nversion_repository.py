@@ -81,6 +81,7 @@ class NVersionRepository:
             self.formal_json_db_lst_name
         ]
         self.version._reliability = float(select_res[0][4])
+        self.version._coordinates_revision += 1
 
     def load_versions_2_module(self, module_id: int):
         if not isinstance(module_id, int):
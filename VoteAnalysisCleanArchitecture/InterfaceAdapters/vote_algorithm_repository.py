@@ -1,9 +1,14 @@
 import inspect
 import json
 import os
+import time
+from itertools import chain
 
 from InterfaceAdapters.data_base_connector import DBConnector
 from InterfaceAdapters.nmodule_repository import NModuleRepository
+from VoteAnalysisCleanArchitecture.Entities.experiment_results import (
+    IterationResults,
+)
 from VoteAnalysisCleanArchitecture.Entities.vote_algorithm import (
     VoteAlgorithm,
     ModuleNotLoadedError,
@@ -49,56 +54,189 @@ class VoteAlgorithmRepository:
             """
             self.dbConnector.execute_query(update_query, [], True, False)
 
-    def save_vote_results(self):
+    def create_vote_result_table(self):
+        NModuleRepository(None).create_experiment_tables()
         if not self.dbConnector.table_exists("vote_result"):
-            create_query = """
-                create table vote_result (
-                    id integer primary key autoincrement not null,
-                    algorithm_id integer not null,
-                    experiment_data_id integer not null,
-                    vote_answer real null,
-                    unique(algorithm_id, experiment_data_id, vote_answer) on conflict replace,
-                    foreign key ("algorithm_id") references algorithm(id),
-                    foreign key ("experiment_data_id") references experiment_data(id)
-                );
-            """
-            self.dbConnector.execute_query(create_query, [], True, False)
+            self.dbConnector.execute_query(
+                NModuleRepository.vote_result_create_query("vote_result"),
+                [],
+                True,
+                False,
+            )
 
-        if self.voteAlgorithm._id is None:
-            self.save_vote_algorithm()
+    @staticmethod
+    def iteration_key(iteration_data) -> tuple[str, int]:
+        if isinstance(iteration_data, IterationResults):
+            return iteration_data.experiment_name, iteration_data.iteration_num
+        return (
+            iteration_data[0].experiment_name,
+            iteration_data[0].module_iteration_num,
+        )
+
+    def vote_result_rows(self, experiment_ids: dict):
+        for res in self.voteAlgorithm._vote_result:
+            experiment_name, iteration_num = self.iteration_key(res["data"])
+            yield (
+                self.voteAlgorithm._id,
+                experiment_ids.get(experiment_name),
+                iteration_num,
+                res["res"],
+            )
 
-        res_insert_lst = list()
+    def analysis_keys(self, experiment_ids: dict) -> set[tuple]:
+        iteration_bounds = {}
         for res in self.voteAlgorithm._vote_result:
-            for iteration_res in res["data"]:
-                res_insert_lst.append(
-                    (self.voteAlgorithm._id, iteration_res.id, res["res"])
+            experiment_name, iteration_num = self.iteration_key(res["data"])
+            experiment_id = experiment_ids.get(experiment_name)
+            if experiment_id is not None:
+                first_iteration, last_iteration = iteration_bounds.get(
+                    experiment_id, (iteration_num, iteration_num)
+                )
+                iteration_bounds[experiment_id] = (
+                    min(first_iteration, iteration_num),
+                    max(last_iteration, iteration_num),
+                )
+        # Результаты голосования по новым итерациям только дополняют анализ, а перезапись сохранённых результатов
+        # делает его неверным
+        return {
+            (self.voteAlgorithm._id, experiment_id)
+            for experiment_id, (
+                first_iteration,
+                last_iteration,
+            ) in iteration_bounds.items()
+            if self.dbConnector.execute_query(f"""
+                    select exists(select 1 from vote_result where algorithm_id = {self.voteAlgorithm._id} 
+                    and experiment_id = {experiment_id} 
+                    and module_iteration_num between {first_iteration} and {last_iteration});
+                """)[0][0]
+        }
+
+    def delete_algorithms_analysis(self, analysis_keys: set[tuple]):
+        # Анализ алгоритма посчитан по прежним результатам голосования, поэтому при их перезаписи он удаляется в той
+        # же транзакции
+        if len(analysis_keys) > 0 and self.dbConnector.table_exists(
+            "algorithm_analysis"
+        ):
+            self.dbConnector.execute_query(
+                "delete from algorithm_analysis where algorithm_id = ? and experiment_id = ?;",
+                list(analysis_keys),
+                False,
+                False,
+            )
+
+    def load_experiment_ids(self) -> dict:
+        return {
+            experiment_name: experiment_id
+            for experiment_name, experiment_id in self.dbConnector.execute_query(
+                "select name, id from experiment;"
+            )
+        }
+
+    @staticmethod
+    def save_algorithms_vote_results(
+        vote_algorithms: list[VoteAlgorithm], report: bool = True
+    ) -> int:
+        """
+        Save vote results of several algorithms in one transaction
+        :param vote_algorithms: list of vote algorithms with filled vote results
+        :param report: Print insertion rate
+        :return: Amount of saved vote results
+        """
+        repositories = [
+            VoteAlgorithmRepository(vote_algorithm)
+            for vote_algorithm in vote_algorithms
+        ]
+        if len(repositories) == 0:
+            return 0
+        repositories[0].create_vote_result_table()
+        for repository in repositories:
+            if repository.voteAlgorithm._id is None:
+                repository.save_vote_algorithm()
+        experiment_ids = repositories[0].load_experiment_ids()
+        repositories[0].delete_algorithms_analysis(
+            set().union(
+                *(
+                    repository.analysis_keys(experiment_ids)
+                    for repository in repositories
+                )
+            )
+        )
+        insert_query = "insert into vote_result (algorithm_id, experiment_id, module_iteration_num, vote_answer) values(?,?,?,?);"
+        return repositories[0].dbConnector.bulk_insert(
+            insert_query,
+            chain.from_iterable(
+                repository.vote_result_rows(experiment_ids)
+                for repository in repositories
+            ),
+            report=report,
+        )
+
+    @staticmethod
+    def save_algorithms_vote_pages(vote_pages):
+        """
+        Save vote results of every page as soon as it is voted
+        :param vote_pages: iterable of lists of vote algorithms with vote results of one page
+        """
+        # Скорость вставки выводится один раз за все страницы
+        rows_amount = 0
+        insert_time = 0.0
+        for vote_algorithms in vote_pages:
+            start_time = time.perf_counter()
+            rows_amount += (
+                VoteAlgorithmRepository.save_algorithms_vote_results(
+                    vote_algorithms, False
                 )
+            )
+            insert_time += time.perf_counter() - start_time
+        DBConnector.print_insert_rate(rows_amount, insert_time)
+
+    def save_vote_results(self, load_ids: bool | None = None):
+        """
+        Save algorithm vote results
+        :param load_ids: Load ids of saved vote results. User is asked about it, if None
+        """
+        self.create_vote_result_table()
+
+        if self.voteAlgorithm._id is None:
+            self.save_vote_algorithm()
+
+        experiment_ids = self.load_experiment_ids()
+        res_insert_lst = list(self.vote_result_rows(experiment_ids))
         if len(res_insert_lst) > 0:
-            insert_query = "insert into vote_result (algorithm_id, experiment_data_id, vote_answer) values(?,?,?);"
+            self.delete_algorithms_analysis(self.analysis_keys(experiment_ids))
+            insert_query = "insert into vote_result (algorithm_id, experiment_id, module_iteration_num, vote_answer) values(?,?,?,?);"
             self.dbConnector.execute_query(
                 insert_query, res_insert_lst, True, False
             )
 
-            if (
-                input(
-                    "Do you want to load rows is from DB? y - Yes; any key - No: "
-                ).upper()
-                == "Y"
-            ):
-                for res in self.voteAlgorithm._vote_result:
-                    tmp_ids: list[int] = list()
-                    for iteration_res in res["data"]:
-                        select_query = f"""
-                            select id from vote_result where algorithm_id = {self.voteAlgorithm._id}
-                            and experiment_data_id = {iteration_res.id} 
-                            and vote_answer = {res['res']};
-                        """
-                        select_res = self.dbConnector.execute_query(
-                            select_query
-                        )
-                        if len(select_res) > 0 and len(select_res[0]) > 0:
-                            tmp_ids.append(int(select_res[0][0]))
-                    res["ids"] = tmp_ids
+            if load_ids is None:
+                load_ids = (
+                    input(
+                        "Do you want to load rows is from DB? y - Yes; any key - No: "
+                    ).upper()
+                    == "Y"
+                )
+            if load_ids:
+                self.load_vote_result_ids()
+
+    def load_vote_result_ids(self):
+        # Идентификаторы всех результатов голосования алгоритма загружаются одним запросом, а затем
+        # сопоставляются с итерациями по эксперименту и номеру итерации
+        select_query = f"""
+            select e.name, v.module_iteration_num, v.id from vote_result v 
+            join experiment e on e.id = v.experiment_id where v.algorithm_id = {self.voteAlgorithm._id};
+        """
+        vote_result_ids = {
+            (experiment_name, iteration_num): vote_result_id
+            for experiment_name, iteration_num, vote_result_id in self.dbConnector.execute_query(
+                select_query
+            )
+        }
+        for res in self.voteAlgorithm._vote_result:
+            vote_result_id = vote_result_ids.get(
+                self.iteration_key(res["data"])
+            )
+            res["ids"] = [] if vote_result_id is None else [vote_result_id]
 
     def load_vote_results(self, cur_module):
         if not self.dbConnector.table_exists("vote_result"):
@@ -107,31 +245,52 @@ class VoteAlgorithmRepository:
             )
 
         vote_results = list()
+        experiment_data = cur_module.global_results_lst
+        if not experiment_data or len(experiment_data) == 0:
+            # Если данные эксперимента не загружены, загружается первый эксперимент с результатами алгоритма
+            experiment_name_query = f"""
+                select e.name from vote_result v join experiment e on e.id = v.experiment_id 
+                where v.algorithm_id = {self.voteAlgorithm._id} order by v.id limit 1;
+            """
+            experiment_name_res = self.dbConnector.execute_query(
+                experiment_name_query
+            )
+            if len(experiment_name_res) == 0:
+                return
+            NModuleRepository(cur_module).load_experiment_data(
+                experiment_name_res[0][0]
+            )
+            experiment_data = cur_module.global_results_lst
+        # Результаты других экспериментов не относятся к загруженным итерациям, даже если номера итераций совпадают
+        experiment_id = self.load_experiment_ids().get(
+            experiment_data.experiment_name
+        )
+        if experiment_id is None:
+            return
         select_query = f"""
-            select id, vote_answer, experiment_data_id from vote_result where algorithm_id = {self.voteAlgorithm._id};
+            select v.id, v.vote_answer, v.module_iteration_num from vote_result v 
+            where v.algorithm_id = {self.voteAlgorithm._id} and v.experiment_id = {experiment_id} 
+            order by v.module_iteration_num;
         """
         select_res = self.dbConnector.execute_query(select_query)
         if len(select_res) > 0 and len(select_res[0]) > 0:
-            experiment_data = cur_module.global_results_lst
-            if not experiment_data or len(experiment_data) == 0:
-                experiment_name_query = f"""
-                    select experiment_name from experiment_data where id = {select_res[0][2]};
-                """
-                experiment_name = self.dbConnector.execute_query(
-                    experiment_name_query
-                )[0][0]
-                NModuleRepository(cur_module).load_experiment_data(
-                    experiment_name
+            iteration_indexes = {
+                iteration_num: index
+                for index, iteration_num in enumerate(
+                    experiment_data.iteration_nums[
+                        experiment_data.iteration_starts[:-1]
+                    ].tolist()
                 )
-                experiment_data = cur_module.global_results_lst
-            step = len(experiment_data[0])
-            for i in range(0, len(select_res), step):
-                ids = [select_res[j][0] for j in range(i, i + step)]
+            }
+            for vote_result_id, vote_answer, iteration_num in select_res:
+                index = iteration_indexes.get(iteration_num)
+                if index is None:
+                    continue
                 vote_results.append(
                     {
-                        "data": experiment_data[i // step],
-                        "res": select_res[i][1],
-                        "ids": ids,
+                        "data": experiment_data.iteration_results(index),
+                        "res": vote_answer,
+                        "ids": [vote_result_id],
                     }
                 )
             self.voteAlgorithm._vote_result = vote_results
@@ -0,0 +1,86 @@
+import json
+from itertools import product
+from random import Random
+
+from VoteAnalysisCleanArchitecture.Entities.campaign import (
+    Campaign,
+    CampaignJob,
+)
+from VoteAnalysisCleanArchitecture.UseCases.random_streams import (
+    new_experiment_seed,
+)
+
+REQUIRED_SPEC_KEYS = (
+    "name",
+    "iterations",
+    "versions_amount",
+    "reliability",
+    "diversity_intervals",
+)
+
+
+def expand_campaign_spec(spec: dict) -> Campaign:
+    """
+    Expand campaign spec into the grid of module configurations. Every combination of versions amount, reliability
+    interval and diversity intervals becomes a campaign job, which is repeated "repeats" times
+    :param spec: dict with "name", "iterations", "versions_amount" (list of ints), "reliability" (list of
+    [min, max]), "diversity_intervals" (list of lists of [min, max]) keys and optional "repeats", "seed",
+    "algorithms", "round_to", "min_out_val", "max_out_val", "batch" keys
+    :return: Campaign object
+    """
+    missing_keys = [key for key in REQUIRED_SPEC_KEYS if key not in spec]
+    if len(missing_keys) > 0:
+        raise ValueError(
+            f"Campaign spec has no {', '.join(missing_keys)} keys"
+        )
+    if int(spec["iterations"]) < 1:
+        raise ValueError(
+            f"Iterations amount should be positive. {spec['iterations']} was got."
+        )
+    for versions_amount in spec["versions_amount"]:
+        if int(versions_amount) < 1:
+            raise ValueError(
+                f"Versions amount should be positive. {versions_amount} was got."
+            )
+    # Сиды экспериментов выводятся из сида кампании в порядке заданий, поэтому кампания воспроизводима целиком
+    seed_random = Random(spec["seed"]) if "seed" in spec else None
+    jobs = []
+    for job_num, (
+        versions_amount,
+        reliability_interval,
+        diversities_intervals,
+        _,
+    ) in enumerate(
+        product(
+            spec["versions_amount"],
+            spec["reliability"],
+            spec["diversity_intervals"],
+            range(spec.get("repeats", 1)),
+        ),
+        1,
+    ):
+        jobs.append(
+            CampaignJob(
+                job_num,
+                f"{spec['name']} {job_num}",
+                int(versions_amount),
+                reliability_interval,
+                diversities_intervals,
+                (
+                    new_experiment_seed()
+                    if seed_random is None
+                    else seed_random.getrandbits(63)
+                ),
+            )
+        )
+    return Campaign(
+        spec["name"],
+        int(spec["iterations"]),
+        jobs,
+        spec.get("algorithms"),
+        spec.get("round_to", 6),
+        spec.get("min_out_val", 100),
+        spec.get("max_out_val", 1000),
+        json.dumps(spec, sort_keys=True),
+        bool(spec.get("batch", False)),
+    )
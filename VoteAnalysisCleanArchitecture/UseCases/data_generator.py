@@ -1,117 +1,75 @@
-from random import random, normalvariate, uniform
-from VoteAnalysisCleanArchitecture.Entities.n_result import NResult
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from random import Random
+
+import numpy as np
+
+from VoteAnalysisCleanArchitecture.Entities.experiment_batch import (
+    ExperimentBatch,
+)
+from VoteAnalysisCleanArchitecture.Entities.experiment_results import (
+    ExperimentResults,
+)
 from VoteAnalysisCleanArchitecture.Entities.n_module import NModule
+from VoteAnalysisCleanArchitecture.Entities.version_grouping import (
+    VersionGrouping,
+)
+from VoteAnalysisCleanArchitecture.UseCases.random_streams import (
+    ITERATIONS_CHUNK_SIZE,
+    chunk_bounds,
+    chunk_numpy_generator,
+    chunk_python_random,
+    new_experiment_seed,
+)
 
 
 class DataGenerator:
     def __init__(self, module: NModule):
         self.module = module
+        # Группировка версий, использованная при последней генерации данных эксперимента
+        self.version_grouping: VersionGrouping = None
+        self._random_stream = Random()
 
-    def group_versions(self):
-        clone_versions = set()
-        similar_versions = set()
-        partly_similar_versions = set()
-        difference_versions = set()
-        for j in range(len(self.module.versions_list)):
-            for k in range(len(self.module.versions_list)):
-                if k > j:
-                    if (
-                        0
-                        <= self.module.normed_connectivity_matrix[j][k]
-                        <= 0.05
-                    ):
-                        self.add_to_set(clone_versions, j, k)
-                    elif (
-                        0.05
-                        < self.module.normed_connectivity_matrix[j][k]
-                        < 0.4
-                    ):
-                        self.add_to_set(similar_versions, j, k)
-                    elif (
-                        0.4
-                        <= self.module.normed_connectivity_matrix[j][k]
-                        <= 0.6
-                    ):
-                        self.add_to_set(partly_similar_versions, j, k)
-                    else:
-                        self.add_to_set(difference_versions, j, k)
-        return (
-            clone_versions,
-            similar_versions,
-            partly_similar_versions,
-            difference_versions,
-        )
-
-    def add_to_set(self, version_set, j, k):
-        if self.module.versions_list[j] not in version_set:
-            version_set.add(self.module.versions_list[j])
-        if self.module.versions_list[k] not in version_set:
-            version_set.add(self.module.versions_list[k])
-
-    def create_result(
-        self, ver, v_answer, cur_correct_val, i, experiment_name
-    ):
-        return NResult(
-            v_id=ver.id,
-            v_name=ver.name,
-            v_reliability=ver.reliability,
-            v_common_coordinates=ver.common_coordinates_list,
-            v_answer=v_answer,
-            c_answer=cur_correct_val,
-            m_id=self.module.id,
-            m_name=self.module.name,
-            m_connectivity_matrix=self.module.normed_connectivity_matrix,
-            m_iteration_num=i,
-            version=ver,
-            experiment_name=experiment_name,
+    def group_versions(self) -> VersionGrouping:
+        return VersionGrouping(
+            self.module.versions_list, self.module.normed_connectivity_array
         )
 
     def generate_error_value(self, base_val, diversity_coefficient):
         return round(
-            normalvariate(base_val, diversity_coefficient * base_val),
+            self._random_stream.normalvariate(
+                base_val, diversity_coefficient * base_val
+            ),
             self.module.round_to,
         )
 
     def process_clone_versions(
-        self, clone_versions, cur_correct_val, result_lst, i, experiment_name
+        self, clone_versions, cur_correct_val, answers_lst
     ):
         try:
             min_rel = min(ver.reliability for ver in clone_versions)
         except ValueError:
             min_rel = 1
 
-        cur_clone_reliability = random()
+        cur_clone_reliability = self._random_stream.random()
 
         for ver in clone_versions:
             if cur_clone_reliability <= min_rel:
-                result_lst.append(
-                    self.create_result(
-                        ver,
-                        cur_correct_val,
-                        cur_correct_val,
-                        i,
-                        experiment_name,
-                    )
-                )
+                answers_lst.append(cur_correct_val)
             else:
                 clone_error_val = round(
-                    uniform(self.module.min_out_val, self.module.max_out_val),
+                    self._random_stream.uniform(
+                        self.module.min_out_val, self.module.max_out_val
+                    ),
                     self.module.round_to,
                 )
-                result_lst.append(
-                    self.create_result(
-                        ver,
-                        clone_error_val,
-                        cur_correct_val,
-                        i,
-                        experiment_name,
-                    )
-                )
+                answers_lst.append(clone_error_val)
 
     def process_similar_versions(
-        self, similar_versions, cur_correct_val, result_lst, i, experiment_name
+        self, similar_versions, cur_correct_val, answers_lst
     ):
-        cur_similar_reliability = random()
+        cur_similar_reliability = self._random_stream.random()
         correct_similar_versions = {
             ver
             for ver in similar_versions
@@ -121,227 +79,531 @@ class DataGenerator:
             cur_correct_val
             if correct_similar_versions
             else round(
-                uniform(self.module.min_out_val, self.module.max_out_val),
+                self._random_stream.uniform(
+                    self.module.min_out_val, self.module.max_out_val
+                ),
                 self.module.round_to,
             )
         )
         diversity_coefficient = round(
-            uniform(0.06, 0.39), self.module.round_to
+            self._random_stream.uniform(0.06, 0.39), self.module.round_to
         )
 
         for ver in similar_versions:
             if cur_similar_reliability > ver.reliability:
-                similar_error_val = self.generate_error_value(
-                    similar_base_error_val, diversity_coefficient
-                )
-                result_lst.append(
-                    self.create_result(
-                        ver,
-                        similar_error_val,
-                        cur_correct_val,
-                        i,
-                        experiment_name,
+                answers_lst.append(
+                    self.generate_error_value(
+                        similar_base_error_val, diversity_coefficient
                     )
                 )
             else:
-                result_lst.append(
-                    self.create_result(
-                        ver,
-                        cur_correct_val,
-                        cur_correct_val,
-                        i,
-                        experiment_name,
-                    )
-                )
+                answers_lst.append(cur_correct_val)
 
     def process_partly_similar_versions(
-        self,
-        partly_similar_versions,
-        cur_correct_val,
-        result_lst,
-        i,
-        experiment_name,
+        self, version_grouping, cur_correct_val, answers_lst
     ):
-        cur_partly_similar_diversity = random()
-        partly_similar_depended_versions = set()
-        partly_similar_independent_versions = set()
-
-        for ver1 in partly_similar_versions:
-            for ver2 in partly_similar_versions:
-                if ver1 != ver2:
-                    v1_index = self.module.versions_list.index(ver1)
-                    v2_index = self.module.versions_list.index(ver2)
-                    if (
-                        self.module.normed_connectivity_matrix[v1_index][
-                            v2_index
-                        ]
-                        >= cur_partly_similar_diversity
-                    ):
-                        partly_similar_depended_versions.add(ver1)
-                        partly_similar_depended_versions.add(ver2)
-                    else:
-                        partly_similar_independent_versions.add(ver1)
-                        partly_similar_independent_versions.add(ver2)
-
-        correct_partly_similar_versions = {
-            ver
-            for ver in partly_similar_versions
-            if random() <= ver.reliability
-        }
-        error_partly_similar_versions = (
-            partly_similar_versions - correct_partly_similar_versions
-        )
-        error_partly_abs_depended_versions = (
-            error_partly_similar_versions & partly_similar_depended_versions
-        )
-        error_partly_abs_independent_versions = (
-            error_partly_similar_versions & partly_similar_independent_versions
-        )
-        error_partly_similar_versions -= (
-            error_partly_abs_depended_versions
-            | error_partly_abs_independent_versions
+        partly_similar_versions = version_grouping.partly_similar_versions
+        cur_partly_similar_diversity = self._random_stream.random()
+        # Если диверсифицировнность версий больше или равна случайному уровню диверсифицированности, то считаем их
+        # зависимыми, иначе - различными. Расстояния между версиями уже посчитаны при группировке
+        depended_mask, independent_mask = (
+            mask.tolist()
+            for mask in version_grouping.partly_similar_dependency(
+                cur_partly_similar_diversity
+            )
         )
 
+        # Для всех абсолютно схожих версий ставим в соответствие одно неверное значение
         partly_similar_base_error_val = round(
-            uniform(self.module.min_out_val, self.module.max_out_val),
+            self._random_stream.uniform(
+                self.module.min_out_val, self.module.max_out_val
+            ),
             self.module.round_to,
         )
 
-        for ver in correct_partly_similar_versions:
-            result_lst.append(
-                self.create_result(
-                    ver,
-                    cur_correct_val,
-                    cur_correct_val,
-                    i,
-                    experiment_name,
-                )
-            )
-
-        for ver in error_partly_abs_depended_versions:
-            result_lst.append(
-                self.create_result(
-                    ver,
-                    partly_similar_base_error_val,
-                    cur_correct_val,
-                    i,
-                    experiment_name,
-                )
-            )
-
-        for ver in error_partly_similar_versions:
-            partly_similar_error_val = self.generate_error_value(
-                partly_similar_base_error_val, cur_partly_similar_diversity
-            )
-            result_lst.append(
-                self.create_result(
-                    ver,
-                    partly_similar_error_val,
-                    cur_correct_val,
-                    i,
-                    experiment_name,
+        # Каждая версия группы выдаёт ровно один ответ и всегда на одной и той же позиции в списке результатов
+        # итерации. Если версия зависима от одной версии группы и независима от другой, то считаем её зависимой
+        for ver_index, ver in enumerate(partly_similar_versions):
+            if self._random_stream.random() <= ver.reliability:
+                partly_similar_answer = cur_correct_val
+            elif depended_mask[ver_index]:
+                partly_similar_answer = partly_similar_base_error_val
+            elif independent_mask[ver_index]:
+                # Для полностью разных версий генерируем абсолюно независимые ответы
+                partly_similar_answer = round(
+                    self._random_stream.uniform(
+                        self.module.min_out_val, self.module.max_out_val
+                    ),
+                    self.module.round_to,
                 )
-            )
-
-        for ver in error_partly_abs_independent_versions:
-            partly_similar_independent_error_val = round(
-                uniform(self.module.min_out_val, self.module.max_out_val),
-                self.module.round_to,
-            )
-            result_lst.append(
-                self.create_result(
-                    ver,
-                    partly_similar_independent_error_val,
-                    cur_correct_val,
-                    i,
-                    experiment_name,
+            else:
+                # Для частично схожих версий генерирует ответы по нормальному распределению на основе одного значения
+                partly_similar_answer = self.generate_error_value(
+                    partly_similar_base_error_val, cur_partly_similar_diversity
                 )
-            )
+            answers_lst.append(partly_similar_answer)
 
     def process_difference_versions(
-        self,
-        difference_versions,
-        cur_correct_val,
-        result_lst,
-        i,
-        experiment_name,
+        self, difference_versions, cur_correct_val, answers_lst
     ):
         for ver in difference_versions:
-            cur_difference_reliability = random()
+            cur_difference_reliability = self._random_stream.random()
             cur_dif_version_answer = (
                 cur_correct_val
                 if cur_difference_reliability <= ver.reliability
                 else round(
-                    uniform(self.module.min_out_val, self.module.max_out_val),
+                    self._random_stream.uniform(
+                        self.module.min_out_val, self.module.max_out_val
+                    ),
                     self.module.round_to,
                 )
             )
-            result_lst.append(
-                self.create_result(
-                    ver,
-                    cur_dif_version_answer,
-                    cur_correct_val,
-                    i,
-                    experiment_name,
-                )
-            )
+            answers_lst.append(cur_dif_version_answer)
 
     def generate_experiment_data(
-        self, iterations_amount: int, experiment_name: str
+        self,
+        iterations_amount: int,
+        experiment_name: str,
+        seed: int = None,
+        workers: int = 1,
+        batch: bool = False,
     ) -> list:
-        # Чтобы не возникало неопределённости при записи результатов в БД, очищаем имеющиеся результаты перед генерацией
+        version_grouping, seed, iterations_chunks = self.prepare_experiment(
+            iterations_amount, experiment_name, seed, workers, batch
+        )
+        # Чтобы не возникало неопределённости при записи результатов в БД, очищаем имеющиеся результаты перед генерацией.
+        # Потоковая генерация результаты модуля не меняет
         self.module._global_results_lst_2_write = list()
         self.module._global_results_lst = list()
-        # Запускаем цикл по количеству заданных итераций
-        for i in range(iterations_amount):
-            result_lst = list()
-            # Разбиваем версии на группы для различной генерации результатов их работы
+        experiment_results = ExperimentResults(
+            self.module.id,
+            self.module.name,
+            self.module.normed_connectivity_matrix,
+            experiment_name,
+        )
+        # Ответы итерации идут в порядке групп версий, поэтому позиции версий раскладываются по слотам один раз
+        slot_positions = experiment_results.add_versions(
+            version_grouping.versions
+        )[version_grouping.slot_indexes]
+        self.add_chunks_results(
+            self.generate_chunks(
+                version_grouping, seed, iterations_chunks, workers, batch
+            ),
+            iterations_chunks,
+            experiment_results,
+            slot_positions,
+        )
+        self.module._global_results_lst = experiment_results
+        return self.module.global_results_lst
+
+    def stream_experiment_data(
+        self,
+        iterations_amount: int,
+        experiment_name: str,
+        seed: int = None,
+        workers: int = 1,
+        batch: bool = False,
+        first_iteration: int = 0,
+    ):
+        """
+        Generate experiment data without keeping the whole run in memory. Results of the module are not changed, and
+        every iterations chunk is returned as soon as it is generated
+        :param batch: Generate every iterations chunk with NumPy arrays as generate_experiment_batch does
+        :param first_iteration: Number of the first returned iteration. Iterations after it are the same as in the
+        whole run with the same seed
+        :return: generator of ExperimentResults objects with results of consecutive iterations chunks
+        """
+        version_grouping, seed, iterations_chunks = self.prepare_experiment(
+            iterations_amount, experiment_name, seed, workers, batch
+        )
+        # Кусок, в котором начинаются новые итерации, генерируется целиком, чтобы его поток случайных чисел совпал
+        # с генерацией всего прогона, а итерации до первой отбрасываются
+        first_chunk_index = first_iteration // ITERATIONS_CHUNK_SIZE
+        iterations_chunks = iterations_chunks[first_chunk_index:]
+        return self.chunks_experiment_results(
+            self.generate_chunks(
+                version_grouping,
+                seed,
+                iterations_chunks,
+                workers,
+                batch,
+                first_chunk_index,
+            ),
+            iterations_chunks,
+            version_grouping,
+            experiment_name,
+            first_iteration,
+        )
+
+    def prepare_experiment(
+        self,
+        iterations_amount: int,
+        experiment_name: str,
+        seed: int,
+        workers: int,
+        batch: bool = False,
+    ) -> tuple[VersionGrouping, int, list]:
+        if workers < 1:
+            raise ValueError(
+                f"Workers amount should be positive. {workers} was got."
+            )
+        # Сид эксперимента сохраняется вместе с ним, чтобы данные можно было сгенерировать повторно
+        if seed is None:
+            seed = new_experiment_seed()
+        # Разбиваем версии на группы для различной генерации результатов их работы. Версии модуля за время
+        # эксперимента не меняются, поэтому группировка выполняется один раз на весь прогон
+        version_grouping = self.group_versions()
+        self.version_grouping = version_grouping
+        self.module._experiment_name = experiment_name
+        self.module._experiment_seed = seed
+        self.module._experiment_batch = batch
+        return version_grouping, seed, chunk_bounds(iterations_amount)
+
+    def generate_chunks(
+        self,
+        version_grouping,
+        seed: int,
+        iterations_chunks,
+        workers: int,
+        batch: bool = False,
+        first_chunk_index: int = 0,
+    ):
+        """
+        Generate iterations chunks in the iterations order
+        :return: generator of (correct answers, versions answers) tuples returned by generate_iterations_chunk or
+        generate_batch_chunk_answers
+        """
+        generate_chunk = partial(
             (
-                clone_versions,
-                similar_versions,
-                partly_similar_versions,
-                difference_versions,
-            ) = self.group_versions()
+                self.generate_batch_chunk_answers
+                if batch
+                else self.generate_iterations_chunk
+            ),
+            version_grouping,
+            seed,
+        )
+        chunks_args = [
+            (chunk_index, first_iteration, last_iteration)
+            for chunk_index, (first_iteration, last_iteration) in enumerate(
+                iterations_chunks, first_chunk_index
+            )
+        ]
+        if workers == 1 or len(iterations_chunks) < 2:
+            for args in chunks_args:
+                yield generate_chunk(*args)
+        else:
+            workers = min(workers, len(iterations_chunks))
+            # Каждый процесс возвращает только ответы версий своего куска, а собираются они здесь. Куски отдаются
+            # в порядке итераций, поэтому результат совпадает с последовательной генерацией. Одновременно в работе
+            # не больше двух кусков на процесс, чтобы готовые куски не накапливались, пока предыдущие обрабатываются
+            with ProcessPoolExecutor(workers) as executor:
+                pending_chunks = deque()
+                for args in chunks_args:
+                    pending_chunks.append(executor.submit(generate_chunk, *args))
+                    if len(pending_chunks) >= 2 * workers:
+                        yield pending_chunks.popleft().result()
+                while pending_chunks:
+                    yield pending_chunks.popleft().result()
+
+    @staticmethod
+    def add_chunks_results(
+        chunks,
+        iterations_chunks,
+        experiment_results,
+        slot_positions,
+        first_iteration: int = 0,
+    ):
+        for (correct_answers, version_answers), (
+            chunk_first_iteration,
+            _,
+        ) in zip(chunks, iterations_chunks):
+            # Итерации куска до первой нужной уже есть в эксперименте
+            skipped_amount = max(first_iteration - chunk_first_iteration, 0)
+            experiment_results.append_iterations(
+                chunk_first_iteration + skipped_amount,
+                correct_answers[skipped_amount:],
+                version_answers[skipped_amount:],
+                slot_positions,
+            )
+
+    def chunks_experiment_results(
+        self,
+        chunks,
+        iterations_chunks,
+        version_grouping,
+        experiment_name: str,
+        first_iteration: int = 0,
+    ):
+        for chunk, iterations_chunk in zip(chunks, iterations_chunks):
+            experiment_results = ExperimentResults(
+                self.module.id,
+                self.module.name,
+                self.module.normed_connectivity_matrix,
+                experiment_name,
+            )
+            slot_positions = experiment_results.add_versions(
+                version_grouping.versions
+            )[version_grouping.slot_indexes]
+            self.add_chunks_results(
+                [chunk],
+                [iterations_chunk],
+                experiment_results,
+                slot_positions,
+                first_iteration,
+            )
+            yield experiment_results
+
+    def generate_iterations_chunk(
+        self,
+        version_grouping,
+        seed: int,
+        chunk_index: int,
+        first_iteration: int,
+        last_iteration: int,
+    ) -> tuple[list, list]:
+        """
+        Generate versions answers of the experiment iterations chunk
+        :return: tuple of correct answers list and list of versions answers lists. Answers of an iteration go in
+        the version_grouping.slot_indexes order
+        """
+        # У каждого куска итераций свой поток случайных чисел, поэтому куски можно генерировать в любом порядке и
+        # в разных процессах, а результат будет тем же, что и при последовательной генерации
+        self._random_stream = chunk_python_random(seed, chunk_index)
+        clone_versions = version_grouping.clone_versions
+        similar_versions = version_grouping.similar_versions
+        difference_versions = version_grouping.difference_versions
+        correct_answers = list()
+        version_answers = list()
+        # Запускаем цикл по итерациям куска
+        for _ in range(first_iteration, last_iteration):
+            answers_lst = list()
             # Генерируем значение, которое будет считаться правильным ответом на текущей итерации
             cur_correct_val = round(
-                uniform(self.module.min_out_val, self.module.max_out_val),
+                self._random_stream.uniform(
+                    self.module.min_out_val, self.module.max_out_val
+                ),
                 self.module.round_to,
             )
             # ---------------------------------------------------------------
             # 1. Генерируем выходные данные для версий-клонов
             self.process_clone_versions(
-                clone_versions,
-                cur_correct_val,
-                result_lst,
-                i,
-                experiment_name,
+                clone_versions, cur_correct_val, answers_lst
             )
             # 2. Генерируем выходные данные для явно схожих версий
             self.process_similar_versions(
-                similar_versions,
-                cur_correct_val,
-                result_lst,
-                i,
-                experiment_name,
+                similar_versions, cur_correct_val, answers_lst
             )
             # 3. Генерируем выходные данные для частично схожих версий
             self.process_partly_similar_versions(
-                partly_similar_versions,
-                cur_correct_val,
-                result_lst,
-                i,
-                experiment_name,
+                version_grouping, cur_correct_val, answers_lst
             )
             # 4. Генерируем выходные данные для явно несхожих версий
             self.process_difference_versions(
-                difference_versions,
-                cur_correct_val,
-                result_lst,
-                i,
-                experiment_name,
+                difference_versions, cur_correct_val, answers_lst
             )
             # ---------------------------------------------------------------
-            self.module._global_results_lst.append(result_lst)
+            correct_answers.append(cur_correct_val)
+            version_answers.append(answers_lst)
+        return correct_answers, version_answers
+
+    def generate_experiment_batch(
+        self, iterations_amount: int, experiment_name: str, seed: int = None
+    ) -> ExperimentBatch:
+        """
+        Generate the whole experiment run at once as NumPy arrays. Clone, similar, partly similar and
+        difference versions are processed by the same rules as in generate_experiment_data, but every random value
+        is drawn for all iterations of a chunk by one call. Results of the module are not changed
+        :param iterations_amount: Iterations amount
+        :param experiment_name: Experiment name
+        :param seed: Experiment seed. New seed is generated if it is None
+        :return: ExperimentBatch object
+        """
+        if seed is None:
+            seed = new_experiment_seed()
+        version_grouping = self.group_versions()
+        self.version_grouping = version_grouping
         self.module._experiment_name = experiment_name
-        self.module._get_global_results_lst_2_write()
-        return self.module.global_results_lst
+        self.module._experiment_seed = seed
+        self.module._experiment_batch = True
+        # У прогона без итераций один пустой кусок, чтобы в пакете были слоты версий
+        iterations_chunks = chunk_bounds(iterations_amount) or [(0, 0)]
+        experiment_batch = ExperimentBatch.concatenate(
+            [
+                self.generate_batch_chunk(
+                    version_grouping,
+                    seed,
+                    chunk_index,
+                    first_iteration,
+                    last_iteration,
+                )
+                for chunk_index, (
+                    first_iteration,
+                    last_iteration,
+                ) in enumerate(iterations_chunks)
+            ]
+        )
+        experiment_batch.seed = seed
+        return experiment_batch
+
+    def generate_batch_chunk_answers(
+        self,
+        version_grouping,
+        seed: int,
+        chunk_index: int,
+        first_iteration: int,
+        last_iteration: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Generate versions answers of the experiment iterations chunk with NumPy arrays
+        :return: tuple of correct answers array and (iterations, slots) array of versions answers. Answers of an
+        iteration go in the version_grouping.slot_indexes order
+        """
+        # Процессы возвращают только ответы, без случайных чисел надёжности, чтобы не пересылать лишние массивы
+        experiment_batch = self.generate_batch_chunk(
+            version_grouping,
+            seed,
+            chunk_index,
+            first_iteration,
+            last_iteration,
+        )
+        return (
+            experiment_batch.correct_answers,
+            experiment_batch.version_answers,
+        )
+
+    def generate_batch_chunk(
+        self,
+        version_grouping,
+        seed: int,
+        chunk_index: int,
+        first_iteration: int,
+        last_iteration: int,
+    ) -> ExperimentBatch:
+        rng = chunk_numpy_generator(seed, chunk_index)
+        iterations_amount = last_iteration - first_iteration
+        reliabilities = np.array(
+            [ver.reliability for ver in version_grouping.versions], dtype=float
+        )
+
+        def uniform_values(size):
+            return np.round(
+                rng.uniform(
+                    self.module.min_out_val, self.module.max_out_val, size
+                ),
+                self.module.round_to,
+            )
+
+        def error_values(base_vals, diversity_coefficients, size):
+            # Аналог normalvariate(base_val, diversity_coefficient * base_val) для всех итераций сразу
+            return np.round(
+                rng.normal(
+                    base_vals[:, None],
+                    np.abs(diversity_coefficients * base_vals)[:, None],
+                    size,
+                ),
+                self.module.round_to,
+            )
+
+        correct_answers = uniform_values(iterations_amount)
+        correct_column = correct_answers[:, None]
+        answers_parts = []
+        draws_parts = []
+
+        # 1. Версии-клоны: одно случайное число на итерацию сравнивается с минимальной надёжностью группы
+        clone_indexes = version_grouping.clone_indexes
+        clone_shape = (iterations_amount, len(clone_indexes))
+        min_rel = (
+            reliabilities[clone_indexes].min() if len(clone_indexes) > 0 else 1
+        )
+        clone_draws = rng.random(iterations_amount)
+        answers_parts.append(
+            np.where(
+                (clone_draws <= min_rel)[:, None],
+                correct_column,
+                uniform_values(clone_shape),
+            )
+        )
+        draws_parts.append(np.broadcast_to(clone_draws[:, None], clone_shape))
+
+        # 2. Явно схожие версии: одно случайное число на итерацию, ошибочные ответы генерируются вблизи верного
+        # ответа, если хотя бы одна версия группы отработала верно, иначе - вблизи общего случайного значения
+        similar_indexes = version_grouping.similar_indexes
+        similar_shape = (iterations_amount, len(similar_indexes))
+        similar_rel = reliabilities[similar_indexes]
+        similar_draws = rng.random(iterations_amount)
+        similar_base_error_vals = np.where(
+            similar_draws <= (similar_rel.max() if len(similar_rel) else -1),
+            correct_answers,
+            uniform_values(iterations_amount),
+        )
+        diversity_coefficients = np.round(
+            rng.uniform(0.06, 0.39, iterations_amount), self.module.round_to
+        )
+        answers_parts.append(
+            np.where(
+                similar_draws[:, None] > similar_rel,
+                error_values(
+                    similar_base_error_vals,
+                    diversity_coefficients,
+                    similar_shape,
+                ),
+                correct_column,
+            )
+        )
+        draws_parts.append(
+            np.broadcast_to(similar_draws[:, None], similar_shape)
+        )
+
+        # 3. Частично схожие версии: зависимость версий определяется сравнением их расстояния со случайным уровнем
+        # диверсифицированности итерации
+        partly_similar_indexes = version_grouping.partly_similar_indexes
+        partly_similar_shape = (iterations_amount, len(partly_similar_indexes))
+        partly_similar_diversities = rng.random(iterations_amount)
+        depended_mask, independent_mask = (
+            version_grouping.partly_similar_dependency(
+                partly_similar_diversities
+            )
+        )
+        partly_similar_draws = rng.random(partly_similar_shape)
+        partly_similar_base_error_vals = uniform_values(iterations_amount)
+        answers_parts.append(
+            np.where(
+                partly_similar_draws <= reliabilities[partly_similar_indexes],
+                correct_column,
+                np.where(
+                    depended_mask,
+                    partly_similar_base_error_vals[:, None],
+                    np.where(
+                        independent_mask,
+                        uniform_values(partly_similar_shape),
+                        error_values(
+                            partly_similar_base_error_vals,
+                            partly_similar_diversities,
+                            partly_similar_shape,
+                        ),
+                    ),
+                ),
+            )
+        )
+        draws_parts.append(partly_similar_draws)
+
+        # 4. Явно несхожие версии: у каждой версии своё случайное число и свой независимый ошибочный ответ
+        difference_indexes = version_grouping.difference_indexes
+        difference_shape = (iterations_amount, len(difference_indexes))
+        difference_draws = rng.random(difference_shape)
+        answers_parts.append(
+            np.where(
+                difference_draws <= reliabilities[difference_indexes],
+                correct_column,
+                uniform_values(difference_shape),
+            )
+        )
+        draws_parts.append(difference_draws)
+
+        return ExperimentBatch(
+            correct_answers,
+            np.concatenate(answers_parts, axis=1),
+            np.concatenate(draws_parts, axis=1),
+            version_grouping.slot_indexes,
+            first_iteration,
+        )
@@ -0,0 +1,207 @@
+import numpy as np
+
+from VoteAnalysisCleanArchitecture.Entities.experiment_analysis import (
+    AlgorithmAnalysis,
+    CORRECT_ANSWER_TOLERANCE,
+    VersionAnalysis,
+)
+
+
+def iteration_ties(
+    answers: np.ndarray, iteration_starts: np.ndarray
+) -> np.ndarray:
+    """
+    Find iterations, where several different answers got the same largest number of versions
+    :param answers: Array of versions answers of several iterations one after another
+    :param iteration_starts: Sorted array of positions of iterations first answers in answers array
+    :return: boolean array with one value per iteration
+    """
+    iterations_amount = len(iteration_starts)
+    if answers.size == 0:
+        return np.zeros(iterations_amount, dtype=bool)
+    # В итерациях может быть разное число ответов, поэтому ответы сортируются внутри своих итераций, и одинаковые
+    # ответы итерации стоят подряд. Классы ответов - серии равных соседей
+    answer_iterations = np.repeat(
+        np.arange(iterations_amount),
+        np.diff(iteration_starts, append=answers.size),
+    )
+    sorted_answers = answers[np.lexsort((answers, answer_iterations))]
+    run_starts = np.ones(answers.size, dtype=bool)
+    run_starts[1:] = sorted_answers[1:] != sorted_answers[:-1]
+    # Первый ответ итерации всегда начинает серию, поэтому серии соседних итераций не сливаются
+    run_starts[iteration_starts] = True
+    run_start_positions = np.flatnonzero(run_starts)
+    run_lengths = np.diff(run_start_positions, append=answers.size)
+    run_iterations = answer_iterations[run_start_positions]
+    max_run_lengths = np.maximum.reduceat(
+        run_lengths, np.searchsorted(run_start_positions, iteration_starts)
+    )
+    # Ничья - когда в итерации больше одного класса наибольшего размера
+    return (
+        np.bincount(
+            run_iterations,
+            run_lengths == max_run_lengths[run_iterations],
+            minlength=iterations_amount,
+        )
+        > 1
+    )
+
+
+class ExperimentAnalyzer:
+    """
+    Vote algorithms and versions analysis, which is added up page by page of experiment iterations. Analysis can
+    be continued from the saved one, so only new iterations and new vote results are processed
+    """
+
+    def __init__(
+        self,
+        algorithms_analysis: list[AlgorithmAnalysis],
+        versions_analysis: list[VersionAnalysis],
+        tolerance: float = CORRECT_ANSWER_TOLERANCE,
+    ):
+        """
+        ExperimentAnalyzer class constructor
+        :param algorithms_analysis: AlgorithmAnalysis objects to add pages analysis into
+        :param versions_analysis: VersionAnalysis objects to add pages analysis into
+        :param tolerance: Max difference between correct answer and answer, which is considered as correct
+        """
+        self.algorithms_analysis = {
+            algorithm_analysis.algorithm_id: algorithm_analysis
+            for algorithm_analysis in algorithms_analysis
+        }
+        self.versions_analysis = versions_analysis
+        self.tolerance = tolerance
+
+    def add_versions_page(
+        self,
+        correct_answers: np.ndarray,
+        answers: np.ndarray,
+        answer_positions: np.ndarray,
+    ):
+        """
+        Add versions answers of several iterations into versions analysis
+        :param correct_answers: Array of correct answers of every answer iteration
+        :param answers: Array of versions answers
+        :param answer_positions: Array of positions of answers versions in versions_analysis
+        """
+        errors = np.abs(answers - correct_answers)
+        error_mask = errors > self.tolerance
+        # Ответы одной версии из разных групп складываются в её анализ
+        versions_amount = len(self.versions_analysis)
+        answers_amounts = np.bincount(
+            answer_positions, minlength=versions_amount
+        )
+        errors_amounts = np.bincount(
+            answer_positions, error_mask, minlength=versions_amount
+        )
+        error_sums = np.bincount(
+            answer_positions,
+            np.where(error_mask, errors, 0),
+            minlength=versions_amount,
+        )
+        for (
+            version_analysis,
+            answers_amount,
+            errors_amount,
+            error_sum,
+        ) in zip(
+            self.versions_analysis,
+            answers_amounts.tolist(),
+            errors_amounts.astype(np.int64).tolist(),
+            error_sums.tolist(),
+        ):
+            version_analysis.answers_amount += answers_amount
+            version_analysis.errors_amount += errors_amount
+            version_analysis.error_sum += error_sum
+
+    def add_votes_page(
+        self,
+        algorithm_id: int,
+        vote_answers: np.ndarray,
+        correct_answers: np.ndarray,
+        ties: np.ndarray,
+    ):
+        """
+        Add vote answers of several iterations into vote algorithm analysis
+        :param algorithm_id: Vote algorithm id
+        :param vote_answers: Array of vote answers. Iterations without vote answer are NaN
+        :param correct_answers: Array of the same iterations correct answers
+        :param ties: Boolean array of the same iterations ties
+        """
+        algorithm_analysis = self.algorithms_analysis[algorithm_id]
+        answered_mask = ~np.isnan(vote_answers)
+        errors = np.abs(vote_answers - correct_answers)[answered_mask]
+        correct_mask = np.zeros(len(vote_answers), dtype=bool)
+        correct_mask[answered_mask] = errors <= self.tolerance
+        algorithm_analysis.iterations_amount += len(vote_answers)
+        algorithm_analysis.correct_amount += int(correct_mask.sum())
+        algorithm_analysis.no_answer_amount += int((~answered_mask).sum())
+        algorithm_analysis.error_sum += float(errors.sum())
+        algorithm_analysis.error_square_sum += float(np.square(errors).sum())
+        algorithm_analysis.max_error = max(
+            algorithm_analysis.max_error, float(errors.max(initial=0))
+        )
+        algorithm_analysis.tie_amount += int(ties.sum())
+        algorithm_analysis.tie_correct_amount += int(
+            (ties & correct_mask).sum()
+        )
+
+    def add_page(
+        self,
+        iteration_nums: np.ndarray,
+        correct_answers: np.ndarray,
+        answers: np.ndarray,
+        answer_positions: np.ndarray,
+        iteration_starts: np.ndarray,
+        votes: dict,
+    ):
+        """
+        Add page of experiment iterations into versions and vote algorithms analysis
+        :param iteration_nums: Sorted array of iterations numbers
+        :param correct_answers: Array of iterations correct answers
+        :param answers: Array of versions answers of the iterations one after another
+        :param answer_positions: Array of positions of answers versions in versions_analysis
+        :param iteration_starts: Array of positions of iterations first answers in answers array
+        :param votes: dict of algorithm id: (iterations numbers array, vote answers array) of the same iterations,
+        which are not added into analysis yet
+        """
+        # Страница может начинаться с итераций, которые уже учтены в анализе версий, но нужны новым результатам
+        # голосования
+        versions_last_iteration = min(
+            (
+                version_analysis.last_iteration_num
+                for version_analysis in self.versions_analysis
+            ),
+            default=-1,
+        )
+        new_iterations_mask = iteration_nums > versions_last_iteration
+        if new_iterations_mask.any():
+            answers_amounts = np.diff(iteration_starts, append=len(answers))
+            new_answers_mask = np.repeat(new_iterations_mask, answers_amounts)
+            self.add_versions_page(
+                np.repeat(correct_answers, answers_amounts)[new_answers_mask],
+                answers[new_answers_mask],
+                answer_positions[new_answers_mask],
+            )
+            for version_analysis in self.versions_analysis:
+                version_analysis.last_iteration_num = int(iteration_nums[-1])
+        ties = iteration_ties(answers, iteration_starts)
+        for algorithm_id, (vote_iteration_nums, vote_answers) in votes.items():
+            # Алгоритм мог голосовать не на всех итерациях, поэтому его ответы сопоставляются с итерациями по номеру
+            positions = np.searchsorted(iteration_nums, vote_iteration_nums)
+            self.add_votes_page(
+                algorithm_id,
+                vote_answers,
+                correct_answers[positions],
+                ties[positions],
+            )
+
+    def analyse(self, pages):
+        """
+        Add all pages of experiment iterations into analysis
+        :param pages: iterable of add_page arguments tuples
+        :return: (list of AlgorithmAnalysis objects, list of VersionAnalysis objects) tuple
+        """
+        for page in pages:
+            self.add_page(*page)
+        return list(self.algorithms_analysis.values()), self.versions_analysis
@@ -1,3 +1,5 @@
+from random import Random
+
 from VoteAnalysisCleanArchitecture.Entities.n_module import NModule, input_num
 from VoteAnalysisCleanArchitecture.Entities.n_version import NVersion
 
@@ -76,5 +78,43 @@ class VersionManager:
                 ],
                 self.module.round_to,
             )
-            self.module._versions_list.append(cur_new_version)
+            self.module.add_version(cur_new_version)
+        return self.module.versions_list
+
+    def add_generated_versions(
+        self,
+        versions_amount: int,
+        reliability_interval: tuple[float, float],
+        diversities_intervals: list[tuple[float, float]],
+        random_stream: Random = None,
+    ):
+        """
+        Add versions with reliability and dynamic diversities generated from the intervals without user input
+        :param versions_amount: Amount of new versions
+        :param reliability_interval: (min, max) interval to generate versions reliability
+        :param diversities_intervals: (min, max) intervals to generate dynamic diversity coordinates of every version
+        :param random_stream: Random numbers generator of the versions. Versions are not reproducible, if None
+        :return: list of module versions
+        """
+        if not 0 <= reliability_interval[0] <= reliability_interval[1] <= 1:
+            raise ValueError(
+                f"Reliability interval should be inside [0, 1]. {reliability_interval} was got."
+            )
+        # У всех версий одинаковое число координат, иначе расстояния между ними не определены
+        self.module._dynamic_diversities_count = len(diversities_intervals)
+        first_version_num = len(self.module.versions_list) + 1
+        for version_num in range(
+            first_version_num, first_version_num + versions_amount
+        ):
+            cur_new_version = NVersion(name=f"Version {version_num}")
+            self.module._dynamic_diversities_intervals_dict[
+                cur_new_version.name
+            ] = list(diversities_intervals)
+            cur_new_version.generate_reliability(
+                *reliability_interval, self.module.round_to, random_stream
+            )
+            cur_new_version.generate_dynamic_diversities(
+                diversities_intervals, self.module.round_to, random_stream
+            )
+            self.module.add_version(cur_new_version)
         return self.module.versions_list
@@ -1,20 +1,139 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
+
+import numpy as np
+
+from VoteAnalysisCleanArchitecture.Entities.experiment_results import (
+    ExperimentResults,
+)
 from VoteAnalysisCleanArchitecture.Entities.n_result import NResult
 from VoteAnalysisCleanArchitecture.Entities.vote_algorithm import VoteAlgorithm
 
 
+def vote_iterations(
+    vote_func, vote_batch_func, nversions_results
+) -> list[dict]:
+    """
+    Vote over every iteration of experiment results
+    :param vote_func: Function, which votes over NResult list of one iteration
+    :param vote_batch_func: Optional function, which votes over answers array of all iterations
+    :param nversions_results: ExperimentResults object or list of iterations NResult lists
+    :return: list of {"data": iteration results, "res": vote result} dicts
+    """
+    if vote_batch_func is not None and isinstance(
+        nversions_results, ExperimentResults
+    ):
+        answers_matrix = nversions_results.answers_matrix()
+        if answers_matrix is not None:
+            return [
+                {
+                    "data": nversions_results.iteration_results(i),
+                    "res": vote_res,
+                }
+                for i, vote_res in enumerate(
+                    np.asarray(vote_batch_func(answers_matrix)).tolist()
+                )
+            ]
+    return [
+        {"data": iteration_result, "res": vote_func(iteration_result)}
+        for iteration_result in nversions_results
+    ]
+
+
+def _vote_in_worker(vote_func, vote_batch_func, nversions_results) -> list:
+    return [
+        vote_res["res"]
+        for vote_res in vote_iterations(
+            vote_func, vote_batch_func, nversions_results
+        )
+    ]
+
+
 class VoteAlgorithmRunner:
     def __init__(self, vote_algorithm: VoteAlgorithm):
         self.vote_algorithm = vote_algorithm
 
     def vote(self, nversions_results: list[list[NResult]]):
-        self.vote_algorithm._vote_result = list()
-        for iteration_result in nversions_results:
-            self.vote_algorithm._vote_result.append(
+        self.vote_algorithm._vote_result = vote_iterations(
+            self.vote_algorithm.vote_algorithm,
+            self.vote_algorithm.vote_batch_algorithm,
+            nversions_results,
+        )
+        return self.vote_algorithm._vote_result
+
+
+class VoteAlgorithmsPoolRunner:
+    def __init__(self, vote_algorithms: list[VoteAlgorithm], workers: int = 1):
+        if workers < 1:
+            raise ValueError(
+                f"Workers amount should be positive. {workers} was got."
+            )
+        self.vote_algorithms = vote_algorithms
+        self.workers = workers
+
+    def vote_pool(self):
+        # Процессы нужны, только если алгоритмов несколько
+        if self.workers == 1 or len(self.vote_algorithms) < 2:
+            return nullcontext()
+        return ProcessPoolExecutor(
+            min(self.workers, len(self.vote_algorithms))
+        )
+
+    def vote_in_pool(
+        self,
+        nversions_results: list[list[NResult]],
+        executor: ProcessPoolExecutor | None,
+    ):
+        """
+        Vote with every algorithm over the same experiment results in the worker processes of the executor. Workers
+        return only vote results, which are matched with the iterations data here
+        :param executor: Executor returned by vote_pool. Algorithms vote in this process, if it is None
+        :return: list of vote algorithms with filled vote results
+        """
+        if executor is None:
+            for vote_algorithm in self.vote_algorithms:
+                VoteAlgorithmRunner(vote_algorithm).vote(nversions_results)
+            return self.vote_algorithms
+
+        algorithms_votes = executor.map(
+            _vote_in_worker,
+            [alg.vote_algorithm for alg in self.vote_algorithms],
+            [alg.vote_batch_algorithm for alg in self.vote_algorithms],
+            repeat(nversions_results),
+        )
+        for vote_algorithm, votes in zip(
+            self.vote_algorithms, algorithms_votes
+        ):
+            vote_algorithm._vote_result = [
                 {
-                    "data": iteration_result,
-                    "res": self.vote_algorithm._vote_algorithm(
-                        iteration_result
+                    "data": (
+                        nversions_results.iteration_results(i)
+                        if isinstance(nversions_results, ExperimentResults)
+                        else nversions_results[i]
                     ),
+                    "res": vote_res,
                 }
-            )
-        return self.vote_algorithm._vote_result
+                for i, vote_res in enumerate(votes)
+            ]
+        return self.vote_algorithms
+
+    def vote(self, nversions_results: list[list[NResult]]):
+        """
+        Vote with every algorithm over the same experiment results
+        :return: list of vote algorithms with filled vote results
+        """
+        with self.vote_pool() as executor:
+            return self.vote_in_pool(nversions_results, executor)
+
+    def vote_pages(self, results_pages):
+        """
+        Vote with every algorithm over experiment results page by page. Vote results of a page are replaced by
+        vote results of the next one, so only one page is kept in memory
+        :param results_pages: iterable of ExperimentResults objects
+        :return: generator of vote algorithms lists with vote results of one page
+        """
+        # Процессы запускаются один раз на все страницы, и каждая страница передаётся уже работающим процессам
+        with self.vote_pool() as executor:
+            for results_page in results_pages:
+                yield self.vote_in_pool(results_page, executor)
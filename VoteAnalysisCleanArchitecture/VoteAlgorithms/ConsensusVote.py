@@ -1,27 +1,56 @@
 from VoteAnalysisCleanArchitecture.Entities.n_result import NResult
+from VoteAnalysisCleanArchitecture.Entities.distance_engine import (
+    distance_matrix,
+)
 import random
 
+import numpy as np
+
 
 error_string = "Input list is empty"
+# Точность по умолчанию, до которой округляются ответы при группировке с допуском. Совпадает с точностью модуля по
+# умолчанию, для модулей с другой точностью её можно передать явно в параметре round_to
+TOLERANCE_ROUND_TO = 6
+# Матрица расстояний между версиями модуля, результаты которого голосовались последними. Все результаты
+# эксперимента ссылаются на один объект матрицы связности модуля, по нему и определяется, что модуль тот же
+_diversity_lookup = {
+    "connectivity_matrix": None,
+    "distances": None,
+    "version_index": dict(),
+}
 
 
 def classic_vote(
-    results: list[NResult], return_classes_list: bool = False
+    results: list[NResult],
+    return_classes_list: bool = False,
+    round_to: int = None,
 ) -> float:
+    """
+    Vote for the answer of the largest class of equal answers. If several classes have the largest size, one of
+    them is chosen at random with equal probability. Each such class is a candidate exactly once, so a tie between
+    two classes is won by each of them in half of the votes
+    :param results: Versions results of one iteration
+    :param return_classes_list: Return the list of answers classes instead of the vote answer
+    :param round_to: Digits amount, to which answers are rounded before they are grouped. Answers are compared
+    as they are, if None
+    :return: Vote answer or list of answers classes
+    """
     if not results or len(results) == 0:
         print(error_string)
         raise ValueError(error_string)
 
-    classes_list: list[list] = []
+    # Ответы раскладываются по классам за один проход: ключом класса служит сам ответ, а если задана точность
+    # round_to, то ответ, округлённый до неё, чтобы ответы, отличающиеся только погрешностью вычислений, попали в
+    # один класс. Словарь сохраняет порядок появления классов, поэтому он тот же, что и при попарном сравнении
+    classes_dict: dict[float, list] = dict()
     for res in results:
-        # Если другие мультиверсии уже выставили свои ответы на голосование, то сравниваем текущий ответ с ними
-        # Если обрабатываемый ответ относится к уже имеющемуся классу, то добавляем его в этот класс.
-        for answers_class in classes_list:
-            if res.version_answer == answers_class[0].version_answer:
-                answers_class.append(res)
-                break
-        else:  # Иначе создаём новый класс для ответа, т.к. он встретился впервые
-            classes_list.append([res])
+        answer_key = (
+            res.version_answer
+            if round_to is None
+            else round(res.version_answer, round_to)
+        )
+        classes_dict.setdefault(answer_key, []).append(res)
+    classes_list: list[list] = list(classes_dict.values())
 
     if not classes_list or len(classes_list) == 0:
         print(error_string)
@@ -31,16 +60,17 @@ def classic_vote(
     if return_classes_list:
         return classes_list
 
-    max_classes = [classes_list[0]]
-    max_values_in_class = len(classes_list[0])
-    for answers_class in classes_list:
-        if len(answers_class) > max_values_in_class:
-            max_values_in_class = len(answers_class)
-            max_classes = [answers_class]
-        elif len(answers_class) == max_values_in_class != 0:
-            max_classes.append(answers_class)
-
-    # Если есть 2 или более класса с одинаковым количеством ответов, то выбираем из них случайным образом
+    max_values_in_class = max(
+        len(answers_class) for answers_class in classes_list
+    )
+    max_classes = [
+        answers_class
+        for answers_class in classes_list
+        if len(answers_class) == max_values_in_class
+    ]
+
+    # Если есть 2 или более класса с одинаковым количеством ответов, то выбираем из них случайным образом. Каждый
+    # класс входит в список один раз, поэтому все они равновероятны
     if len(max_classes) > 1:
         max_class = random.choice(max_classes)
     else:
@@ -49,7 +79,53 @@ def classic_vote(
     return max_class[0].version_answer
 
 
-def calc_versions_diversity(results_list: list[NResult]) -> float:
+def tolerant_classic_vote(
+    results: list[NResult], round_to: int = TOLERANCE_ROUND_TO
+) -> float:
+    return classic_vote(results, round_to=round_to)
+
+
+def versions_diversity_lookup(
+    results_list: list[NResult],
+) -> tuple[np.ndarray, dict]:
+    """
+    Figure out distances between all versions, which answers are in the results list, once to reuse them in
+    modified_vote calls
+    :param results_list: results of all module versions, e.g. results of one iteration
+    :return: tuple of (n, n) distances array and dict of version id: row index in this array
+    """
+    version_coordinates = dict()
+    for res in results_list:
+        version_coordinates.setdefault(
+            res.version_id, res.version_common_coordinates
+        )
+    return distance_matrix(list(version_coordinates.values())), {
+        v_id: row_index for row_index, v_id in enumerate(version_coordinates)
+    }
+
+
+def _module_diversity_lookup(results: list[NResult]) -> tuple:
+    # Без id версии нельзя найти её строку в матрице, поэтому разнообразие классов считается по координатам
+    if any(res.version_id is None for res in results):
+        return None, None
+    connectivity_matrix = results[0].module_connectivity_matrix
+    same_module = _diversity_lookup["connectivity_matrix"] is connectivity_matrix
+    if not same_module or any(
+        res.version_id not in _diversity_lookup["version_index"]
+        for res in results
+    ):
+        distances, version_index = versions_diversity_lookup(results)
+        _diversity_lookup["connectivity_matrix"] = connectivity_matrix
+        _diversity_lookup["distances"] = distances
+        _diversity_lookup["version_index"] = version_index
+    return _diversity_lookup["distances"], _diversity_lookup["version_index"]
+
+
+def calc_versions_diversity(
+    results_list: list[NResult],
+    distances: np.ndarray = None,
+    version_index: dict = None,
+) -> float:
     if not results_list or len(results_list) == 0:
         print(error_string)
         raise ValueError(error_string)
@@ -57,30 +133,44 @@ def calc_versions_diversity(results_list: list[NResult]) -> float:
         # Если в списке всего одно значение, то формально - это множество из 1-го элемента, он сам от себя не
         # отличается, поэтому можно было бы считать данную группу недеверсифицированной,
         return 0
-    max_diversity: float = 0
-    for j in range(len(results_list)):
-        for k in range(j + 1, len(results_list)):
-            cur_diversity = results_list[j].version.calculate_distance_to(
-                results_list[k].version
-            )
-            max_diversity = max(max_diversity, cur_diversity)
-    return max_diversity
+    if distances is not None:
+        # Расстояния между версиями модуля не меняются, поэтому разнообразие класса - максимум готовых расстояний
+        rows = [version_index[res.version_id] for res in results_list]
+        return float(distances[np.ix_(rows, rows)].max())
+    # Все попарные расстояния между версиями группы считаются одним векторизованным вызовом
+    return float(
+        distance_matrix(
+            [res.version_common_coordinates for res in results_list]
+        ).max()
+    )
 
 
-def modified_vote(results: list[NResult]) -> float:
+def modified_vote(
+    results: list[NResult],
+    round_to: int = None,
+    distances: np.ndarray = None,
+    version_index: dict = None,
+) -> float:
     try:
-        classes_list = classic_vote(results, True)
+        classes_list = classic_vote(results, True, round_to)
     except ValueError as err:
         print(str(err))
         raise ValueError(str(err))
+    # Если готовая матрица расстояний не передана, то используется матрица, посчитанная для модуля ранее
+    if distances is None:
+        distances, version_index = _module_diversity_lookup(results)
 
     max_classes = [classes_list[0]]
     max_values_in_class = len(classes_list[0])
-    max_length = calc_versions_diversity(classes_list[0])
+    max_length = calc_versions_diversity(
+        classes_list[0], distances, version_index
+    )
     for i in range(len(classes_list)):
         class_len = len(classes_list[i])
         if 0 < class_len:
-            tmp_max_len = calc_versions_diversity(classes_list[i])
+            tmp_max_len = calc_versions_diversity(
+                classes_list[i], distances, version_index
+            )
             # Если в одной группе ответов больше чем в другой, однозначно определяем группу (класс) с верным ответом
             # Если 2 класса содержат одинаковое число ответов,
             # то пробуем посмотреть на уровень диверсифицированности этих групп - выбираем ту, где версии более
@@ -106,3 +196,9 @@ def modified_vote(results: list[NResult]) -> float:
         max_class = max_classes[0]
     # Т.к. во вложенном списке хранятся одинаковые результаты, мы можем возвращать любой, например 0-й
     return max_class[0].version_answer
+
+
+def tolerant_modified_vote(
+    results: list[NResult], round_to: int = TOLERANCE_ROUND_TO
+) -> float:
+    return modified_vote(results, round_to)
@@ -5,6 +5,8 @@ https://eprints.ncl.ac.uk/file_store/production/59232/8480AF9B-598A-462C-8417-1B
 Program for simulation several N-versions work of one module to test vote algorithms.
 Experiment is carried out in Denis V. Gruzenkin PhD thesis writing.
 """
+import numpy as np
+
 from VoteAnalysisCleanArchitecture.Entities.n_result import NResult
 
 
@@ -104,3 +106,48 @@ def vote(results: list[NResult]) -> float:
                 ].version_answer
 
     return correct_result
+
+
+def vote_batch(answers: np.ndarray) -> np.ndarray:
+    # Та же схема t/(n-1), что и в vote, но сразу для всех итераций: строки массива - итерации, столбцы - ответы версий
+    iterations_amount, n = answers.shape
+    if n < 3:
+        raise ValueError(
+            f"t/(n-1) vote needs at least 3 versions answers. {n} was got."
+        )
+    t = (n - 1) // 2
+    # Последняя версия в сравнении не участвует, сравниваются ответы соседних версий из первых n - 1
+    equal_mask = answers[:, : n - 2] == answers[:, 1 : n - 1]
+    comparator_indexes = np.arange(n - 2)
+    # Индекс последнего несовпадения слева от каждого компаратора - с него начинается текущая группа совпадающих ответов
+    last_unequal = np.maximum.accumulate(
+        np.where(equal_mask, -1, comparator_indexes), axis=1
+    )
+    # Группа заканчивается на компараторе, после которого совпадения прерываются. Число версий в группе на 1 больше
+    # числа совпавших подряд компараторов
+    group_end_mask = equal_mask & np.concatenate(
+        (~equal_mask[:, 1:], np.ones((iterations_amount, 1), dtype=bool)),
+        axis=1,
+    )
+    group_counts = np.where(
+        group_end_mask, comparator_indexes - last_unequal + 1, 0
+    )
+    max_group_count = group_counts.max(axis=1)
+    max_group_mask = group_end_mask & (
+        group_counts == max_group_count[:, None]
+    )
+    # Ответ группы берётся, только если она одна с наибольшим числом версий, и в ней не меньше t версий
+    unique_group = (
+        (max_group_count > 0)
+        & (max_group_count >= t)
+        & (max_group_mask.sum(axis=1) == 1)
+    )
+    iteration_indexes = np.arange(iterations_amount)
+    group_starts = (
+        last_unequal[iteration_indexes, max_group_mask.argmax(axis=1)] + 1
+    )
+    return np.where(
+        unique_group,
+        answers[iteration_indexes, group_starts],
+        answers[:, n - 1],
+    )
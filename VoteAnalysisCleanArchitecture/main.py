@@ -1,13 +1,33 @@
+import argparse
+import csv
 import enum
+import json
+import os
 import sys
 
+from Entities.experiment_analysis import CORRECT_ANSWER_TOLERANCE
 from Entities.n_module import NModule, input_num
 from Entities.vote_algorithm import VoteAlgorithm
+from InterfaceAdapters.campaign_repository import CampaignRepository
+from InterfaceAdapters.experiment_analysis_repository import (
+    ExperimentAnalysisRepository,
+)
 from InterfaceAdapters.nmodule_repository import NModuleRepository
 from InterfaceAdapters.vote_algorithm_repository import VoteAlgorithmRepository
+from UseCases.campaign_planner import expand_campaign_spec
 from UseCases.data_generator import DataGenerator
-from UseCases.vote_algorithm_runner import VoteAlgorithmRunner
+from UseCases.experiment_analyzer import ExperimentAnalyzer
+from UseCases.random_streams import (
+    ITERATIONS_CHUNK_SIZE,
+    versions_python_random,
+)
+from UseCases.vote_algorithm_runner import VoteAlgorithmsPoolRunner
 from UseCases.version_manager import VersionManager
+from VoteAnalysisCleanArchitecture.Entities.campaign import (
+    Campaign,
+    CampaignJob,
+    CampaignJobStatus,
+)
 
 
 class MenuOption(enum.Enum):
@@ -165,11 +185,47 @@ def generate_data(
     modules_list: list, current_module_index: int, experiments_names_list: list
 ):
     exp_name = input("Enter experiment name: ")
+    iterations_amount = input_num(
+        "Enter iterations amount: ", (0.0, float("inf"))
+    )
+    workers = input_num(
+        f"Enter worker processes amount (1 - {os.cpu_count()}): ",
+        (1, os.cpu_count()),
+        int,
+        True,
+    )
+    batch = (
+        input(
+            "Do you want to generate data with NumPy arrays instead of iteration by iteration? Yes - Y; No - any key"
+        ).upper()
+        == "Y"
+    )
+    if (
+        input(
+            "Do you want to write data straight into DB without keeping it in memory? Yes - Y; No - any key"
+        ).upper()
+        == "Y"
+    ):
+        try:
+            NModuleRepository(
+                modules_list[current_module_index]
+            ).save_experiment_data_stream(
+                DataGenerator(
+                    modules_list[current_module_index]
+                ).stream_experiment_data(
+                    iterations_amount, exp_name, workers=workers, batch=batch
+                ),
+                iterations_amount,
+            )
+            print("Experiment data was generated and saved successfully!")
+            experiments_names_list.append(exp_name)
+        except LookupError as e:
+            print(str(e))
+        return
     generate_data = DataGenerator(
         modules_list[current_module_index]
     ).generate_experiment_data(
-        input_num("Enter iterations amount: ", (0.0, float("inf"))),
-        exp_name,
+        iterations_amount, exp_name, workers=workers, batch=batch
     )
     if generate_data is not None:
         print("Experiment data was generated successfully!")
@@ -203,6 +259,64 @@ def load_experiment_data(
         print("Something is wrong!")
 
 
+def analyse_experiment(
+    experiment_name: str, tolerance: float = CORRECT_ANSWER_TOLERANCE
+) -> tuple[list, list]:
+    analysis_rep = ExperimentAnalysisRepository(tolerance)
+    experiment_id = analysis_rep.get_experiment_id(experiment_name)
+    # Результаты голосования, добавленные во время анализа, останутся для следующего
+    last_vote_result_id = analysis_rep.get_last_vote_result_id()
+    algorithms_analysis = analysis_rep.get_algorithms_analysis(
+        experiment_id, experiment_name
+    )
+    versions_analysis = analysis_rep.get_versions_analysis(experiment_id)
+    analyzer = ExperimentAnalyzer(
+        algorithms_analysis, versions_analysis, tolerance
+    )
+    analysis = analyzer.analyse(
+        analysis_rep.experiment_pages(
+            experiment_id,
+            algorithms_analysis,
+            versions_analysis,
+            last_vote_result_id,
+        )
+    )
+    analysis_rep.save_analysis(experiment_id, *analysis)
+    return analysis
+
+
+def make_experiment_analysis(module: NModule, experiments_names_list: list):
+    if len(experiments_names_list) == 0:
+        experiments_names_list = (
+            NModuleRepository(module).get_experiments_names() or []
+        )
+    if len(experiments_names_list) == 0:
+        print("There are no experiments to analyse!")
+        return
+    show_list(experiments_names_list, "Experiments names:")
+    exp_name_index = (
+        input_num(
+            "Choice experiment by order number to analyse it: ",
+            (1, len(experiments_names_list)),
+            int,
+            True,
+        )
+        - 1
+    )
+    try:
+        algorithms_analysis, versions_analysis = analyse_experiment(
+            experiments_names_list[exp_name_index]
+        )
+    except LookupError as e:
+        print(str(e))
+        return
+    if len(algorithms_analysis) > 0:
+        show_list(algorithms_analysis, "Vote algorithms analysis:")
+    else:
+        print("There are no vote results for this experiment!")
+    show_list(versions_analysis, "Versions analysis:")
+
+
 def add_vote_algorithm(vote_algorithms_list: list):
     algorithm_name = input("Enter vote algorithm name: ")
     module_name = input(
@@ -215,17 +329,55 @@ def add_vote_algorithm(vote_algorithms_list: list):
     )
 
 
+def run_vote_algorithm_by_pages(module: NModule, vote_algorithms_list: list):
+    if len(vote_algorithms_list) == 0:
+        print("There are no algorithms to show!")
+        return
+    exp_name = input("Enter experiment name: ")
+    workers = input_num(
+        f"Enter worker processes amount (1 - {os.cpu_count()}): ",
+        (1, os.cpu_count()),
+        int,
+        True,
+    )
+    try:
+        VoteAlgorithmRepository.save_algorithms_vote_pages(
+            VoteAlgorithmsPoolRunner(vote_algorithms_list, workers).vote_pages(
+                NModuleRepository(module).iter_experiment_data(exp_name)
+            )
+        )
+    except (LookupError, ValueError) as e:
+        print(str(e))
+
+
 def run_vote_algorithm(
     modules_list: list, current_module_index: int, vote_algorithms_list: list
 ):
+    if (
+        input(
+            "Do you want to vote over experiment data from DB page by page without loading it into memory? Yes - Y; No - any key"
+        ).upper()
+        == "Y"
+    ):
+        run_vote_algorithm_by_pages(
+            modules_list[current_module_index], vote_algorithms_list
+        )
+        return
     if len(modules_list[current_module_index].global_results_lst) > 0:
         if check_var_is_not_none(current_module_index, ""):
             if len(vote_algorithms_list) > 0:
-                for cur_algorithm in vote_algorithms_list:
-                    VoteAlgorithmRunner(cur_algorithm).vote(
-                        modules_list[current_module_index].global_results_lst
-                    )
-                    VoteAlgorithmRepository(cur_algorithm).save_vote_results()
+                VoteAlgorithmsPoolRunner(
+                    vote_algorithms_list,
+                    input_num(
+                        f"Enter worker processes amount (1 - {os.cpu_count()}): ",
+                        (1, os.cpu_count()),
+                        int,
+                        True,
+                    ),
+                ).vote(modules_list[current_module_index].global_results_lst)
+                VoteAlgorithmRepository.save_algorithms_vote_results(
+                    vote_algorithms_list
+                )
             else:
                 print("There are no algorithms to show!")
         else:
@@ -240,7 +392,491 @@ def run_vote_algorithm(
         )
 
 
+def load_saved_module(module_id: int) -> NModule:
+    module = NModuleRepository(NModule("NoName", 6)).load_module_with_versions(
+        module_id
+    )
+    if module is None or len(module.versions_list) == 0:
+        raise LookupError(
+            f"There are no saved versions of module with id {module_id}"
+        )
+    return module
+
+
+def generate_experiment(
+    module_id: int,
+    experiment_name: str,
+    iterations_amount: int,
+    seed: int = None,
+    workers: int = 1,
+    batch: bool = False,
+    append: bool = False,
+):
+    module = load_saved_module(module_id)
+    if append:
+        # Добавленные итерации должны совпасть с генерацией всего эксперимента сразу
+        if seed is not None or batch:
+            raise ValueError(
+                "Iterations are appended with the seed and generation mode of the saved experiment"
+            )
+        append_experiment(module, experiment_name, iterations_amount, workers)
+        return
+    NModuleRepository(module).save_experiment_data_stream(
+        DataGenerator(module).stream_experiment_data(
+            iterations_amount, experiment_name, seed, workers, batch
+        ),
+        iterations_amount,
+    )
+
+
+def append_experiment(
+    module: NModule,
+    experiment_name: str,
+    iterations_amount: int,
+    workers: int = 1,
+) -> int:
+    """
+    Add iterations to the saved experiment. They are generated with the experiment seed and generation mode, so
+    experiment data is the same as if all its iterations were generated at once. Saved vote results and analysis are
+    kept, so only new iterations are voted and analysed
+    :param module: Module, which the experiment was generated for
+    :param experiment_name: Experiment name
+    :param iterations_amount: Amount of new iterations
+    :param workers: Worker processes amount
+    :return: Number of the first new iteration
+    """
+    module_repository = NModuleRepository(module)
+    module_id, seed, chunk_size, saved_iterations_amount, batch = (
+        module_repository.get_experiment_generation(experiment_name)
+    )
+    if module_id != module.id:
+        raise ValueError(
+            f"Experiment {experiment_name} was generated for module with id {module_id}"
+        )
+    # Продолжить можно только данные, которые однозначно определяются сидом и размером куска итераций
+    if seed is None or chunk_size != ITERATIONS_CHUNK_SIZE:
+        raise ValueError(
+            f"Experiment {experiment_name} was generated without seed or with another chunk size. "
+            "Its iterations cannot be continued"
+        )
+    # Массивы NumPy получают значения всего куска итераций сразу, поэтому начало куска зависит от его длины
+    if batch and saved_iterations_amount % ITERATIONS_CHUNK_SIZE != 0:
+        raise ValueError(
+            f"Experiment {experiment_name} was generated with NumPy arrays, so its iterations can be continued "
+            f"only after a whole chunk of {ITERATIONS_CHUNK_SIZE} iterations"
+        )
+    experiment_iterations_amount = saved_iterations_amount + iterations_amount
+    module_repository.save_experiment_data_stream(
+        DataGenerator(module).stream_experiment_data(
+            experiment_iterations_amount,
+            experiment_name,
+            seed,
+            workers,
+            batch,
+            saved_iterations_amount,
+        ),
+        experiment_iterations_amount,
+        True,
+    )
+    return saved_iterations_amount
+
+
+def load_vote_algorithms(algorithms_names: list[str] = None) -> list:
+    vote_algorithms_list = VoteAlgorithmRepository(None).load_algorithms()
+    if not algorithms_names:
+        return vote_algorithms_list
+    algorithms_by_name = {
+        vote_algorithm.name: vote_algorithm
+        for vote_algorithm in vote_algorithms_list
+    }
+    unknown_names = [
+        name for name in algorithms_names if name not in algorithms_by_name
+    ]
+    if len(unknown_names) > 0:
+        raise LookupError(
+            f"There are no saved vote algorithms {', '.join(unknown_names)}"
+        )
+    return [algorithms_by_name[name] for name in algorithms_names]
+
+
+def vote_experiment(
+    experiment_name: str,
+    vote_algorithms_list: list,
+    workers: int = 1,
+    first_iteration: int = None,
+):
+    # Результаты страниц ссылаются на версии модуля, поэтому загружается модуль, для которого получен эксперимент
+    module = load_saved_module(
+        NModuleRepository(None).get_experiment_module_id(experiment_name)
+    )
+    VoteAlgorithmRepository.save_algorithms_vote_pages(
+        VoteAlgorithmsPoolRunner(vote_algorithms_list, workers).vote_pages(
+            NModuleRepository(module).iter_experiment_data(
+                experiment_name, first_iteration=first_iteration
+            )
+        )
+    )
+
+
+def get_command_experiments_names(experiments_names: list[str]) -> list[str]:
+    if experiments_names:
+        return experiments_names
+    return NModuleRepository(None).get_experiments_names() or []
+
+
+def export_experiments_analysis(
+    experiments_names: list[str],
+    file_name: str,
+    versions: bool = False,
+    tolerance: float = CORRECT_ANSWER_TOLERANCE,
+):
+    if versions:
+        header = (
+            "experiment",
+            "version_id",
+            "version_name",
+            "version_reliability",
+            "answers_amount",
+            "errors_amount",
+            "observed_reliability",
+            "mean_error",
+        )
+    else:
+        header = (
+            "experiment",
+            "algorithm_id",
+            "algorithm_name",
+            "iterations_amount",
+            "correct_amount",
+            "correct_rate",
+            "no_answer_amount",
+            "mean_error",
+            "root_mean_square_error",
+            "max_error",
+            "tie_amount",
+            "tie_rate",
+            "tie_correct_rate",
+        )
+    with open(file_name, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(header)
+        for experiment_name in experiments_names:
+            algorithms_analysis, versions_analysis = analyse_experiment(
+                experiment_name, tolerance
+            )
+            if versions:
+                writer.writerows(
+                    (
+                        experiment_name,
+                        analysis.version_id,
+                        analysis.version_name,
+                        analysis.version_reliability,
+                        analysis.answers_amount,
+                        analysis.errors_amount,
+                        analysis.observed_reliability,
+                        analysis.mean_error,
+                    )
+                    for analysis in versions_analysis
+                )
+            else:
+                writer.writerows(
+                    (
+                        experiment_name,
+                        analysis.algorithm_id,
+                        analysis.algorithm_name,
+                        analysis.iterations_amount,
+                        analysis.correct_amount,
+                        analysis.correct_rate,
+                        analysis.no_answer_amount,
+                        analysis.mean_error,
+                        analysis.root_mean_square_error,
+                        analysis.max_error,
+                        analysis.tie_amount,
+                        analysis.tie_rate,
+                        analysis.tie_correct_rate,
+                    )
+                    for analysis in algorithms_analysis
+                )
+
+
+def load_campaign_spec(file_name: str) -> dict:
+    with open(file_name) as spec_file:
+        if file_name.endswith((".yaml", ".yml")):
+            # YAML нужен только для спецификаций кампаний, поэтому PyYAML не обязателен
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(
+                    "Install PyYAML (pip install pyyaml) to read YAML campaign spec or use JSON one"
+                )
+            return yaml.safe_load(spec_file)
+        return json.load(spec_file)
+
+
+def build_campaign_module(campaign: Campaign, job: CampaignJob) -> NModule:
+    module = NModule(
+        job.experiment_name,
+        campaign.round_to,
+        campaign.min_out_val,
+        campaign.max_out_val,
+    )
+    VersionManager(module).add_generated_versions(
+        job.versions_amount,
+        job.reliability_interval,
+        job.diversities_intervals,
+        # Сид задания выводится из сида кампании и номера задания, поэтому версии кампании воспроизводимы
+        versions_python_random(job.seed),
+    )
+    NModuleRepository(module).save_module_with_versions()
+    return module
+
+
+def run_campaign(spec_file_name: str, workers: int = 1) -> Campaign:
+    """
+    Generate and vote experiments of every campaign job. Jobs progress is saved, so the same campaign run again
+    continues from its first unfinished job
+    :param spec_file_name: JSON or YAML campaign spec file name
+    :param workers: Worker processes amount
+    :return: Campaign object
+    """
+    campaign = expand_campaign_spec(load_campaign_spec(spec_file_name))
+    campaign_rep = CampaignRepository(campaign)
+    campaign_rep.save_campaign()
+    # Алгоритмы загружаются до генерации, чтобы ошибка в их именах не обнаружилась только после первого задания
+    vote_algorithms_list = load_vote_algorithms(campaign.algorithms_names)
+    # В SQLite один писатель, поэтому задания выполняются по очереди, а по процессам распределяются куски итераций
+    # и страницы голосования каждого задания
+    for job in campaign.pending_jobs:
+        print(f"Campaign {campaign.name} job {job}")
+        if job.status == CampaignJobStatus.PENDING:
+            if job.module_id is None:
+                job.module_id = build_campaign_module(campaign, job).id
+                campaign_rep.save_job(job)
+            # Сид задания сохранён, поэтому прерванная генерация повторяется с теми же данными
+            generate_experiment(
+                job.module_id,
+                job.experiment_name,
+                campaign.iterations_amount,
+                job.seed,
+                workers,
+                campaign.batch,
+            )
+            job.status = CampaignJobStatus.GENERATED
+            campaign_rep.save_job(job)
+        vote_experiment(job.experiment_name, vote_algorithms_list, workers)
+        job.status = CampaignJobStatus.VOTED
+        campaign_rep.save_job(job)
+    return campaign
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="N-version module experiment data generation, voting and analysis. Interactive menu is "
+        "shown, if no command is given."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser(
+        "generate",
+        help="Generate experiment data for module saved with versions and write it into DB",
+    )
+    generate_parser.add_argument("--module-id", type=int, required=True)
+    generate_parser.add_argument("--experiment", required=True)
+    generate_parser.add_argument("--iterations", type=int, required=True)
+    generate_parser.add_argument("--seed", type=int, default=None)
+    generate_parser.add_argument("--workers", type=int, default=1)
+    generate_parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Generate iterations chunks with NumPy arrays instead of iteration by iteration",
+    )
+    generate_parser.add_argument(
+        "--append",
+        action="store_true",
+        help="Add --iterations iterations to the saved experiment and keep its vote results and analysis",
+    )
+
+    vote_parser = subparsers.add_parser(
+        "vote",
+        help="Run saved vote algorithms over experiments data from DB page by page",
+    )
+    vote_parser.add_argument("--experiment", nargs="+", required=True)
+    vote_parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        default=None,
+        help="Names of saved vote algorithms. All saved algorithms are run by default",
+    )
+    vote_parser.add_argument("--workers", type=int, default=1)
+    vote_parser.add_argument(
+        "--first-iteration",
+        type=int,
+        default=None,
+        help="Vote only iterations starting from this one, for example appended ones",
+    )
+
+    analyze_parser = subparsers.add_parser(
+        "analyze",
+        help="Analyse vote algorithms and versions of experiments and print the analysis",
+    )
+    analyze_parser.add_argument(
+        "--experiment",
+        nargs="+",
+        default=None,
+        help="Experiments names. All experiments are analysed by default",
+    )
+    analyze_parser.add_argument(
+        "--tolerance", type=float, default=CORRECT_ANSWER_TOLERANCE
+    )
+
+    export_parser = subparsers.add_parser(
+        "export",
+        help="Analyse experiments and write the analysis into CSV file",
+    )
+    export_parser.add_argument("--output", required=True)
+    export_parser.add_argument(
+        "--experiment",
+        nargs="+",
+        default=None,
+        help="Experiments names. All experiments are exported by default",
+    )
+    export_parser.add_argument(
+        "--versions",
+        action="store_true",
+        help="Export versions analysis instead of vote algorithms one",
+    )
+    export_parser.add_argument(
+        "--tolerance", type=float, default=CORRECT_ANSWER_TOLERANCE
+    )
+
+    campaign_parser = subparsers.add_parser(
+        "campaign",
+        help="Generate and vote experiments of every module configuration of campaign spec. Interrupted "
+        "campaign is continued, when it is run again",
+    )
+    campaign_parser.add_argument(
+        "--spec", required=True, help="JSON or YAML campaign spec file"
+    )
+    campaign_parser.add_argument("--workers", type=int, default=1)
+
+    run_parser = subparsers.add_parser(
+        "run",
+        help='Run jobs from JSON file. It contains list of objects with "command" key and the command options, '
+        'e.g. {"command": "vote", "experiment": ["Exp 1"], "workers": 4}',
+    )
+    run_parser.add_argument("job_file")
+    run_parser.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="Run the rest of jobs after a failed one",
+    )
+    return parser
+
+
+def job_args(job: dict) -> list[str]:
+    # Задание превращается в аргументы командной строки, чтобы его проверил тот же парсер, что и команды
+    args = [job["command"]]
+    for key, value in job.items():
+        if key == "command" or value is None or value is False:
+            continue
+        option = f"--{key.replace('_', '-')}"
+        if value is True:
+            args.append(option)
+        elif isinstance(value, list):
+            args += [option, *map(str, value)]
+        else:
+            args += [option, str(value)]
+    return args
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """
+    Run command line command without any user input
+    :param args: Parsed command line arguments
+    :return: 0, if command succeeded, and 1 otherwise
+    """
+    try:
+        if args.command == "generate":
+            generate_experiment(
+                args.module_id,
+                args.experiment,
+                args.iterations,
+                args.seed,
+                args.workers,
+                args.batch,
+                args.append,
+            )
+            print(
+                f'Experiment "{args.experiment}" data was generated and saved'
+            )
+        elif args.command == "vote":
+            vote_algorithms_list = load_vote_algorithms(args.algorithms)
+            for experiment_name in args.experiment:
+                vote_experiment(
+                    experiment_name,
+                    vote_algorithms_list,
+                    args.workers,
+                    args.first_iteration,
+                )
+                print(f'Vote results of "{experiment_name}" were saved')
+        elif args.command == "analyze":
+            for experiment_name in get_command_experiments_names(
+                args.experiment
+            ):
+                algorithms_analysis, versions_analysis = analyse_experiment(
+                    experiment_name, args.tolerance
+                )
+                show_list(algorithms_analysis, "Vote algorithms analysis:")
+                show_list(versions_analysis, "Versions analysis:")
+        elif args.command == "export":
+            export_experiments_analysis(
+                get_command_experiments_names(args.experiment),
+                args.output,
+                args.versions,
+                args.tolerance,
+            )
+            print(f"Analysis was exported into {args.output}")
+        elif args.command == "campaign":
+            print(f"Campaign {run_campaign(args.spec, args.workers)}")
+        elif args.command == "run":
+            return run_job_file(args.job_file, args.keep_going)
+    except (LookupError, ValueError, OSError) as e:
+        print(f"{args.command}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def run_job_file(file_name: str, keep_going: bool = False) -> int:
+    with open(file_name) as job_file:
+        jobs = json.load(job_file)
+    if not isinstance(jobs, list) or not all(
+        isinstance(job, dict) and isinstance(job.get("command"), str)
+        for job in jobs
+    ):
+        raise ValueError(
+            f"Job file {file_name} should contain a list of objects with a command name"
+        )
+    parser = build_arg_parser()
+    exit_code = 0
+    for job_num, job in enumerate(jobs, 1):
+        print(f"Job {job_num} of {len(jobs)}: {job['command']}")
+        try:
+            job_exit_code = run_command(parser.parse_args(job_args(job)))
+        except SystemExit:
+            # Парсер уже вывел ошибку задания, а остальные задания выполняются как после ошибки команды
+            job_exit_code = 1
+        if job_exit_code != 0:
+            exit_code = 1
+            if not keep_going:
+                break
+    return exit_code
+
+
 def main():
+    # Команда в аргументах выполняется без меню, поэтому её можно запускать из скриптов
+    if len(sys.argv) > 1:
+        return run_command(build_arg_parser().parse_args())
+
     module_index_err_str = (
         "Current module index is not defined yet. "
         "Please set it before using this menu item."
@@ -362,18 +998,12 @@ def main():
                 modules_list, current_module_index, vote_algorithms_list
             )
         elif user_chosen_item == MenuOption.MAKE_EXPERIMENT_ANALYSIS:
-            # Проверка функции загрузки результатов голосования
             if check_var_is_not_none(
                 current_module_index, module_index_err_str
             ):
-                if len(vote_algorithms_list) > 0:
-                    for cur_algorithm in vote_algorithms_list:
-                        VoteAlgorithmRepository(
-                            cur_algorithm
-                        ).load_vote_results(modules_list[current_module_index])
-                else:
-                    print("There are no algorithms!")
-
+                make_experiment_analysis(
+                    modules_list[current_module_index], experiments_names_list
+                )
 
 if __name__ == "__main__":
     sys.exit(main())
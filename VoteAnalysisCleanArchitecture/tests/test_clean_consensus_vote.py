@@ -0,0 +1,28 @@
+import random
+
+from VoteAnalysisCleanArchitecture.Entities.n_result import NResult
+from VoteAnalysisCleanArchitecture.VoteAlgorithms.ConsensusVote import (
+    classic_vote,
+)
+
+
+def make_results(answers: list[float]) -> list[NResult]:
+    return [
+        NResult(
+            v_id, f"Version {v_id}", 0.9, (0.0,), answer, 1.0, 1, "M", (), 0
+        )
+        for v_id, answer in enumerate(answers, 1)
+    ]
+
+
+def test_classic_vote_breaks_tie_evenly():
+    random.seed(0)
+    results = make_results([1.0, 1.0, 2.0, 2.0])
+    votes = [classic_vote(results) for _ in range(10000)]
+    # Каждый из двух наибольших классов выбирается примерно в половине голосований
+    assert 0.47 < votes.count(1.0) / len(votes) < 0.53
+    assert set(votes) == {1.0, 2.0}
+
+
+def test_classic_vote_largest_class_wins():
+    assert classic_vote(make_results([2.0, 1.0, 2.0, 3.0])) == 2.0
@@ -0,0 +1,205 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from Entities.n_module import NModule
+from Entities.vote_algorithm import VoteAlgorithm
+from InterfaceAdapters.nmodule_repository import NModuleRepository
+from InterfaceAdapters.vote_algorithm_repository import VoteAlgorithmRepository
+from UseCases.data_generator import DataGenerator
+from UseCases.experiment_analyzer import iteration_ties
+from UseCases.version_manager import VersionManager
+from main import analyse_experiment, append_experiment, vote_experiment
+
+
+def make_module() -> NModule:
+    module = NModule("Module", 6)
+    VersionManager(module).add_generated_versions(
+        3, (0.8, 0.9), [(0, 1), (0, 1)]
+    )
+    NModuleRepository(module).save_module_with_versions()
+    return module
+
+
+def save_experiment(
+    module: NModule, experiment_name: str, iterations_amount: int
+):
+    NModuleRepository(module).save_experiment_data_stream(
+        DataGenerator(module).stream_experiment_data(
+            iterations_amount, experiment_name, 1
+        ),
+        iterations_amount,
+    )
+
+
+def test_analyse_experiment_without_votes(data_base):
+    save_experiment(make_module(), "No votes", 200)
+    answers_amount = data_base.execute_query(
+        "select count(*) from experiment_data;"
+    )[0][0]
+    for _ in range(2):
+        # Повторный анализ продолжается с сохранённого, в котором нет анализа алгоритмов
+        algorithms_analysis, versions_analysis = analyse_experiment("No votes")
+        assert algorithms_analysis == []
+        assert len(versions_analysis) == 3
+        assert (
+            sum(analysis.answers_amount for analysis in versions_analysis)
+            == answers_amount
+        )
+
+
+def test_regenerated_experiment_is_analysed_again(data_base):
+    module = make_module()
+    save_experiment(module, "Regenerated", 200)
+    analyse_experiment("Regenerated")
+    save_experiment(module, "Regenerated", 100)
+    _, versions_analysis = analyse_experiment("Regenerated")
+    # Версия даёт ответ в каждой группе версий, в которую входит
+    assert [analysis.answers_amount for analysis in versions_analysis] == [
+        res[0]
+        for res in data_base.execute_query(
+            "select count(*) from experiment_data group by version_id order by version_id;"
+        )
+    ]
+    assert all(
+        analysis.last_iteration_num == 99 for analysis in versions_analysis
+    )
+
+
+def test_iteration_ties_of_ragged_iterations():
+    rng = np.random.default_rng(0)
+    answers_amounts = rng.integers(1, 10, 2000)
+    answers = rng.integers(0, 4, answers_amounts.sum()).astype(float)
+    iteration_starts = np.concatenate(([0], np.cumsum(answers_amounts)[:-1]))
+    expected_ties = []
+    for iteration_answers in np.split(answers, iteration_starts[1:]):
+        class_sizes = Counter(iteration_answers.tolist()).values()
+        expected_ties.append(list(class_sizes).count(max(class_sizes)) > 1)
+    assert iteration_ties(answers, iteration_starts).tolist() == expected_ties
+
+
+def test_analyse_experiment_with_ragged_iterations(data_base):
+    save_experiment(make_module(), "Ragged", 300)
+    # В экспериментах старых версий число ответов в итерациях могло различаться
+    data_base.execute_query(
+        """
+            delete from experiment_data where module_iteration_num % 3 = 0
+            and version_id = (select min(version_id) from experiment_data);
+        """,
+        [],
+        True,
+        False,
+    )
+    _, versions_analysis = analyse_experiment("Ragged")
+    assert [
+        (analysis.answers_amount, analysis.errors_amount)
+        for analysis in versions_analysis
+    ] == [
+        tuple(res) for res in data_base.execute_query("""
+                select count(*), sum(abs(version_answer - correct_answer) > 1e-6) from experiment_data
+                group by version_id order by version_id;
+            """)
+    ]
+
+
+def algorithms_analysis_values(algorithms_analysis: list) -> list[tuple]:
+    return [
+        (
+            analysis.iterations_amount,
+            analysis.correct_amount,
+            analysis.no_answer_amount,
+            pytest.approx(analysis.error_sum),
+            pytest.approx(analysis.error_square_sum),
+            analysis.max_error,
+            analysis.tie_amount,
+            analysis.tie_correct_amount,
+        )
+        for analysis in algorithms_analysis
+    ]
+
+
+def versions_analysis_values(versions_analysis: list) -> list[tuple]:
+    return [
+        (
+            analysis.version_id,
+            analysis.answers_amount,
+            analysis.errors_amount,
+            pytest.approx(analysis.error_sum),
+            analysis.last_iteration_num,
+        )
+        for analysis in versions_analysis
+    ]
+
+
+# Итерации, сгенерированные массивами NumPy, продолжаются только с границы куска
+@pytest.mark.parametrize(
+    "batch, saved_iterations_amount", [(False, 12500), (True, 20000)]
+)
+def test_appended_experiment_analysis_equals_full_analysis(
+    data_base, batch, saved_iterations_amount
+):
+    module = make_module()
+    vote_algorithm = VoteAlgorithm("Median", "vote", "MedianVote")
+    VoteAlgorithmRepository(vote_algorithm).save_vote_algorithm()
+
+    def vote_and_analyse(experiment_name: str, first_iteration: int = None):
+        vote_experiment(
+            experiment_name, [vote_algorithm], first_iteration=first_iteration
+        )
+        if first_iteration is not None:
+            # Анализ, сохранённый до добавления итераций, продолжается
+            assert data_base.execute_query(
+                "select count(*) from algorithm_analysis;"
+            ) == [(2,)]
+        return analyse_experiment(experiment_name)
+
+    NModuleRepository(module).save_experiment_data_stream(
+        DataGenerator(module).stream_experiment_data(
+            22000, "Full", 7, batch=batch
+        ),
+        22000,
+    )
+    full_analysis = vote_and_analyse("Full")
+    NModuleRepository(module).save_experiment_data_stream(
+        DataGenerator(module).stream_experiment_data(
+            saved_iterations_amount, "Appended", 7, batch=batch
+        ),
+        saved_iterations_amount,
+    )
+    vote_and_analyse("Appended")
+    assert (
+        append_experiment(module, "Appended", 22000 - saved_iterations_amount)
+        == saved_iterations_amount
+    )
+    appended_analysis = vote_and_analyse("Appended", saved_iterations_amount)
+
+    assert algorithms_analysis_values(
+        appended_analysis[0]
+    ) == algorithms_analysis_values(full_analysis[0])
+    assert versions_analysis_values(
+        appended_analysis[1]
+    ) == versions_analysis_values(full_analysis[1])
+    experiments_data = []
+    for experiment_name in ("Full", "Appended"):
+        experiments_data.append(data_base.execute_query(f"""
+                select d.module_iteration_num, d.version_id, d.version_answer, d.correct_answer 
+                from experiment_data d join experiment e on e.id = d.experiment_id 
+                where e.name = '{experiment_name}' order by d.module_iteration_num, d.version_id;
+            """))
+    assert experiments_data[0] == experiments_data[1]
+    assert NModuleRepository(module).get_experiment_generation("Appended")[
+        3:
+    ] == (22000, batch)
+
+
+def test_batch_experiment_is_appended_after_whole_chunk(data_base):
+    module = make_module()
+    NModuleRepository(module).save_experiment_data_stream(
+        DataGenerator(module).stream_experiment_data(
+            12500, "Batch", 7, batch=True
+        ),
+        12500,
+    )
+    with pytest.raises(ValueError):
+        append_experiment(module, "Batch", 100)
@@ -0,0 +1,31 @@
+import json
+
+from main import build_arg_parser, run_command
+
+
+def run_jobs(jobs, keep_going: bool = False) -> int:
+    with open("jobs.json", "w") as job_file:
+        json.dump(jobs, job_file)
+    args = ["run", "jobs.json"] + (["--keep-going"] if keep_going else [])
+    return run_command(build_arg_parser().parse_args(args))
+
+
+def test_bad_job_does_not_stop_next_jobs(data_base, capsys):
+    jobs = [
+        {"command": "campaign", "spec": "campaign.json", "workers": "x"},
+        {"command": "vote", "experiment": ["Missing"], "algorithms": ["No"]},
+    ]
+    assert run_jobs(jobs, True) == 1
+    output = capsys.readouterr()
+    assert "Job 2 of 2: vote" in output.out
+    assert "invalid int value" in output.err
+    assert "\nvote: " in output.err
+    # Без --keep-going задания останавливаются на первой ошибке
+    assert run_jobs(jobs) == 1
+    assert "Job 2 of 2" not in capsys.readouterr().out
+
+
+def test_job_file_should_be_list_of_jobs(data_base, capsys):
+    for jobs in ({"command": "vote"}, [["vote"]], [{"workers": 2}]):
+        assert run_jobs(jobs) == 1
+        assert "should contain a list of objects" in capsys.readouterr().err
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from VoteAnalysisCleanArchitecture.Entities.n_result import NResult
+from VoteAnalysisCleanArchitecture.VoteAlgorithms import (
+    AverageVote,
+    MedianVote,
+    tN_1,
+)
+
+
+def make_results(answers: list[float]) -> list[NResult]:
+    return [
+        NResult(
+            v_id, f"Version {v_id}", 0.9, (0.0,), answer, 1.0, 1, "M", (), 0
+        )
+        for v_id, answer in enumerate(answers, 1)
+    ]
+
+
+def random_answers(
+    versions_amount: int, distinct_amount: int, seed: int
+) -> np.ndarray:
+    # Ответы выбираются из нескольких значений, поэтому в строках часто есть совпадения и ничьи групп
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.uniform(-100, 100, distinct_amount), 3)
+    return values[rng.integers(0, distinct_amount, (300, versions_amount))]
+
+
+@pytest.mark.parametrize("versions_amount", range(3, 10))
+@pytest.mark.parametrize("distinct_amount", range(2, 6))
+def test_tn_1_vote_batch_equals_vote(versions_amount, distinct_amount):
+    answers = random_answers(
+        versions_amount, distinct_amount, versions_amount * distinct_amount
+    )
+    assert tN_1.vote_batch(answers).tolist() == [
+        tN_1.vote(make_results(row)) for row in answers.tolist()
+    ]
+
+
+@pytest.mark.parametrize("versions_amount", range(1, 10))
+def test_average_and_median_vote_batch_equal_vote(versions_amount):
+    answers = random_answers(versions_amount, 5, versions_amount)
+    rows_results = [make_results(row) for row in answers.tolist()]
+    # statistics.mean считает точно, а np.mean - в числах с плавающей точкой
+    assert AverageVote.vote_batch(answers).tolist() == pytest.approx(
+        [AverageVote.vote(results) for results in rows_results]
+    )
+    assert MedianVote.vote_batch(answers).tolist() == [
+        MedianVote.vote(results) for results in rows_results
+    ]
@@ -0,0 +1,90 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from Entities.n_module import NModule
+from Entities.vote_algorithm import VoteAlgorithm
+from InterfaceAdapters.nmodule_repository import NModuleRepository
+from InterfaceAdapters.vote_algorithm_repository import VoteAlgorithmRepository
+from UseCases import vote_algorithm_runner
+from UseCases.data_generator import DataGenerator
+from UseCases.version_manager import VersionManager
+from UseCases.vote_algorithm_runner import VoteAlgorithmsPoolRunner
+from main import vote_experiment
+
+
+def save_experiment(
+    module: NModule, experiment_name: str, iterations_amount: int, seed: int
+):
+    NModuleRepository(module).save_experiment_data_stream(
+        DataGenerator(module).stream_experiment_data(
+            iterations_amount, experiment_name, seed
+        ),
+        iterations_amount,
+    )
+
+
+def test_load_vote_results_of_loaded_experiment(data_base):
+    module = NModule("Module", 6)
+    VersionManager(module).add_generated_versions(
+        3, (0.8, 0.9), [(0, 1), (0, 1)]
+    )
+    NModuleRepository(module).save_module_with_versions()
+    save_experiment(module, "First", 50, 1)
+    save_experiment(module, "Second", 80, 2)
+    vote_algorithm = VoteAlgorithm("Median", "vote", "MedianVote")
+    VoteAlgorithmRepository(vote_algorithm).save_vote_algorithm()
+    for experiment_name in ("First", "Second"):
+        vote_experiment(experiment_name, [vote_algorithm])
+
+    # Номера итераций экспериментов совпадают, но загружаются только результаты загруженного эксперимента
+    NModuleRepository(module).load_experiment_data("Second")
+    VoteAlgorithmRepository(vote_algorithm).load_vote_results(module)
+    vote_results = vote_algorithm._vote_result
+    assert len(vote_results) == 80
+    saved_answers = data_base.execute_query("""
+            select v.vote_answer from vote_result v join experiment e on e.id = v.experiment_id 
+            where e.name = 'Second' order by v.module_iteration_num;
+        """)
+    assert [res["res"] for res in vote_results] == [
+        res[0] for res in saved_answers
+    ]
+    assert all(res["data"].experiment_name == "Second" for res in vote_results)
+
+
+def test_vote_pages_in_one_pool(data_base, monkeypatch):
+    module = NModule("Module", 6)
+    VersionManager(module).add_generated_versions(
+        5, (0.8, 0.9), [(0, 1), (0, 1)]
+    )
+    NModuleRepository(module).save_module_with_versions()
+    save_experiment(module, "Pages", 300, 1)
+    pages = list(NModuleRepository(module).iter_experiment_data("Pages", 100))
+    vote_algorithms = [
+        VoteAlgorithm("Median", "vote", "MedianVote"),
+        VoteAlgorithm("tN_1", "vote", "tN_1"),
+    ]
+
+    def pages_votes(workers: int) -> list:
+        return [
+            [
+                [res["res"] for res in vote_algorithm._vote_result]
+                for vote_algorithm in page_algorithms
+            ]
+            for page_algorithms in VoteAlgorithmsPoolRunner(
+                vote_algorithms, workers
+            ).vote_pages(pages)
+        ]
+
+    expected_votes = pages_votes(1)
+    pools = []
+
+    class CountedPool(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(
+        vote_algorithm_runner, "ProcessPoolExecutor", CountedPool
+    )
+    assert pages_votes(2) == expected_votes
+    # Процессы запускаются один раз на все страницы
+    assert len(pools) == 1